@@ -0,0 +1,440 @@
+"""
+Headless command line interface for batch resume scoring
+
+Usage:
+    python -m app.cli --skills skills.csv --input resumes/ --output results.jsonl
+"""
+
+import os
+import sys
+import csv
+import glob
+import json
+import itertools
+import logging
+import argparse
+import importlib.util
+
+from app.utils import logger, is_valid_file, get_cache_dir
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+CSV_COLUMNS = ["Resume", "Score (%)", "Matched Skills", "Missing Skills"]
+
+def find_resumes(inputs):
+    """
+    Expand directories and glob patterns into resume file paths
+
+    Args:
+        inputs (list): Directories, glob patterns or file paths
+
+    Returns:
+        list: Sorted, de-duplicated resume paths
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for dir_path, _, file_names in os.walk(item):
+                for file_name in file_names:
+                    paths.add(os.path.join(dir_path, file_name))
+        else:
+            paths.update(glob.glob(item, recursive=True))
+
+    return sorted(path for path in paths if is_valid_file(path, RESUME_EXTENSIONS))
+
+class JobTableCsvWriter:
+    """Writes one row per resume with one score column per job"""
+
+    def __init__(self, stream, job_names):
+        self.stream = stream
+        self.job_names = job_names
+        self.writer = csv.writer(stream)
+        self.writer.writerow(["Resume"] + job_names)
+
+    def write(self, row):
+        self.writer.writerow([row["file_name"]] + [f"{row['scores'][name]:.2f}" for name in self.job_names])
+        self.stream.flush()
+
+class JsonlWriter:
+    """Writes one JSON object per result"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, result):
+        self.stream.write(json.dumps(result) + "\n")
+        self.stream.flush()
+
+class CsvWriter:
+    """Writes results in the same layout as the GUI export"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.writer(stream)
+        self.writer.writerow(CSV_COLUMNS)
+
+    def write(self, result):
+        self.writer.writerow([
+            result["file_name"],
+            f"{result['score']:.2f}",
+            ", ".join(result["matched_skills"]),
+            ", ".join(result["missing_skills"]),
+        ])
+        self.stream.flush()
+
+WRITERS = {'jsonl': JsonlWriter, 'csv': CsvWriter}
+
+def open_output(output):
+    """Open the output file, or return stdout for '-'"""
+    return sys.stdout if output == '-' else open(output, 'w', newline='', encoding='utf-8')
+
+def output_format_for(args):
+    """Output format from --format, else from the --output extension"""
+    if args.format:
+        return args.format
+    return 'csv' if args.output.lower().endswith('.csv') else 'jsonl'
+
+def build_parser():
+    """Build the argument parser for the batch command"""
+    parser = argparse.ArgumentParser(description="Score resumes against a weighted skills CSV without the GUI")
+    parser.add_argument('--skills', action='append', default=[],
+                        help="Skills CSV with 'skills' and 'weightage' columns; repeat to score "
+                             "against several jobs at once and output a resumes × jobs table")
+    parser.add_argument('--input', action='append', default=[],
+                        help="Resume directory, glob pattern or file (repeatable)")
+    parser.add_argument('--output', default='-', help="Output file, or - for stdout (default)")
+    parser.add_argument('--format', choices=sorted(WRITERS), default=None,
+                        help="Output format (default: from --output extension, else jsonl)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Extraction/tokenization processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=16, help="Resumes per embedding batch")
+    parser.add_argument('--spacy-processes', type=int, default=1,
+                        help="nlp.pipe processes for tokenization when --workers is 1")
+    parser.add_argument('--spacy-batch-size', type=int, default=None,
+                        help="Resumes per nlp.pipe batch when --workers is 1 (default: 32)")
+    parser.add_argument('--no-cache', action='store_true', help="Disable on-disk extraction and embedding caches")
+    parser.add_argument('--max-pages', type=int, default=None, help="Read at most this many pages per PDF")
+    parser.add_argument('--max-chars', type=int, default=None, help="Stop extracting a resume after this many characters")
+    parser.add_argument('--max-file-mb', type=float, default=None, help="Skip resume files larger than this")
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="Seconds allowed per file; extraction runs in a worker that is killed on overrun")
+    parser.add_argument('--fast-encoder', action='store_true',
+                        help="Use the int8-quantized encoder (CPU) and float16 embedding storage")
+    parser.add_argument('--embedding-storage', choices=['float32', 'float16', 'int8'], default=None,
+                        help="Storage format of cached embeddings (default: float32, or float16 with --fast-encoder)")
+    parser.add_argument('--shared-embeddings', metavar='DIR',
+                        help="Memory-map skill and token embeddings from a directory shared with other processes")
+    parser.add_argument('--rank', type=int, metavar='K', default=None,
+                        help="Keep only the top K resumes in memory and write them, best first, at the end")
+    parser.add_argument('--spill', metavar='PATH',
+                        help="Also write every result to this .csv (or .parquet, with pyarrow) file in chunks")
+    parser.add_argument('--journal', metavar='PATH',
+                        help="Journal finished results to this file; rerunning with the same journal "
+                             "skips resumes that are already done")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep polling --input and score new or changed resumes as they arrive")
+    parser.add_argument('--store', metavar='PATH',
+                        help="SQLite ranked results store for --watch (default: under the cache directory)")
+    parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds between --watch folder scans")
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help="Seconds a file must stay unchanged before --watch scores it")
+    parser.add_argument('--save-records', metavar='PATH',
+                        help="Save per-resume match records for fast re-scoring after skill weight changes")
+    parser.add_argument('--rescore', metavar='RECORDS',
+                        help="Rescore saved match records against --skills instead of scoring --input")
+    parser.add_argument('--index', metavar='DIR',
+                        help="Append phrase embeddings of scored resumes to a vector index for --search")
+    parser.add_argument('--search', metavar='SKILL',
+                        help="Query --index for the resumes closest to a skill instead of scoring")
+    parser.add_argument('--top-k', type=int, default=20, help="Resumes returned by --search")
+    parser.add_argument('--approximate', action='store_true',
+                        help="Use the approximate (faiss HNSW) index for --search")
+    parser.add_argument('--timings', action='store_true',
+                        help="Record per-stage timings and print a p50/p95 summary to stderr")
+    parser.add_argument('--profile', metavar='RESUME',
+                        help="Profile a single resume with cProfile instead of scoring --input")
+    parser.add_argument('--profile-output', help="Also write raw cProfile data for --profile to this file")
+    parser.add_argument('--quiet', action='store_true', help="Only log warnings and errors")
+    return parser
+
+def run(args):
+    """
+    Score every matched resume and stream results to the output
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    # Deferred so --help and argument errors stay instant
+    import pandas as pd
+    from core.matcher import skill_embedding_cache, configure_encoder, share_token_embeddings, get_embedding_storage
+    from core.pipeline import score_resumes
+    from core.multijob import load_jobs, score_jobs
+    from core.match_records import MatchRecordWriter
+    from core.vector_index import VectorIndex
+    from core.extraction_cache import ExtractionCache
+    from core.extractor import ExtractionLimits
+    from core.journal import ResultJournal, make_run_key
+    from core.ranking import TopKRanking, ResultSpill
+    from core.instrumentation import recorder, profile_resume
+
+    storage = args.embedding_storage or ('float16' if args.fast_encoder else None)
+    configure_encoder(mode='int8' if args.fast_encoder else None, storage=storage)
+    if args.shared_embeddings:
+        skill_embedding_cache.cache_dir = args.shared_embeddings
+        share_token_embeddings(args.shared_embeddings)
+
+    if args.search:
+        return search(args)
+
+    if args.profile:
+        result, report = profile_resume(args.profile, pd.read_csv(args.skills[0]), output=args.profile_output)
+        print(json.dumps(result))
+        print(report, file=sys.stderr)
+        return 0
+
+    recorder.enable(args.timings)
+
+    extraction_cache = None if args.no_cache else ExtractionCache(get_cache_dir('extraction'))
+    max_bytes = int(args.max_file_mb * 1024 * 1024) if args.max_file_mb else None
+    extraction_limits = ExtractionLimits(args.max_pages, args.max_chars, max_bytes, args.timeout)
+
+    if args.rescore:
+        return rescore(args, extraction_cache, extraction_limits)
+
+    if not args.no_cache and not args.shared_embeddings:
+        skill_embedding_cache.cache_dir = get_cache_dir('embeddings')
+
+    pipeline_options = dict(workers=args.workers, batch_size=args.batch_size, extraction_cache=extraction_cache,
+                            tokenize_processes=args.spacy_processes, extraction_limits=extraction_limits)
+    if args.spacy_batch_size:
+        pipeline_options['tokenize_batch_size'] = args.spacy_batch_size
+
+    if args.watch:
+        return watch(args, pipeline_options)
+
+    resume_paths = find_resumes(args.input)
+    if not resume_paths:
+        logger.error("No PDF or DOCX resumes found")
+        return 2
+
+    output_format = output_format_for(args)
+
+    journal = None
+    completed = []
+    if args.journal:
+        journal = ResultJournal(args.journal, make_run_key(args.skills[0], extraction_limits, get_embedding_storage()))
+        resume_paths, completed = journal.plan(resume_paths)
+
+    record_writer = None
+    spill = None
+    stream = open_output(args.output)
+    try:
+        if len(args.skills) > 1:
+            jobs = load_jobs(args.skills)
+            job_names = [job.name for job in jobs]
+            writer = JobTableCsvWriter(stream, job_names) if output_format == 'csv' else JsonlWriter(stream)
+            results = score_jobs(resume_paths, jobs, **pipeline_options)
+        else:
+            writer = WRITERS[output_format](stream)
+            weighted_skills = pd.read_csv(args.skills[0])
+            if args.save_records:
+                record_writer = MatchRecordWriter(args.save_records, weighted_skills['skills'].tolist())
+            vector_index = VectorIndex(args.index) if args.index else None
+            results = score_resumes(resume_paths, weighted_skills, record_writer=record_writer,
+                                    vector_index=vector_index, **pipeline_options)
+            if journal is not None:
+                results = itertools.chain(journal.iter_results(completed), journaled(results, journal))
+
+        logger.info(f"Scoring {len(resume_paths)} resumes with {args.workers} workers")
+
+        ranking = TopKRanking(args.rank) if args.rank else None
+        spill = ResultSpill(args.spill) if args.spill else None
+
+        processed = 0
+        for result in results:
+            if spill is not None:
+                spill.write(result)
+            if ranking is not None:
+                ranking.add(result)
+            else:
+                writer.write(result)
+            processed += 1
+
+        if ranking is not None:
+            for result in ranking.ranked():
+                writer.write(result)
+
+        logger.info(f"Scored {processed} resumes")
+        if args.timings:
+            print(recorder.format_summary(), file=sys.stderr)
+    finally:
+        if record_writer is not None:
+            record_writer.close()
+        if journal is not None:
+            journal.close()
+        if spill is not None:
+            spill.close()
+        if stream is not sys.stdout:
+            stream.close()
+
+    return 0
+
+def journaled(results, journal):
+    """Append each result to the journal before passing it on"""
+    for result in results:
+        journal.append(result)
+        yield result
+
+def watch(args, pipeline_options):
+    """
+    Score --input, then keep scoring new or changed resumes until interrupted
+
+    Each newly scored result is streamed to the output as it is stored.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+        pipeline_options (dict): Options passed to score_resumes
+
+    Returns:
+        int: Process exit code
+    """
+    import pandas as pd
+    from core.journal import make_run_key
+    from core.matcher import get_embedding_storage
+    from core.watcher import ResultStore, FolderWatcher
+
+    run_key = make_run_key(args.skills[0], pipeline_options['extraction_limits'], get_embedding_storage())
+    store_path = args.store or os.path.join(get_cache_dir('watch'), f"{run_key[:32]}.sqlite3")
+    store = ResultStore(store_path, run_key)
+    watcher = FolderWatcher(lambda: find_resumes(args.input), pd.read_csv(args.skills[0]), store,
+                            poll_interval=args.poll_interval, debounce=args.debounce, **pipeline_options)
+
+    stream = open_output(args.output)
+    writer = WRITERS[output_format_for(args)](stream)
+
+    def on_results(results):
+        for result in results:
+            writer.write(result)
+            logger.info(f"{result['file_name']}: {result['score']:.2f} (rank {store.rank_of(result['path'])} of {len(store)})")
+
+    try:
+        watcher.run(on_results)
+    except KeyboardInterrupt:
+        logger.info(f"Stopped watching; {len(store)} ranked resumes in {store_path}")
+    finally:
+        store.close()
+        if stream is not sys.stdout:
+            stream.close()
+
+    return 0
+
+def search(args):
+    """
+    Print the resumes in --index closest to the --search skill, one JSON object per line
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    from core.vector_index import VectorIndex
+
+    index = VectorIndex(args.index)
+    method = 'approximate' if args.approximate else 'exact'
+    stream = open_output(args.output)
+    try:
+        for path, similarity in index.search(args.search, k=args.top_k, method=method):
+            stream.write(json.dumps({"path": path, "similarity": similarity}) + "\n")
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return 0
+
+def rescore(args, extraction_cache, extraction_limits=None):
+    """
+    Rescore saved match records against the (changed) skills CSV
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+        extraction_cache (ExtractionCache): Used to re-read text if skills were added
+        extraction_limits (ExtractionLimits, optional): Budgets used when re-reading text
+
+    Returns:
+        int: Process exit code
+    """
+    import pandas as pd
+    from core.match_records import load_match_records, rescore_records, MatchRecordWriter
+
+    skill_list, records = load_match_records(args.rescore)
+    weighted_skills = pd.read_csv(args.skills[0])
+
+    record_writer = None
+    if args.save_records:
+        record_writer = MatchRecordWriter(args.save_records, weighted_skills['skills'].tolist())
+
+    stream = open_output(args.output)
+    try:
+        results = rescore_records(skill_list, records, weighted_skills,
+                                  extraction_cache=extraction_cache, record_writer=record_writer,
+                                  extraction_limits=extraction_limits)
+        writer = WRITERS[output_format_for(args)](stream)
+        for result in results:
+            writer.write(result)
+        logger.info(f"Rescored {len(results)} resumes")
+    finally:
+        if record_writer is not None:
+            record_writer.close()
+        if stream is not sys.stdout:
+            stream.close()
+
+    return 0
+
+def main(argv=None):
+    """CLI entry point"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.search:
+        if not args.index:
+            parser.error("--search requires --index")
+    elif not args.skills:
+        parser.error("--skills is required")
+    elif not args.input and not args.profile and not args.rescore:
+        parser.error("--input is required unless --profile or --rescore is given")
+    if args.rescore and len(args.skills) > 1:
+        parser.error("--rescore works with a single --skills file")
+    if args.save_records and len(args.skills) > 1:
+        parser.error("--save-records works with a single --skills file")
+    if (args.rank or args.spill) and len(args.skills) > 1:
+        parser.error("--rank and --spill work with a single --skills file")
+    if args.spill:
+        extension = os.path.splitext(args.spill)[1].lower()
+        if extension not in ('.csv', '.parquet'):
+            parser.error("--spill must be a .csv or .parquet file")
+        if extension == '.parquet' and importlib.util.find_spec('pyarrow') is None:
+            parser.error("--spill to .parquet requires the pyarrow package (pip install pyarrow)")
+    if args.rank is not None and args.rank < 1:
+        parser.error("--rank must be at least 1")
+    if args.watch and (len(args.skills) > 1 or args.rescore or args.journal or args.rank or args.spill
+                       or args.save_records or args.index):
+        parser.error("--watch works with a single --skills file and --input, without --journal, "
+                     "--rank, --spill, --save-records or --index")
+    if args.watch and (args.poll_interval <= 0 or args.debounce < 0):
+        parser.error("--poll-interval must be positive and --debounce non-negative")
+    if args.index and not args.search and (len(args.skills) > 1 or args.rescore):
+        parser.error("--index works with a single --skills file and --input")
+    if args.journal and (len(args.skills) > 1 or args.rescore):
+        parser.error("--journal works with a single --skills file and --input")
+    for option in ('max_pages', 'max_chars', 'max_file_mb', 'timeout', 'spacy_batch_size'):
+        value = getattr(args, option)
+        if value is not None and value <= 0:
+            parser.error(f"--{option.replace('_', '-')} must be positive")
+    if args.quiet:
+        logging.getLogger('resume_matcher').setLevel(logging.WARNING)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
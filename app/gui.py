@@ -3,14 +3,24 @@ GUI module for the Resume Skill Matcher application
 """
 
 import os
+import queue
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
 import threading
 import pandas as pd
 
-from core.extractor import extract_text_from_file
-from core.matcher import match_skills
-from core.scorer import calculate_score
+from core.models import registry, LOADED
+from core.matcher import prepare_skill_embeddings, get_embedding_storage
+from core.pipeline import score_resumes
+from core.extraction_cache import ExtractionCache
+from core.extractor import ExtractionLimits
+from core.journal import ResultJournal
+from core.ranking import TopKRanking, ResultSpill, pyarrow
+from app.utils import get_cache_dir, logger
+from app.results_view import VirtualResultsView
+
+# Milliseconds between moving finished results from the worker into the view
+RESULTS_POLL_MS = 100
 
 class ResumeSkillMatcherApp:
     """Main application class for Resume Skill Matcher"""
@@ -24,12 +34,33 @@ class ResumeSkillMatcherApp:
         
         # Variables
         self.skills_file_path = tk.StringVar()
+        self.worker_count = tk.IntVar(value=os.cpu_count() or 1)
+        # Number of best resumes kept on screen; 0 shows every result
+        self.top_k = tk.IntVar(value=0)
+        self.ranking = None
         self.resume_files = []
         self.processing_done = False
-        self.results = []
+        self.processed_count = 0
+        # Finished results are journaled to disk; a restarted run skips them
+        self.journal = None
+        # Unprocessable results are not journaled (a rerun retries them) and are exported from here
+        self.unjournaled = []
+        # Results travel from the processing thread to the Tk loop through this queue
+        self.pending_results = queue.Queue()
+        self.total_files = 0
+        self.extraction_cache = ExtractionCache(get_cache_dir('extraction'))
+        # Keep one pathological file from stalling the batch
+        self.extraction_limits = ExtractionLimits(max_pages=50, max_bytes=50 * 1024 * 1024, timeout=120)
         
         # Create GUI elements
         self.create_widgets()
+        
+        # Load NLP models in the background while the user picks files. With a worker
+        # pool, spaCy only runs in the workers, so the parent only needs the encoder
+        self.progress_label.config(text="Loading NLP models in the background...")
+        warm_models = ['embedder'] if self.worker_count.get() > 1 else ['nlp', 'embedder']
+        registry.warm_up(warm_models, callback=lambda status: self.root.after(
+            0, lambda: self.show_model_status({name: status[name] for name in warm_models})))
     
     def create_widgets(self):
         """Create and setup all GUI widgets"""
@@ -52,6 +83,16 @@ class ResumeSkillMatcherApp:
         self.resume_files_label.grid(row=1, column=1, sticky=tk.W, pady=5)
         ttk.Button(file_frame, text="Browse", command=self.browse_resume_files).grid(row=1, column=2, padx=5, pady=5)
         
+        # Number of worker processes for extraction and tokenization
+        ttk.Label(file_frame, text="Workers:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        ttk.Spinbox(file_frame, from_=1, to=(os.cpu_count() or 1) * 2, textvariable=self.worker_count,
+                    width=5).grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
+        
+        # Ranking mode: only the top K resumes are kept in memory and shown (0 = all)
+        ttk.Label(file_frame, text="Show top:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        ttk.Spinbox(file_frame, from_=0, to=10000, increment=10, textvariable=self.top_k,
+                    width=7).grid(row=3, column=1, sticky=tk.W, padx=5, pady=5)
+        
         # Process button
         self.process_button = ttk.Button(main_frame, text="Process Resumes", command=self.process_resumes)
         self.process_button.pack(pady=10)
@@ -88,8 +129,9 @@ class ResumeSkillMatcherApp:
         xscrollbar = ttk.Scrollbar(self.results_tree, orient=tk.HORIZONTAL, command=self.results_tree.xview)
         self.results_tree.configure(xscroll=xscrollbar.set)
         
-        yscrollbar = ttk.Scrollbar(self.results_tree, orient=tk.VERTICAL, command=self.results_tree.yview)
-        self.results_tree.configure(yscroll=yscrollbar.set)
+        # The vertical scrollbar is driven by the view, which only renders visible rows
+        yscrollbar = ttk.Scrollbar(self.results_tree, orient=tk.VERTICAL)
+        self.results_view = VirtualResultsView(self.results_tree, yscrollbar)
         
         # Pack treeview and scrollbar
         self.results_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -101,6 +143,19 @@ class ResumeSkillMatcherApp:
         self.export_button.pack(pady=10)
         self.export_button.state(["disabled"])
     
+    def show_model_status(self, status):
+        """Report the outcome of the background model warm-up"""
+        # Leave the label alone once processing has taken it over
+        if self.process_button.instate(["disabled"]):
+            return
+        
+        failed = [name for name, info in status.items() if info['state'] != LOADED]
+        if failed:
+            self.progress_label.config(text=f"Failed to load models: {', '.join(failed)}")
+        else:
+            load_time = sum(info['load_time'] or 0 for info in status.values())
+            self.progress_label.config(text=f"NLP models ready ({load_time:.1f}s)")
+    
     def browse_skills_file(self):
         """Open file dialog to select skills CSV file"""
         file_path = filedialog.askopenfilename(
@@ -139,115 +194,130 @@ class ResumeSkillMatcherApp:
         self.export_button.state(["disabled"])
         self.progress_label.config(text="Loading skills data...")
         
+        # Clear the previous run; results stream into the view as they finish
+        self.processed_count = 0
+        self.processing_done = False
+        self.total_files = len(self.resume_files)
+        top_k = self.top_k.get()
+        self.ranking = TopKRanking(top_k) if top_k > 0 else None
+        self.results_view.max_rows = top_k if top_k > 0 else None
+        self.results_view.clear()
+        
         # Start processing in a separate thread
         threading.Thread(target=self.process_thread, daemon=True).start()
+        self.root.after(RESULTS_POLL_MS, self.poll_results)
     
     def process_thread(self):
         """Background thread for processing resumes"""
         try:
             # Load skills data
             self.update_progress(0, "Loading skills data...")
-            weighted_skills = pd.read_csv(self.skills_file_path.get())
+            skills_csv = self.skills_file_path.get()
+            weighted_skills = pd.read_csv(skills_csv)
             skill_list = weighted_skills['skills'].tolist()
             
-            self.results = []
-            total_files = len(self.resume_files)
+            # Resumes finished by an earlier, interrupted run with the same skills are not rescored
+            if self.journal is not None:
+                self.journal.close()
+            self.journal = ResultJournal.for_run(get_cache_dir('journals'), skills_csv, self.extraction_limits,
+                                                 get_embedding_storage())
+            pending, completed = self.journal.plan(self.resume_files)
+            self.unjournaled = []
+            for result in self.journal.iter_results(completed):
+                self.pending_results.put(result)
             
-            for i, resume_path in enumerate(self.resume_files):
-                # Update progress
-                file_name = os.path.basename(resume_path)
-                self.update_progress((i / total_files) * 100, f"Processing {file_name}...")
-                
-                # Extract text based on file type
-                resume_text = extract_text_from_file(resume_path)
-                
-                if(resume_text):
-                    # Match skills
-                    matched_skills,similarity_threshold = match_skills(resume_text, skill_list)
-                    
-                    # Calculate score
-                    matched, missing, score = calculate_score(weighted_skills, matched_skills,similarity_threshold,max_threshold=0.75)
-                else:
-                    score=0.0
-                    matched=['Unable to process resume.']
-                    missing=['Unable to process resume.']
-
-                # Add to results
-                self.results.append({
-                    "file_name": file_name,
-                    "score": score,
-                    "matched_skills": list(matched),
-                    "missing_skills": list(missing)
-                })
+            # Encode the skill list once for the whole batch
+            self.update_progress(0, "Preparing skill embeddings...")
+            prepare_skill_embeddings(skill_list, cache_dir=get_cache_dir('embeddings'))
             
-            # Update UI with results
-            self.update_progress(100, "Processing complete!")
-            self.root.after(0, self.update_results_tree)
+            self.update_progress(0, f"Processing {len(pending)} resumes ({len(completed)} already done)...")
+            
+            # Results stream back in completion order; the Tk loop picks them up in poll_results
+            for result in score_resumes(pending, weighted_skills, workers=self.worker_count.get(),
+                                        extraction_cache=self.extraction_cache,
+                                        extraction_limits=self.extraction_limits):
+                if not self.journal.append(result):
+                    self.unjournaled.append(result)
+                self.pending_results.put(result)
+            self.journal.sync()
+            
+            cache_stats = self.extraction_cache.stats()
+            logger.info(f"Extraction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+            self.pending_results.put(None)
             
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {str(e)}"))
-            self.update_progress(0, "Processing failed.")
-            self.root.after(0, lambda: self.process_button.state(["!disabled"]))
+            self.pending_results.put(e)
     
     def update_progress(self, value, message):
         """Update progress bar and label in a thread-safe way"""
         self.root.after(0, lambda: self.progress_bar.config(value=value))
         self.root.after(0, lambda: self.progress_label.config(text=message))
     
-    def update_results_tree(self):
-        """Update results treeview with processed data"""
-        # Clear existing items
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-        
-        # Sort results by score (highest first)
-        sorted_results = sorted(self.results, key=lambda x: x["score"], reverse=True)
-        
-        # Add results to treeview
-        for result in sorted_results:
-            matched_skills_str = ", ".join(result["matched_skills"]) if result["matched_skills"] else "None"
-            missing_skills_str = ", ".join(result["missing_skills"]) if result["missing_skills"] else "None"
-            
-            self.results_tree.insert("", tk.END, values=(
-                result["file_name"],
-                f"{result['score']:.2f}",
-                matched_skills_str,
-                missing_skills_str
-            ))
-        
-        # Enable buttons
+    def poll_results(self):
+        """Move finished results into the view in one batch per tick, until the run ends"""
+        batch = []
+        outcome = False
+        while True:
+            try:
+                item = self.pending_results.get_nowait()
+            except queue.Empty:
+                break
+            # None marks a finished run, an exception a failed one
+            if item is None or isinstance(item, Exception):
+                outcome = item
+                break
+            batch.append(item)
+        
+        if batch:
+            self.processed_count += len(batch)
+            last_file_name = batch[-1]['file_name']
+            if self.ranking is not None:
+                # Results outside the top K are dropped here; the journal still has them
+                batch = [result for result in batch if self.ranking.add(result)]
+            self.results_view.add(batch)
+            done = self.processed_count
+            self.progress_bar.config(value=(done / self.total_files) * 100)
+            self.progress_label.config(text=f"Processed {last_file_name} ({done}/{self.total_files})")
+        
+        if outcome is False:
+            self.root.after(RESULTS_POLL_MS, self.poll_results)
+            return
+        
+        if outcome is None:
+            self.progress_bar.config(value=100)
+            self.progress_label.config(text="Processing complete!")
+            self.export_button.state(["!disabled"])
+            self.processing_done = True
+        else:
+            self.progress_bar.config(value=0)
+            self.progress_label.config(text="Processing failed. Finished resumes are saved and skipped on retry.")
         self.process_button.state(["!disabled"])
-        self.export_button.state(["!disabled"])
-        self.processing_done = True
     
     def export_results(self):
         """Export results to a CSV file"""
-        if not self.processing_done or not self.results:
+        if not self.processing_done or not self.processed_count:
             messagebox.showwarning("Warning", "No results to export.")
             return
         
+        filetypes = [("CSV Files", "*.csv")]
+        if pyarrow is not None:
+            filetypes.append(("Parquet Files", "*.parquet"))
         file_path = filedialog.asksaveasfilename(
             title="Export Results",
             defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+            filetypes=filetypes
         )
         
         if file_path:
             try:
-                # Create DataFrame from results
-                results_data = []
-                for result in self.results:
-                    results_data.append({
-                        "Resume": result["file_name"],
-                        "Score (%)": f"{result['score']:.2f}",
-                        "Matched Skills": ", ".join(result["matched_skills"]),
-                        "Missing Skills": ", ".join(result["missing_skills"])
-                    })
-                
-                df = pd.DataFrame(results_data)
-                df["Score (%)"] = df["Score (%)"].astype("float16")
-                df=df.sort_values(by="Score (%)",ascending=False)
-                df.to_csv(file_path, index=False)
+                # Every result is streamed from the journal in score order and written in chunks;
+                # unprocessable ones score 0 and go last
+                with ResultSpill(file_path) as spill:
+                    for result in self.journal.iter_results(self.resume_files, sort_by_score=True):
+                        spill.write(result)
+                    for result in self.unjournaled:
+                        spill.write(result)
                 messagebox.showinfo("Success", f"Results exported to {file_path}")
             
             except Exception as e:
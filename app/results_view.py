@@ -0,0 +1,139 @@
+"""
+Virtualized, score-sorted results view for the GUI
+
+Results are kept in a list sorted by score with bisect, so each new result
+is placed without re-sorting. The Treeview only ever holds enough items to
+fill its visible height; scrolling rewrites those items' values instead of
+materializing a row per resume.
+"""
+
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+def format_result_row(result):
+    """Treeview values of one result"""
+    return (
+        result["file_name"],
+        f"{result['score']:.2f}",
+        ", ".join(result["matched_skills"]) if result["matched_skills"] else "None",
+        ", ".join(result["missing_skills"]) if result["missing_skills"] else "None",
+    )
+
+class VirtualResultsView:
+    """Renders the visible window of a score-sorted result list into a Treeview"""
+
+    def __init__(self, tree, scrollbar, format_row=format_result_row, max_rows=None):
+        """
+        Args:
+            tree (ttk.Treeview): Treeview to render into; it must not be scrolled by anything else
+            scrollbar (ttk.Scrollbar): Vertical scrollbar driven by this view
+            format_row (callable): Maps a result dict to Treeview values
+            max_rows (int, optional): Keep only this many best results
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_row = format_row
+        self.max_rows = max_rows
+        # Sort keys (-score, arrival) and [result, formatted values] entries, best first
+        self._keys = []
+        self._entries = []
+        self._arrivals = 0
+        # Index of the first visible result
+        self.top = 0
+        # Treeview items reused for whichever results are visible
+        self._items = []
+
+        scrollbar.configure(command=self.yview)
+        tree.bind('<Configure>', lambda event: self.render())
+        tree.bind('<MouseWheel>', self._on_mousewheel)
+        tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        tree.bind('<Button-5>', lambda event: self.scroll(3))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def results(self):
+        """All results, highest score first"""
+        return [entry[0] for entry in self._entries]
+
+    def clear(self):
+        """Remove every result"""
+        self._keys = []
+        self._entries = []
+        self._arrivals = 0
+        self.top = 0
+        self.render()
+
+    def add(self, results):
+        """
+        Insert results in score order and redraw once
+
+        Args:
+            results (list): Result dicts with at least 'file_name', 'score',
+                'matched_skills' and 'missing_skills'
+        """
+        for result in results:
+            key = (-result["score"], self._arrivals)
+            self._arrivals += 1
+            index = bisect.bisect(self._keys, key)
+            self._keys.insert(index, key)
+            self._entries.insert(index, [result, None])
+            # Keep the rows the user scrolled to in place; at the top, show the new best
+            if 0 < self.top and index < self.top:
+                self.top += 1
+        if self.max_rows:
+            del self._keys[self.max_rows:]
+            del self._entries[self.max_rows:]
+        self.render()
+
+    def visible_rows(self):
+        """Number of rows that fit in the Treeview's current height"""
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        # One row's worth of height is taken by the headings
+        return max(1, self.tree.winfo_height() // row_height - 1)
+
+    def render(self):
+        """Write the visible window of results into the pooled Treeview items"""
+        visible = self.visible_rows()
+        while len(self._items) < visible:
+            self._items.append(self.tree.insert("", tk.END, values=()))
+
+        total = len(self._entries)
+        self.top = max(0, min(self.top, total - visible))
+
+        for position, item in enumerate(self._items):
+            index = self.top + position
+            if position < visible and index < total:
+                entry = self._entries[index]
+                # Skill lists are only joined for rows that are actually shown
+                if entry[1] is None:
+                    entry[1] = self.format_row(entry[0])
+                self.tree.item(item, values=entry[1])
+                self.tree.move(item, "", position)
+            else:
+                self.tree.detach(item)
+
+        if total <= visible:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.top / total, (self.top + visible) / total)
+
+    def scroll(self, rows):
+        """Move the window by a number of rows"""
+        self.top += rows
+        # Pooled items now show other resumes, so a selection would be misleading
+        self.tree.selection_remove(self.tree.selection())
+        self.render()
+        return "break"
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'"""
+        if args[0] == 'moveto':
+            return self.scroll(int(float(args[1]) * len(self._entries)) - self.top)
+        if args[0] == 'scroll':
+            step = self.visible_rows() if args[2] == 'pages' else 1
+            return self.scroll(int(args[1]) * step)
+
+    def _on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
@@ -0,0 +1,502 @@
+"""
+Persistent local scoring service
+
+Keeps the NLP models resident and collects concurrent scoring requests into
+micro-batches, so each encoder call serves several resumes.
+
+Usage:
+    python -m app.service --port 8765 --allow-root /data
+
+    POST /score    {"skills_csv": "/data/skills.csv", "text": "..."}
+                   {"skills_csv": "/data/skills.csv", "path": "/data/resume.pdf"}
+                   {"skills_csv": "/data/skills.csv", "file_name": "cv.docx", "content": "<base64>"}
+    GET  /health   model load state and queue depth
+    GET  /metrics  request counts, batch sizes and latency percentiles
+
+Server-side files ('skills_csv' and 'path') are only read from directories
+given with --allow-root; without one, every such request is refused with
+403, so clients cannot make the service read arbitrary local files. Request
+bodies larger than --max-body-mb are refused with 413, and uploaded or
+server-side resumes are extracted under page, size and time budgets
+(--max-pages, --max-file-mb, --timeout).
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import base64
+import logging
+import argparse
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.utils import logger
+from core.models import registry
+from core.extractor import extract_text_from_file, ExtractionLimits, ExtractionTimeout
+from core.matcher import (find_exact_matches, tokenize_resumes, batch_similarity, match_tokens,
+                          get_skill_embeddings, configure_encoder, share_token_embeddings,
+                          skill_embedding_cache)
+from core.scorer import SkillScorer
+from core.pipeline import MAX_THRESHOLD, UNPROCESSABLE
+from core.instrumentation import percentile
+
+class ServiceBusy(Exception):
+    """Raised when the request queue is full"""
+
+def resolve_allowed_path(path, allowed_roots):
+    """
+    Resolve a client-supplied path and check it lies inside an allowed root
+
+    Args:
+        path (str): Path from a request
+        allowed_roots (list): Directories server-side files may be read from
+
+    Returns:
+        str: Resolved path
+
+    Raises:
+        PermissionError: If the path is outside every allowed root
+    """
+    resolved = os.path.realpath(path)
+    for root in allowed_roots:
+        root = os.path.realpath(root)
+        if os.path.commonpath([root, resolved]) == root:
+            return resolved
+    if not allowed_roots:
+        raise PermissionError("Server-side files are disabled; start the service with --allow-root")
+    raise PermissionError(f"{path} is outside the allowed directories")
+
+class SkillsRegistry:
+    """Skills CSVs loaded once and reloaded only when the file changes"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, skills_csv):
+        """
+        Return (skill_list, scorer) for a skills CSV path
+
+        Raises:
+            FileNotFoundError: If the CSV does not exist
+        """
+        import pandas as pd
+
+        path = os.path.abspath(skills_csv)
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != mtime:
+                weighted_skills = pd.read_csv(path)
+                skill_list = weighted_skills['skills'].tolist()
+                get_skill_embeddings(skill_list)
+                entry = (mtime, skill_list, SkillScorer(weighted_skills))
+                self._entries[path] = entry
+                logger.info(f"Loaded {len(skill_list)} skills from {path}")
+            return entry[1], entry[2]
+
+class ServiceMetrics:
+    """Request counters and a sliding window of latencies"""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=window)
+        self.queue_waits = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+
+    def record_request(self, latency, queue_wait=None, error=False):
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.latencies.append(latency)
+            if queue_wait is not None:
+                self.queue_waits.append(queue_wait)
+
+    def record_rejected(self):
+        with self._lock:
+            self.rejected += 1
+
+    def record_batch(self, size):
+        with self._lock:
+            self.batches += 1
+            self.batch_sizes.append(size)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = list(self.latencies)
+            queue_waits = list(self.queue_waits)
+            batch_sizes = list(self.batch_sizes)
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'rejected': self.rejected,
+                'batches': self.batches,
+                'latency_ms_p50': percentile(latencies, 0.50) * 1000,
+                'latency_ms_p95': percentile(latencies, 0.95) * 1000,
+                'queue_wait_ms_p50': percentile(queue_waits, 0.50) * 1000,
+                'queue_wait_ms_p95': percentile(queue_waits, 0.95) * 1000,
+                'batch_size_mean': sum(batch_sizes) / len(batch_sizes) if batch_sizes else 0,
+            }
+
+class ScoringRequest:
+    """One resume waiting for its micro-batch"""
+
+    def __init__(self, resume_text, file_name, skills_csv):
+        self.resume_text = resume_text
+        self.file_name = file_name
+        self.skills_csv = skills_csv
+        self.enqueued = time.perf_counter()
+        self.dequeued = None
+        self.future = Future()
+
+class MicroBatcher:
+    """Background thread scoring queued requests in micro-batches"""
+
+    def __init__(self, skills, metrics, max_batch=32, max_wait=0.02, max_queue=256):
+        """
+        Args:
+            skills (SkillsRegistry): Loaded skills CSVs
+            metrics (ServiceMetrics): Metrics sink
+            max_batch (int): Most requests scored together
+            max_wait (float): Seconds to wait for more requests once one has arrived
+            max_queue (int): Queued requests before new ones are rejected
+        """
+        self.skills = skills
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, request):
+        """
+        Queue a request
+
+        Raises:
+            ServiceBusy: If the queue is full
+        """
+        try:
+            self.requests.put_nowait(request)
+        except queue.Full:
+            self.metrics.record_rejected()
+            raise ServiceBusy("Scoring queue is full")
+        return request.future
+
+    def _collect(self):
+        """Block for one request, then gather more until the batch is full or max_wait passes"""
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # Requests whose client already timed out were cancelled; the rest can no longer be
+            batch = [request for request in self._collect() if request.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            now = time.perf_counter()
+            for request in batch:
+                request.dequeued = now
+            self.metrics.record_batch(len(batch))
+
+            # Requests against the same skills CSV share one similarity computation
+            groups = {}
+            for request in batch:
+                groups.setdefault(request.skills_csv, []).append(request)
+            for skills_csv, requests in groups.items():
+                try:
+                    self._score_group(skills_csv, requests)
+                except Exception as e:
+                    logger.error(f"Error scoring batch for {skills_csv}: {e}")
+                    for request in requests:
+                        if not request.future.done():
+                            request.future.set_exception(e)
+
+    def _score_group(self, skills_csv, requests):
+        skill_list, scorer = self.skills.get(skills_csv)
+
+        usable = [request for request in requests if request.resume_text]
+        try:
+            self._score_requests(usable, skill_list, scorer)
+        except Exception as e:
+            if len(usable) == 1:
+                raise
+            # Score one at a time so a request that breaks the batch only fails its own future
+            logger.warning(f"Batch of {len(usable)} requests failed ({e}); scoring them one by one")
+            for request in usable:
+                if request.future.done():
+                    continue
+                try:
+                    self._score_requests([request], skill_list, scorer)
+                except Exception as e:
+                    logger.error(f"Error scoring {request.file_name}: {e}")
+                    request.future.set_exception(e)
+
+        for request in requests:
+            if not request.resume_text:
+                request.future.set_result({
+                    "file_name": request.file_name,
+                    "score": 0.0,
+                    "matched_skills": [UNPROCESSABLE],
+                    "missing_skills": [UNPROCESSABLE],
+                })
+
+    def _score_requests(self, requests, skill_list, scorer):
+        """Tokenize and encode requests together, then resolve each one's future"""
+        token_lists = tokenize_resumes([request.resume_text for request in requests])
+        similarities = batch_similarity(token_lists, skill_list)
+
+        for request, tokens, similarity_scores in zip(requests, token_lists, similarities):
+            exact_matches = find_exact_matches(request.resume_text, skill_list)
+            matched_skills, similarity_threshold = match_tokens(
+                exact_matches, tokens, skill_list, similarity_scores=similarity_scores
+            )
+            matched, missing, score = scorer.score(matched_skills, similarity_threshold, MAX_THRESHOLD)
+            request.future.set_result({
+                "file_name": request.file_name,
+                "score": score,
+                "matched_skills": sorted(matched),
+                "missing_skills": sorted(missing),
+            })
+
+def read_resume_text(payload, allowed_roots=(), limits=None):
+    """
+    Resolve the resume text of a /score payload
+
+    Args:
+        payload (dict): Request body
+        allowed_roots (list): Directories a server-side 'path' may be read from
+        limits (ExtractionLimits, optional): Budgets for extracting 'path' and 'content'
+
+    Returns:
+        tuple: (resume_text, file_name)
+
+    Raises:
+        ValueError: If the payload has no usable resume or a file exceeds max_bytes
+        ExtractionTimeout: If extraction exceeds the timeout
+        PermissionError: If 'path' is outside the allowed roots
+    """
+    if 'text' in payload:
+        if not isinstance(payload['text'], str):
+            raise ValueError("'text' must be a string")
+        return payload['text'], payload.get('file_name', 'text')
+
+    if 'path' in payload:
+        path = resolve_allowed_path(payload['path'], allowed_roots)
+        return extract_text_from_file(path, limits=limits), os.path.basename(path)
+
+    if 'content' in payload:
+        file_name = payload.get('file_name', 'resume.pdf')
+        _, file_ext = os.path.splitext(file_name)
+        content = base64.b64decode(payload['content'])
+        # Extractors work on paths, so uploads are spooled to a temporary file
+        with tempfile.NamedTemporaryFile(suffix=file_ext.lower(), delete=False) as f:
+            f.write(content)
+            temp_path = f.name
+        try:
+            return extract_text_from_file(temp_path, limits=limits), file_name
+        finally:
+            os.remove(temp_path)
+
+    raise ValueError("Request needs one of 'text', 'path' or 'content'")
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """HTTP front end for the micro-batcher"""
+
+    # Set by serve()
+    batcher = None
+    metrics = None
+    request_timeout = 60
+    allowed_roots = ()
+    max_body_bytes = 20 * 1024 * 1024
+    extraction_limits = None
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {
+                'models': registry.status(),
+                'queue_depth': self.batcher.requests.qsize(),
+            })
+        elif self.path == '/metrics':
+            self._send_json(200, self.metrics.snapshot())
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/score':
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+
+        start = time.perf_counter()
+        request = None
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length > self.max_body_bytes:
+                # The body is left unread, so the connection cannot be reused
+                self.close_connection = True
+                self.metrics.record_request(time.perf_counter() - start, error=True)
+                self._send_json(413, {'error': f"Request body is larger than {self.max_body_bytes} bytes"})
+                return
+            if length < 0:
+                raise ValueError("Invalid Content-Length")
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            if 'skills_csv' not in payload:
+                raise ValueError("Request needs 'skills_csv'")
+
+            skills_csv = resolve_allowed_path(payload['skills_csv'], self.allowed_roots)
+            resume_text, file_name = read_resume_text(payload, self.allowed_roots, self.extraction_limits)
+            request = ScoringRequest(resume_text, file_name, skills_csv)
+            result = self.batcher.submit(request).result(timeout=self.request_timeout)
+
+        except ServiceBusy as e:
+            self._send_json(503, {'error': str(e)})
+            return
+        except PermissionError as e:
+            self.metrics.record_request(time.perf_counter() - start, error=True)
+            self._send_json(403, {'error': str(e)})
+            return
+        except ExtractionTimeout as e:
+            # A TimeoutError too, so it must be handled before the scoring timeout
+            self.metrics.record_request(time.perf_counter() - start, error=True)
+            self._send_json(400, {'error': str(e)})
+            return
+        except FutureTimeoutError:
+            # Free the batch slot if the request has not been picked up yet
+            if request is not None:
+                request.future.cancel()
+            self.metrics.record_request(time.perf_counter() - start, error=True)
+            self._send_json(504, {'error': f"Scoring took longer than {self.request_timeout}s"})
+            return
+        except (ValueError, KeyError, FileNotFoundError) as e:
+            self.metrics.record_request(time.perf_counter() - start, error=True)
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self.metrics.record_request(time.perf_counter() - start, error=True)
+            self._send_json(500, {'error': str(e)})
+            return
+
+        latency = time.perf_counter() - start
+        queue_wait = request.dequeued - request.enqueued if request.dequeued else None
+        self.metrics.record_request(latency, queue_wait)
+        result['latency_ms'] = latency * 1000
+        self._send_json(200, result)
+
+def serve(host='127.0.0.1', port=8765, max_batch=32, max_wait=0.02, max_queue=256, allowed_roots=(),
+          max_body_bytes=ScoringHandler.max_body_bytes, extraction_limits=None):
+    """
+    Load models and serve scoring requests until interrupted
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind
+        max_batch (int): Most requests scored together
+        max_wait (float): Seconds to wait for a micro-batch to fill
+        max_queue (int): Queued requests before new ones get HTTP 503
+        allowed_roots (list): Directories server-side skills CSVs and resumes may be read from
+        max_body_bytes (int): Largest request body accepted; bigger ones get HTTP 413
+        extraction_limits (ExtractionLimits, optional): Page, size and time budgets for
+            extracting uploaded and server-side resumes
+    """
+    logger.info("Loading NLP models...")
+    registry.warm_up(background=False)
+
+    metrics = ServiceMetrics()
+    batcher = MicroBatcher(SkillsRegistry(), metrics, max_batch=max_batch, max_wait=max_wait, max_queue=max_queue)
+    batcher.start()
+
+    ScoringHandler.batcher = batcher
+    ScoringHandler.metrics = metrics
+    ScoringHandler.allowed_roots = list(allowed_roots)
+    ScoringHandler.max_body_bytes = max_body_bytes
+    ScoringHandler.extraction_limits = extraction_limits
+
+    server = ThreadingHTTPServer((host, port), ScoringHandler)
+    logger.info(f"Scoring service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down scoring service")
+    finally:
+        server.server_close()
+
+def main(argv=None):
+    """Service entry point"""
+    parser = argparse.ArgumentParser(description="Run the resume scoring service")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind (default: localhost only)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=32, help="Most requests per micro-batch")
+    parser.add_argument('--max-wait-ms', type=float, default=20, help="Wait for a micro-batch to fill")
+    parser.add_argument('--max-queue', type=int, default=256, help="Queued requests before rejecting with 503")
+    parser.add_argument('--allow-root', action='append', default=[], metavar='DIR',
+                        help="Directory clients may reference with 'skills_csv' and 'path' (repeatable)")
+    parser.add_argument('--max-body-mb', type=float, default=20,
+                        help="Largest request body accepted, in MB (default: 20)")
+    parser.add_argument('--max-pages', type=int, default=50, help="Read at most this many pages per PDF (default: 50)")
+    parser.add_argument('--max-file-mb', type=float, default=50, help="Refuse resume files larger than this (default: 50)")
+    parser.add_argument('--timeout', type=float, default=120, metavar='SECONDS',
+                        help="Abandon extracting a resume after this long (default: 120)")
+    parser.add_argument('--fast-encoder', action='store_true',
+                        help="Use the int8-quantized encoder (CPU) and float16 embedding storage")
+    parser.add_argument('--embedding-storage', choices=['float32', 'float16', 'int8'], default=None,
+                        help="Storage format of cached embeddings")
+    parser.add_argument('--shared-embeddings', metavar='DIR',
+                        help="Memory-map skill and token embeddings from a directory shared with other processes")
+    parser.add_argument('--quiet', action='store_true', help="Only log warnings and errors")
+    args = parser.parse_args(argv)
+    for option in ('max_body_mb', 'max_pages', 'max_file_mb', 'timeout'):
+        if getattr(args, option) <= 0:
+            parser.error(f"--{option.replace('_', '-')} must be positive")
+
+    if args.quiet:
+        logging.getLogger('resume_matcher').setLevel(logging.WARNING)
+
+    storage = args.embedding_storage or ('float16' if args.fast_encoder else None)
+    configure_encoder(mode='int8' if args.fast_encoder else None, storage=storage)
+    if args.shared_embeddings:
+        skill_embedding_cache.cache_dir = args.shared_embeddings
+        share_token_embeddings(args.shared_embeddings)
+
+    if not args.allow_root:
+        logger.warning("No --allow-root given: requests naming server-side files will be refused")
+    extraction_limits = ExtractionLimits(max_pages=args.max_pages, max_bytes=int(args.max_file_mb * 1024 * 1024),
+                                         timeout=args.timeout)
+    serve(args.host, args.port, args.max_batch, args.max_wait_ms / 1000, args.max_queue, args.allow_root,
+          int(args.max_body_mb * 1024 * 1024), extraction_limits)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,12 @@ logging.basicConfig(
 
 logger = logging.getLogger('resume_matcher')
 
+# Root directory for on-disk caches, overridable for shared or ephemeral setups
+CACHE_ROOT = os.environ.get(
+    'RESUME_MATCHER_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'resume_matcher')
+)
+
 def setup_logging(log_file=None):
     """Set up logging to file and console"""
     if log_file:
@@ -30,6 +36,10 @@ def ensure_directory(directory):
         logger.info(f"Created directory: {directory}")
     return directory
 
+def get_cache_dir(name):
+    """Return a named cache directory under CACHE_ROOT, creating it if needed"""
+    return ensure_directory(os.path.join(CACHE_ROOT, name))
+
 def is_valid_file(filepath, allowed_extensions=None):
     """Check if file exists and has allowed extension"""
     if not os.path.isfile(filepath):
@@ -0,0 +1,8 @@
+"""
+Reproducible throughput benchmarks for extraction, matching and scoring
+
+Usage:
+    python -m benchmarks.run --skills 100 --files 200 --pages 2 --output results.json
+    python -m benchmarks.run --files 200 --baseline results.json
+    python -m benchmarks.accuracy --files 200 --mode int8 --storage float16
+"""
@@ -0,0 +1,167 @@
+"""
+Accuracy check for the fast encoder mode
+
+Scores a sample corpus with the fp32 encoder and float32 embedding storage,
+then with a candidate mode/storage, and reports how the matched-skill sets
+and scores differ. Tokenization is shared, so only encoding differs.
+
+Usage:
+    python -m benchmarks.accuracy --skills skills.csv --input resumes/ --mode int8 --storage float16
+    python -m benchmarks.accuracy --files 200 --mode int8 --storage int8 --output accuracy.json
+"""
+
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+from benchmarks.synthetic import generate_corpus
+
+logger = logging.getLogger('resume_matcher.benchmarks.accuracy')
+
+BASELINE = ('fp32', 'float32')
+
+def prepare_corpus(resume_paths, skill_list):
+    """Extract, exact-match and tokenize every resume once; unusable resumes are dropped"""
+    from core.extractor import extract_text_from_file
+    from core.matcher import find_exact_matches, tokenize_resumes
+
+    paths, exact, texts = [], [], []
+    for path in resume_paths:
+        try:
+            text = extract_text_from_file(path)
+        except Exception as e:
+            logger.warning(f"Skipping {path}: {e}")
+            continue
+        if text:
+            paths.append(path)
+            texts.append(text)
+            exact.append(find_exact_matches(text, skill_list))
+    return paths, exact, tokenize_resumes(texts)
+
+def match_corpus(exact, token_lists, skill_list, scorer, mode, storage, batch_size=32, max_threshold=0.75):
+    """
+    Match and score a prepared corpus under one encoder configuration
+
+    Returns:
+        tuple: (list of matched-skill sets, list of scores, stats dict)
+    """
+    from core.matcher import (configure_encoder, batch_similarity, match_tokens, get_skill_embeddings,
+                              token_embedding_cache, skill_embedding_cache)
+
+    configure_encoder(mode=mode, storage=storage)
+    token_embedding_cache.clear()
+    skill_embedding_cache.clear()
+    skill_list_embeddings = get_skill_embeddings(skill_list)
+
+    matched_sets, scores = [], []
+    start = time.perf_counter()
+    for offset in range(0, len(token_lists), batch_size):
+        batch = token_lists[offset:offset + batch_size]
+        for i, similarity_scores in enumerate(batch_similarity(batch, skill_list)):
+            matched, threshold = match_tokens(exact[offset + i], batch[i], skill_list,
+                                              similarity_scores=similarity_scores)
+            _, _, score = scorer.score(matched, threshold, max_threshold)
+            matched_sets.append(set(matched))
+            scores.append(score)
+    stats = {
+        'mode': mode,
+        'storage': storage,
+        'match_s': time.perf_counter() - start,
+        'token_cache_mb': token_embedding_cache.memory_bytes() / (1024 * 1024),
+        'skill_matrix_shape': list(skill_list_embeddings.shape),
+    }
+    return matched_sets, scores, stats
+
+def compare_matches(baseline_sets, candidate_sets, baseline_scores, candidate_scores):
+    """
+    Summarise how candidate matched-skill sets and scores differ from the baseline
+
+    Returns:
+        dict: Agreement, micro precision/recall, set and score differences
+    """
+    resumes = len(baseline_sets)
+    identical = sum(1 for a, b in zip(baseline_sets, candidate_sets) if a == b)
+    jaccards = [len(a & b) / len(a | b) if a | b else 1.0 for a, b in zip(baseline_sets, candidate_sets)]
+    agreed = sum(len(a & b) for a, b in zip(baseline_sets, candidate_sets))
+    added = sum(len(b - a) for a, b in zip(baseline_sets, candidate_sets))
+    dropped = sum(len(a - b) for a, b in zip(baseline_sets, candidate_sets))
+    score_diffs = [abs(a - b) for a, b in zip(baseline_scores, candidate_scores)]
+    return {
+        'resumes': resumes,
+        'identical_sets': identical,
+        'identical_fraction': identical / resumes if resumes else 1.0,
+        'mean_jaccard': sum(jaccards) / resumes if resumes else 1.0,
+        'precision': agreed / (agreed + added) if agreed + added else 1.0,
+        'recall': agreed / (agreed + dropped) if agreed + dropped else 1.0,
+        'skills_added': added,
+        'skills_dropped': dropped,
+        'score_abs_diff_mean': sum(score_diffs) / resumes if resumes else 0.0,
+        'score_abs_diff_max': max(score_diffs, default=0.0),
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Compare a fast encoder configuration against the fp32 baseline")
+    parser.add_argument('--skills', help="Skills CSV (default: synthetic)")
+    parser.add_argument('--input', action='append', default=[],
+                        help="Resume directory, glob pattern or file (default: synthetic corpus)")
+    parser.add_argument('--files', type=int, default=100, help="Synthetic resumes when --input is not given")
+    parser.add_argument('--pages', type=int, default=2, help="Pages per synthetic resume")
+    parser.add_argument('--seed', type=int, default=0, help="Synthetic corpus random seed")
+    parser.add_argument('--limit', type=int, default=None, help="Check at most this many resumes")
+    parser.add_argument('--mode', choices=['fp32', 'int8'], default='int8', help="Candidate encoder mode")
+    parser.add_argument('--storage', choices=['float32', 'float16', 'int8'], default='float16',
+                        help="Candidate embedding storage")
+    parser.add_argument('--output', help="Write the report JSON to this file")
+    return parser
+
+def main(argv=None):
+    """Accuracy check entry point"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logging.getLogger('resume_matcher.core').setLevel(logging.WARNING)
+
+    import pandas as pd
+    from app.cli import find_resumes
+    from core.scorer import SkillScorer
+
+    corpus_dir = None
+    try:
+        if args.input and args.skills:
+            skills_csv, resume_paths = args.skills, find_resumes(args.input)
+        else:
+            corpus_dir = tempfile.mkdtemp(prefix='resume_accuracy_')
+            skills_csv, resume_paths = generate_corpus(corpus_dir, files=args.files, pages=args.pages, seed=args.seed)
+        resume_paths = resume_paths[:args.limit] if args.limit else resume_paths
+
+        weighted_skills = pd.read_csv(skills_csv)
+        skill_list = weighted_skills['skills'].tolist()
+        scorer = SkillScorer(weighted_skills)
+
+        paths, exact, token_lists = prepare_corpus(resume_paths, skill_list)
+        logger.info(f"Prepared {len(paths)} of {len(resume_paths)} resumes")
+
+        baseline_sets, baseline_scores, baseline_stats = match_corpus(exact, token_lists, skill_list, scorer, *BASELINE)
+        candidate_sets, candidate_scores, candidate_stats = match_corpus(exact, token_lists, skill_list, scorer,
+                                                                         args.mode, args.storage)
+    finally:
+        if corpus_dir:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    report = {
+        'baseline': baseline_stats,
+        'candidate': candidate_stats,
+        'agreement': compare_matches(baseline_sets, candidate_sets, baseline_scores, candidate_scores),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""
+Benchmark runner
+
+Generates a synthetic corpus, then runs each stage (extract, tokenize, match,
+score) and the end-to-end pipeline in its own fresh process, so every stage
+gets its own peak RSS and model loading is kept out of the timings. Results
+are written as JSON and can be compared against a saved baseline.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is left out of the results there
+    resource = None
+
+from benchmarks.synthetic import generate_corpus
+
+logger = logging.getLogger('resume_matcher.benchmarks')
+
+RESULTS_FORMAT_VERSION = 1
+
+STAGES = ['extract', 'tokenize', 'match', 'score', 'end_to_end']
+
+# Metric -> True if larger is better
+COMPARED_METRICS = {
+    'resumes_per_sec': True,
+    'latency_ms_p50': False,
+    'latency_ms_p95': False,
+    'peak_rss_mb': False,
+}
+
+def _peak_rss_mb(children=False):
+    """Peak resident set size of this process (or its children) in MiB, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _stage_result(latencies, wall, extra=None):
+    """Aggregate per-resume latencies (seconds) of one stage"""
+    from core.instrumentation import percentile
+
+    result = {
+        'resumes': len(latencies),
+        'wall_s': wall,
+        'resumes_per_sec': len(latencies) / wall if wall > 0 else 0.0,
+        'latency_ms_p50': percentile(latencies, 0.50) * 1000,
+        'latency_ms_p95': percentile(latencies, 0.95) * 1000,
+        'latency_ms_p99': percentile(latencies, 0.99) * 1000,
+    }
+    if resource is not None:
+        result['peak_rss_mb'] = _peak_rss_mb()
+    result.update(extra or {})
+    return result
+
+def _load_skills(skills_csv):
+    import pandas as pd
+    return pd.read_csv(skills_csv)
+
+def bench_extract(paths):
+    """Extract every resume without the extraction cache"""
+    from core.extractor import extract_text_from_file
+
+    texts, latencies = [], []
+    start = time.perf_counter()
+    for path in paths:
+        t0 = time.perf_counter()
+        texts.append(extract_text_from_file(path))
+        latencies.append(time.perf_counter() - t0)
+    return texts, _stage_result(latencies, time.perf_counter() - start)
+
+def bench_tokenize(texts):
+    """Tokenize every resume text with a warmed spaCy pipeline"""
+    from core.models import registry
+    from core.matcher import tokenize_resume
+
+    t0 = time.perf_counter()
+    registry.warm_up(['nlp'], background=False)
+    model_load = time.perf_counter() - t0
+
+    token_lists, latencies = [], []
+    start = time.perf_counter()
+    for text in texts:
+        t0 = time.perf_counter()
+        token_lists.append(tokenize_resume(text) if text else None)
+        latencies.append(time.perf_counter() - t0)
+    return token_lists, _stage_result(latencies, time.perf_counter() - start, {'model_load_s': model_load})
+
+def bench_match(texts, token_lists, skills_csv, batch_size):
+    """Exact matching, encoding and similarity in batches, as the pipeline does"""
+    from core.models import registry
+    from core.matcher import find_exact_matches, batch_similarity, match_tokens, get_skill_embeddings
+
+    skill_list = _load_skills(skills_csv)['skills'].tolist()
+    t0 = time.perf_counter()
+    registry.warm_up(['embedder'], background=False)
+    get_skill_embeddings(skill_list)
+    model_load = time.perf_counter() - t0
+
+    usable = [(text, tokens) for text, tokens in zip(texts, token_lists) if text and tokens is not None]
+    matches, latencies = [], []
+    start = time.perf_counter()
+    for offset in range(0, len(usable), batch_size):
+        batch = usable[offset:offset + batch_size]
+        t0 = time.perf_counter()
+        similarities = batch_similarity([tokens for _, tokens in batch], skill_list)
+        for (text, tokens), similarity_scores in zip(batch, similarities):
+            exact_matches = find_exact_matches(text, skill_list)
+            matches.append(match_tokens(exact_matches, tokens, skill_list, similarity_scores=similarity_scores))
+        # Resumes in a batch share its encoder call, so each is charged an equal share
+        latencies.extend([(time.perf_counter() - t0) / len(batch)] * len(batch))
+    return matches, _stage_result(latencies, time.perf_counter() - start,
+                                  {'model_load_s': model_load, 'skills': len(skill_list)})
+
+def bench_score(matches, skills_csv, max_threshold):
+    """Weighted scoring of already matched skill sets"""
+    from core.scorer import SkillScorer
+
+    scorer = SkillScorer(_load_skills(skills_csv))
+    latencies = []
+    start = time.perf_counter()
+    for matched_skills, similarity_threshold in matches:
+        t0 = time.perf_counter()
+        scorer.score(matched_skills, similarity_threshold, max_threshold)
+        latencies.append(time.perf_counter() - t0)
+    return None, _stage_result(latencies, time.perf_counter() - start)
+
+def bench_end_to_end(paths, skills_csv, workers, batch_size):
+    """The full score_resumes pipeline, with per-stage samples from the recorder"""
+    from core.models import registry
+    from core.instrumentation import recorder
+    from core.pipeline import score_resumes
+
+    weighted_skills = _load_skills(skills_csv)
+    t0 = time.perf_counter()
+    registry.warm_up(background=False)
+    model_load = time.perf_counter() - t0
+
+    recorder.enable()
+    latencies = []
+    start = last = time.perf_counter()
+    for _ in score_resumes(paths, weighted_skills, workers=workers, batch_size=batch_size):
+        now = time.perf_counter()
+        # Results stream out of a pipeline, so latency is the gap between results
+        latencies.append(now - last)
+        last = now
+    result = _stage_result(latencies, time.perf_counter() - start, {
+        'model_load_s': model_load,
+        'workers_peak_rss_mb': _peak_rss_mb(children=True),
+        'recorder': {
+            stage: {
+                'count': stats['count'],
+                'wall_ms_p50': stats['wall_p50'] * 1000,
+                'wall_ms_p95': stats['wall_p95'] * 1000,
+            }
+            for stage, stats in recorder.summary().items()
+        },
+    })
+    return None, result
+
+def _in_fresh_process(function, *args):
+    """Run a stage function in a new spawned process and return its (output, result)"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(function, *args).result()
+
+def run_benchmarks(args):
+    """
+    Generate the corpus and measure every stage
+
+    Returns:
+        dict: Machine-readable results
+    """
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix='resume_bench_')
+    try:
+        t0 = time.perf_counter()
+        skills_csv, paths = generate_corpus(corpus_dir, skills=args.skills, files=args.files,
+                                            pages=args.pages, docx_ratio=args.docx_ratio, seed=args.seed)
+        logger.info(f"Generated {len(paths)} resumes in {time.perf_counter() - t0:.1f}s under {corpus_dir}")
+
+        stages = {}
+        texts, stages['extract'] = _in_fresh_process(bench_extract, paths)
+        logger.info(f"extract: {stages['extract']['resumes_per_sec']:.1f} resumes/s")
+        token_lists, stages['tokenize'] = _in_fresh_process(bench_tokenize, texts)
+        logger.info(f"tokenize: {stages['tokenize']['resumes_per_sec']:.1f} resumes/s")
+        matches, stages['match'] = _in_fresh_process(bench_match, texts, token_lists, skills_csv, args.batch_size)
+        logger.info(f"match: {stages['match']['resumes_per_sec']:.1f} resumes/s")
+        _, stages['score'] = _in_fresh_process(bench_score, matches, skills_csv, args.max_threshold)
+        logger.info(f"score: {stages['score']['resumes_per_sec']:.1f} resumes/s")
+        _, stages['end_to_end'] = _in_fresh_process(bench_end_to_end, paths, skills_csv, args.workers, args.batch_size)
+        logger.info(f"end_to_end: {stages['end_to_end']['resumes_per_sec']:.1f} resumes/s")
+    finally:
+        if not args.keep_corpus and not args.corpus_dir:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    return {
+        'format': RESULTS_FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'config': {
+            'skills': args.skills,
+            'files': args.files,
+            'pages': args.pages,
+            'docx_ratio': args.docx_ratio,
+            'seed': args.seed,
+            'workers': args.workers,
+            'batch_size': args.batch_size,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'stages': stages,
+    }
+
+def compare_results(current, baseline, tolerance=0.10):
+    """
+    Compare two result files metric by metric
+
+    Args:
+        current (dict): Results of this run
+        baseline (dict): Saved baseline results
+        tolerance (float): Relative change treated as noise
+
+    Returns:
+        tuple: (report lines, list of regressions as "stage.metric" strings)
+    """
+    if current.get('config') != baseline.get('config'):
+        logger.warning("Baseline was recorded with a different configuration; comparison may be meaningless")
+
+    lines = [f"{'stage':<12}{'metric':<18}{'baseline':>12}{'current':>12}{'change':>10}"]
+    regressions = []
+    for stage in STAGES:
+        before = baseline.get('stages', {}).get(stage)
+        after = current.get('stages', {}).get(stage)
+        if not before or not after:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), after.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{stage}.{metric}")
+            elif -worse > tolerance:
+                flag = "  improved"
+            lines.append(f"{stage:<12}{metric:<18}{old:>12.2f}{new:>12.2f}{change:>+10.1%}{flag}")
+    return lines, regressions
+
+def format_results(results):
+    """Render results as a plain-text table"""
+    stages = [(stage, results['stages'][stage]) for stage in STAGES if results['stages'].get(stage)]
+    show_rss = all('peak_rss_mb' in stats for _, stats in stages)
+    header = f"{'stage':<12}{'resumes':>8}{'wall s':>10}{'res/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+    lines = [header + (f"{'peak MiB':>10}" if show_rss else "")]
+    for stage, stats in stages:
+        line = (f"{stage:<12}{stats['resumes']:>8}{stats['wall_s']:>10.2f}{stats['resumes_per_sec']:>10.1f}"
+                f"{stats['latency_ms_p50']:>10.1f}{stats['latency_ms_p95']:>10.1f}")
+        if show_rss:
+            line += f"{stats['peak_rss_mb']:>10.0f}"
+        lines.append(line)
+    return "\n".join(lines)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark resume extraction, matching and scoring")
+    parser.add_argument('--skills', type=int, default=100, help="Skills in the synthetic CSV (10-1000)")
+    parser.add_argument('--files', type=int, default=100, help="Synthetic resumes (10-10000)")
+    parser.add_argument('--pages', type=int, default=2, help="Pages per resume (1-50)")
+    parser.add_argument('--docx-ratio', type=float, default=0.5, help="Fraction of resumes written as DOCX")
+    parser.add_argument('--seed', type=int, default=0, help="Corpus random seed")
+    parser.add_argument('--workers', type=int, default=None, help="Pipeline workers for the end-to-end run")
+    parser.add_argument('--batch-size', type=int, default=16, help="Resumes per encoder batch")
+    parser.add_argument('--max-threshold', type=float, default=0.75, help="Scoring normalisation threshold")
+    parser.add_argument('--corpus-dir', help="Write the corpus here instead of a temporary directory")
+    parser.add_argument('--keep-corpus', action='store_true', help="Keep the temporary corpus after the run")
+    parser.add_argument('--output', help="Write results JSON to this file")
+    parser.add_argument('--baseline', help="Compare against a saved results JSON")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="Relative change treated as noise")
+    return parser
+
+def main(argv=None):
+    """Benchmark entry point; exits 1 if a baseline comparison finds regressions"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not 10 <= args.skills <= 1000:
+        parser.error("--skills must be between 10 and 1000")
+    if not 10 <= args.files <= 10000:
+        parser.error("--files must be between 10 and 10000")
+    if not 1 <= args.pages <= 50:
+        parser.error("--pages must be between 1 and 50")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    results = run_benchmarks(args)
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        lines, regressions = compare_results(results, baseline, args.tolerance)
+        print()
+        print("\n".join(lines))
+        if regressions:
+            logger.warning(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Synthetic corpus generation for benchmarks
+
+Writes skills CSVs and PDF/DOCX resumes with only the standard library, so
+benchmark inputs are reproducible from a seed and need no document tooling.
+"""
+
+import os
+import csv
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+BASE_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "SQL", "PostgreSQL", "MySQL", "MongoDB",
+    "Docker", "Kubernetes", "Terraform", "AWS", "Azure", "Google Cloud", "Linux", "Git",
+    "Machine Learning", "Deep Learning", "Data Analysis", "Data Visualization", "Statistics",
+    "Pandas", "NumPy", "TensorFlow", "PyTorch", "Scikit-learn", "Spark", "Hadoop", "Kafka",
+    "React", "Angular", "Vue", "Node.js", "Django", "Flask", "Spring Boot", "REST APIs",
+    "GraphQL", "Microservices", "CI/CD", "Jenkins", "Agile", "Scrum", "Project Management",
+    "Communication", "Leadership", "Excel", "Tableau", "Power BI", "Go", "Rust", "C++",
+]
+
+SKILL_QUALIFIERS = [
+    "Advanced", "Applied", "Cloud", "Distributed", "Embedded", "Enterprise", "Financial",
+    "Mobile", "Real-time", "Secure", "Scalable", "Statistical", "Web",
+]
+
+SKILL_DOMAINS = [
+    "Analytics", "Architecture", "Automation", "Databases", "Design", "Engineering",
+    "Forecasting", "Modeling", "Networking", "Operations", "Optimization", "Reporting",
+    "Security", "Systems", "Testing",
+]
+
+FILLER_WORDS = [
+    "delivered", "designed", "implemented", "led", "improved", "team", "projects",
+    "customers", "platform", "services", "reduced", "latency", "costs", "built", "owned",
+    "migrated", "legacy", "systems", "stakeholders", "requirements", "quarterly", "roadmap",
+    "mentored", "engineers", "production", "incidents", "reliability", "features", "users",
+]
+
+LINES_PER_PAGE = 40
+
+def generate_skills(count, seed=0):
+    """
+    Build a reproducible list of distinct skill names
+
+    Args:
+        count (int): Number of skills (e.g. 10-1000)
+        seed (int): Random seed
+
+    Returns:
+        list: (skill, weight) pairs
+    """
+    rng = random.Random(seed)
+    skills = list(BASE_SKILLS)
+    combos = [f"{qualifier} {domain}" for qualifier in SKILL_QUALIFIERS for domain in SKILL_DOMAINS]
+    rng.shuffle(combos)
+    skills.extend(combos)
+    index = 0
+    while len(skills) < count:
+        skills.append(f"{rng.choice(SKILL_QUALIFIERS)} {rng.choice(SKILL_DOMAINS)} {index}")
+        index += 1
+    return [(skill, rng.randint(1, 10)) for skill in skills[:count]]
+
+def write_skills_csv(path, skills):
+    """Write (skill, weight) pairs as a skills CSV"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["skills", "weightage"])
+        writer.writerows(skills)
+
+def generate_resume_pages(skill_names, pages, rng):
+    """Generate pages of resume-like lines mentioning a random subset of skills"""
+    known = rng.sample(skill_names, k=min(len(skill_names), rng.randint(3, 25)))
+    result = []
+    for _ in range(pages):
+        lines = []
+        for _ in range(LINES_PER_PAGE):
+            words = rng.sample(FILLER_WORDS, k=6)
+            if rng.random() < 0.4:
+                words.insert(rng.randint(0, len(words)), rng.choice(known))
+            lines.append(" ".join(words).capitalize())
+        result.append(lines)
+    return result
+
+def _pdf_string(text):
+    """Escape text for a PDF literal string"""
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def write_pdf(path, pages):
+    """
+    Write a minimal multi-page PDF using the built-in Helvetica font
+
+    Args:
+        path (str): Output path
+        pages (list): One list of text lines per page
+    """
+    page_count = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(page_count)), page_count)).encode('ascii'),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, lines in enumerate(pages):
+        content = "BT /F1 10 Tf 14 TL 50 770 Td\n" + "".join(
+            f"({_pdf_string(line)}) Tj T*\n" for line in lines) + "ET"
+        content = content.encode('latin-1', 'replace')
+        objects.append((
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        ).encode('ascii'))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+def write_docx(path, pages):
+    """
+    Write a minimal DOCX with one paragraph per line and page breaks between pages
+
+    Args:
+        path (str): Output path
+        pages (list): One list of text lines per page
+    """
+    paragraphs = []
+    for i, lines in enumerate(pages):
+        if i:
+            paragraphs.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        paragraphs.extend(
+            f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+        + "".join(paragraphs) +
+        '</w:body></w:document>'
+    )
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        docx.writestr('_rels/.rels', _ROOT_RELS)
+        docx.writestr('word/document.xml', document)
+
+def generate_corpus(out_dir, skills=100, files=100, pages=2, docx_ratio=0.5, seed=0):
+    """
+    Generate a skills CSV and a folder of synthetic resumes
+
+    Args:
+        out_dir (str): Directory to write into
+        skills (int): Number of skills in the CSV
+        files (int): Number of resumes
+        pages (int): Pages per resume
+        docx_ratio (float): Fraction of resumes written as DOCX instead of PDF
+        seed (int): Random seed
+
+    Returns:
+        tuple: (skills CSV path, list of resume paths)
+    """
+    rng = random.Random(seed)
+    resume_dir = os.path.join(out_dir, 'resumes')
+    os.makedirs(resume_dir, exist_ok=True)
+
+    skill_rows = generate_skills(skills, seed)
+    skills_csv = os.path.join(out_dir, 'skills.csv')
+    write_skills_csv(skills_csv, skill_rows)
+    skill_names = [skill for skill, _ in skill_rows]
+
+    paths = []
+    for i in range(files):
+        resume_pages = generate_resume_pages(skill_names, pages, rng)
+        if rng.random() < docx_ratio:
+            path = os.path.join(resume_dir, f"resume_{i:05d}.docx")
+            write_docx(path, resume_pages)
+        else:
+            path = os.path.join(resume_dir, f"resume_{i:05d}.pdf")
+            write_pdf(path, resume_pages)
+        paths.append(path)
+    return skills_csv, paths
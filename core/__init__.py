@@ -1,11 +1,12 @@
 """
-Core package initialization with model loading
+Core package initialization
+
+Models are loaded lazily through core.models.registry, so importing this
+package (or any core module) does not load spaCy or the sentence encoder.
 """
 
-import os
 import logging
 
-logger = logging.getLogger('resume_matcher.core')
+from core.models import registry
 
-# Create model loading indicator
-MODELS_LOADED = False
\ No newline at end of file
+logger = logging.getLogger('resume_matcher.core')
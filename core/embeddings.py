@@ -0,0 +1,464 @@
+"""
+Embedding cache module for reusing skill and token embeddings across resumes
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger('resume_matcher.core.embeddings')
+
+# Storage formats for cached embeddings; similarity is always computed in float32
+EMBEDDING_STORAGE = ('float32', 'float16', 'int8')
+
+# Tokens kept in a shared token store (about 300 MB of float32 rows at 384 dimensions)
+DEFAULT_SHARED_TOKEN_ROWS = 200000
+
+# Tokens per SQLite IN (...) query, below the default host parameter limit
+LOOKUP_CHUNK = 500
+
+def pack_embeddings(matrix, storage='float32'):
+    """
+    Convert float32 embeddings to a compact storage format
+
+    int8 storage is symmetric per row: each row is scaled so its largest
+    magnitude maps to 127, and the float32 scale is kept alongside.
+
+    Args:
+        matrix (numpy.ndarray): Embedding row or matrix
+        storage (str): 'float32', 'float16' or 'int8'
+
+    Returns:
+        tuple: (data, scales), where scales is None unless storage is int8
+
+    Raises:
+        ValueError: If storage is unknown
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if storage == 'float32':
+        return matrix, None
+    if storage == 'float16':
+        return matrix.astype(np.float16), None
+    if storage == 'int8':
+        scales = np.abs(matrix).max(axis=-1, keepdims=True) / 127.0
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        return np.round(matrix / scales).astype(np.int8), scales
+    raise ValueError(f"Unknown embedding storage: {storage}")
+
+def unpack_embeddings(data, scales=None):
+    """Restore float32 embeddings from pack_embeddings output"""
+    matrix = data.astype(np.float32)
+    if scales is not None:
+        matrix *= scales
+    return matrix
+
+class SkillEmbeddingCache:
+    """
+    Caches skill-list embeddings in memory for the run and optionally on disk.
+
+    Entries are keyed by the model name and the exact contents and order of the
+    skill list, so the same skills CSV is only ever encoded once per model.
+    Embeddings are held in memory as float32; persisted files use the
+    configured storage format. Persisted float32 matrices are memory-mapped
+    copy-on-write, so every process scoring against the same skills shares
+    one page-cache copy.
+    """
+
+    def __init__(self, cache_dir=None, storage='float32'):
+        """
+        Args:
+            cache_dir (str, optional): Directory to persist embeddings in
+            storage (str): On-disk format, 'float32', 'float16' or 'int8'
+        """
+        self.cache_dir = cache_dir
+        self.storage = storage
+        self._embeddings = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(skill_list, model_name):
+        """
+        Build a stable cache key from a skill list and model name
+
+        Args:
+            skill_list (list): List of skills
+            model_name (str): Name of the sentence embedding model
+
+        Returns:
+            str: Hex digest identifying the skill list for this model
+        """
+        digest = hashlib.sha256(model_name.encode('utf-8'))
+        for skill in skill_list:
+            digest.update(b'\0')
+            digest.update(str(skill).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, skill_list, model_name, encode):
+        """
+        Return embeddings for a skill list, encoding them only on a cache miss
+
+        Args:
+            skill_list (list): List of skills
+            model_name (str): Name of the sentence embedding model
+            encode (callable): Function mapping a list of skills to embeddings
+
+        Returns:
+            numpy.ndarray: Float32 matrix with one row per skill
+        """
+        key = self.make_key(skill_list, model_name)
+
+        with self._lock:
+            embeddings = self._embeddings.get(key)
+            if embeddings is None:
+                embeddings = self._load(key)
+
+            if embeddings is None:
+                self.misses += 1
+                logger.info(f"Encoding {len(skill_list)} skills with {model_name}")
+                embeddings = np.asarray(encode(list(skill_list)), dtype=np.float32)
+                if self._save(key, embeddings) and self.storage == 'float32':
+                    # Swap the private copy for the shared mapping of the file just written
+                    mapped = self._load(key)
+                    if mapped is not None:
+                        embeddings = mapped
+            else:
+                self.hits += 1
+
+            self._embeddings[key] = embeddings
+            return embeddings
+
+    def clear(self):
+        """Drop all in-memory entries (persisted files are kept)"""
+        with self._lock:
+            self._embeddings.clear()
+
+    def _path(self, key):
+        """Path of the persisted embeddings for a cache key"""
+        if self.storage == 'float32':
+            return os.path.join(self.cache_dir, f"skills-{key}.npy")
+        return os.path.join(self.cache_dir, f"skills-{key}-{self.storage}.npz")
+
+    def _load(self, key):
+        """Load persisted embeddings, returning None if unavailable"""
+        if not self.cache_dir:
+            return None
+
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            if self.storage == 'float32':
+                embeddings = np.load(path, mmap_mode='c')
+            else:
+                with np.load(path) as packed:
+                    embeddings = unpack_embeddings(packed['data'], packed['scales'] if 'scales' in packed else None)
+            logger.info(f"Loaded cached skill embeddings from {path}")
+            return embeddings
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable skill embedding cache {path}: {e}")
+            return None
+
+    def _save(self, key, embeddings):
+        """Persist embeddings atomically if a cache directory is configured; True if written"""
+        if not self.cache_dir:
+            return False
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                if self.storage == 'float32':
+                    np.save(f, embeddings)
+                else:
+                    data, scales = pack_embeddings(embeddings, self.storage)
+                    arrays = {'data': data} if scales is None else {'data': data, 'scales': scales}
+                    np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not persist skill embeddings: {e}")
+            return False
+
+class SharedTokenEmbeddings:
+    """
+    Memory-mapped token embeddings shared by processes on a host
+
+    Rows are appended to a flat file and read through a numpy memory map, so
+    every process attached to the same directory reads one page-cache copy
+    instead of holding its own. The token -> row index is a SQLite table, so
+    no process keeps the vocabulary in memory, and SQLite's write lock
+    serialises appends from several processes on every platform. The store
+    stops growing at max_rows; later tokens are left to the caller.
+
+    Files per encoder and row format:
+        tokens-<key>.sqlite3   token -> row index, dimension and committed row count
+        tokens-<key>.rows      fixed-width rows, float32 (or float16 for compact storage)
+    """
+
+    def __init__(self, directory, model_key, storage='float32', max_rows=DEFAULT_SHARED_TOKEN_ROWS):
+        """
+        Args:
+            directory (str): Directory holding the store (created if missing)
+            model_key (str): Encoder identity, from core.models.embedding_model_key
+            storage (str): 'float32' keeps float32 rows; 'float16' and 'int8' keep float16 rows
+            max_rows (int): Tokens stored before the store stops growing
+        """
+        if storage not in EMBEDDING_STORAGE:
+            raise ValueError(f"Unknown embedding storage: {storage}")
+        self.directory = directory
+        self.max_rows = max_rows
+        self.dtype = np.dtype(np.float32 if storage == 'float32' else np.float16)
+        os.makedirs(directory, exist_ok=True)
+
+        name = f"tokens-{model_key}-{self.dtype.name}"
+        self.db_path = os.path.join(directory, f"{name}.sqlite3")
+        self.rows_path = os.path.join(directory, f"{name}.rows")
+
+        # Autocommit, with explicit transactions around reads and appends
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS tokens (token TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._lock = threading.Lock()
+        self._rows = None
+        self.hits = 0
+        self.misses = 0
+
+    def _meta(self):
+        """(dimension or None, committed row count)"""
+        meta = dict(self._conn.execute("SELECT name, value FROM meta"))
+        return meta.get('dim'), meta.get('rows', 0)
+
+    def _find(self, tokens):
+        """(token, row) pairs of the stored tokens among tokens"""
+        found = []
+        for start in range(0, len(tokens), LOOKUP_CHUNK):
+            chunk = tokens[start:start + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            found.extend(self._conn.execute(f"SELECT token, row FROM tokens WHERE token IN ({placeholders})", chunk))
+        return found
+
+    def __len__(self):
+        with self._lock:
+            return self._meta()[1]
+
+    def full(self):
+        """True once the store has reached max_rows"""
+        return len(self) >= self.max_rows
+
+    def lookup(self, tokens):
+        """
+        Read the stored embeddings of tokens
+
+        Args:
+            tokens (list): Unique tokens
+
+        Returns:
+            tuple: (float32 matrix with one row per token, zero for tokens that are
+            not stored, or None while the store is empty; boolean mask of stored tokens)
+        """
+        stored = np.zeros(len(tokens), dtype=bool)
+        with self._lock:
+            # One read transaction, so the row count and the index agree
+            self._conn.execute("BEGIN")
+            try:
+                dim, rows = self._meta()
+                found = self._find(tokens) if rows else []
+            finally:
+                self._conn.execute("COMMIT")
+            if not rows:
+                self.misses += len(tokens)
+                return None, stored
+            if self._rows is None or len(self._rows) < rows:
+                self._rows = np.memmap(self.rows_path, dtype=self.dtype, mode='r', shape=(rows, dim))
+            mapped = self._rows
+            self.hits += len(found)
+            self.misses += len(tokens) - len(found)
+
+        positions = {token: i for i, token in enumerate(tokens)}
+        index = np.array([positions[token] for token, _ in found], dtype=np.int64)
+        row_ids = np.array([row for _, row in found], dtype=np.int64)
+        # Only the requested rows are materialised; the store itself stays in the page cache
+        matrix = np.zeros((len(tokens), dim), dtype=np.float32)
+        if len(found):
+            matrix[index] = mapped[row_ids]
+        stored[index] = True
+        return matrix, stored
+
+    def publish(self, tokens, embeddings):
+        """
+        Append embeddings of tokens that no process has stored yet, up to max_rows
+
+        Args:
+            tokens (list): Unique tokens
+            embeddings (numpy.ndarray): One row per token
+
+        Returns:
+            int: Number of rows appended
+        """
+        embeddings = np.asarray(embeddings, dtype=self.dtype)
+        with self._lock:
+            # Takes SQLite's write lock, shared with every other process using the store
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                dim, rows = self._meta()
+                if dim is None:
+                    dim = int(embeddings.shape[1])
+                    self._conn.execute("INSERT INTO meta VALUES ('dim', ?)", (dim,))
+                elif embeddings.shape[1] != dim:
+                    raise ValueError(f"Expected {dim}-d embeddings, got {embeddings.shape[1]}")
+
+                existing = {token for token, _ in self._find(tokens)}
+                fresh = [i for i, token in enumerate(tokens) if token not in existing]
+                fresh = fresh[:max(0, self.max_rows - rows)]
+                if fresh:
+                    # Rows are written at the committed end, overwriting whatever an
+                    # append that never committed left there, and synced before the
+                    # index that points at them is committed
+                    mode = 'r+b' if os.path.isfile(self.rows_path) else 'wb'
+                    with open(self.rows_path, mode) as f:
+                        f.seek(rows * dim * self.dtype.itemsize)
+                        f.write(np.ascontiguousarray(embeddings[fresh]).tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._conn.executemany("INSERT INTO tokens VALUES (?, ?)",
+                                           [(tokens[i], rows + n) for n, i in enumerate(fresh)])
+                    self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('rows', ?)", (rows + len(fresh),))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if rows + len(fresh) >= self.max_rows > rows:
+            logger.warning(f"Shared token store {self.db_path} is full ({self.max_rows} rows); "
+                           f"further tokens are cached per process")
+        return len(fresh)
+
+class TokenEmbeddingCache:
+    """
+    Bounded LRU cache of resume-token embeddings shared across resumes.
+
+    Common tokens ("python", "sql", "team") are encoded once per run instead
+    of once per resume that contains them. Rows can be stored as float16 or
+    int8 to fit more tokens in the same memory.
+    """
+
+    def __init__(self, max_entries=50000, storage='float32'):
+        """
+        Args:
+            max_entries (int): Number of token embeddings kept before LRU eviction
+            storage (str): Row format, 'float32', 'float16' or 'int8'
+        """
+        if storage not in EMBEDDING_STORAGE:
+            raise ValueError(f"Unknown embedding storage: {storage}")
+        self.max_entries = max_entries
+        self.storage = storage
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Optional SharedTokenEmbeddings consulted first; the LRU takes what it cannot store
+        self.shared = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def memory_bytes(self):
+        """Bytes held by cached rows (excluding dictionary overhead)"""
+        with self._lock:
+            return sum(data.nbytes + (scale.nbytes if scale is not None else 0)
+                       for data, scale in self._entries.values())
+
+    def set_storage(self, storage):
+        """Change the row format, dropping rows stored in the old one"""
+        if storage not in EMBEDDING_STORAGE:
+            raise ValueError(f"Unknown embedding storage: {storage}")
+        with self._lock:
+            if storage != self.storage:
+                self.storage = storage
+                self._entries.clear()
+
+    def get_many(self, tokens, encode):
+        """
+        Return embeddings for unique tokens, encoding only the uncached ones
+
+        With a shared store attached, stored tokens are read from it and new
+        ones are published to it; once it is full, the rest go through this
+        per-process LRU.
+
+        Args:
+            tokens (list): Unique tokens
+            encode (callable): Function mapping a list of tokens to embeddings
+
+        Returns:
+            numpy.ndarray: Float32 matrix with one row per token, in input order
+        """
+        shared = self.shared
+        if shared is None or not tokens:
+            return self._get_many_local(tokens, encode)
+
+        matrix, stored = shared.lookup(tokens)
+        if stored.all():
+            return matrix
+        missing = [token for token, hit in zip(tokens, stored) if not hit]
+        if shared.full():
+            rows = self._get_many_local(missing, encode)
+        else:
+            rows = np.asarray(encode(missing), dtype=np.float32)
+            shared.publish(missing, rows)
+        if matrix is None:
+            return rows
+        matrix[~stored] = rows
+        return matrix
+
+    def _get_many_local(self, tokens, encode):
+        """get_many through the per-process LRU; encoding runs outside the lock"""
+        with self._lock:
+            storage = self.storage
+            rows = {}
+            missing = []
+            for token in tokens:
+                row = self._entries.get(token)
+                if row is None:
+                    missing.append(token)
+                else:
+                    self._entries.move_to_end(token)
+                    rows[token] = row
+
+            self.hits += len(rows)
+            self.misses += len(missing)
+
+        if missing:
+            data, scales = pack_embeddings(encode(missing), storage)
+            with self._lock:
+                for i, token in enumerate(missing):
+                    # Copy so evicted rows do not pin the whole encoded batch in memory
+                    row = (data[i].copy(), scales[i].copy() if scales is not None else None)
+                    rows[token] = row
+                    # Rows in a format set_storage switched away from meanwhile are not kept
+                    if storage == self.storage:
+                        self._entries[token] = row
+
+                # Evict only after collecting rows, so a batch larger than the cache still resolves
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        if not tokens:
+            return np.zeros((0, 0), dtype=np.float32)
+        data = np.stack([rows[token][0] for token in tokens])
+        if storage != 'int8':
+            return data.astype(np.float32, copy=False)
+        return unpack_embeddings(data, np.stack([rows[token][1] for token in tokens]))
+
+    def clear(self):
+        """Drop all cached token embeddings"""
+        with self._lock:
+            self._entries.clear()
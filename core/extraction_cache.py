@@ -0,0 +1,220 @@
+"""
+On-disk cache of extracted resume text
+
+Entries are keyed by the SHA-256 of the file contents plus the extractor
+version, so renamed or copied files still hit and extractor changes
+invalidate old text. The cache is a SQLite database, which makes it safe to
+share between pipeline worker processes. Lookups only read: hit/miss counts
+and access times are batched in memory per process and written
+occasionally, so workers do not queue on the database write lock.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger('resume_matcher.core.extraction_cache')
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Lookups, or seconds, between writes of batched counters and access times
+FLUSH_EVERY = 64
+FLUSH_INTERVAL = 5.0
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """
+    Compute the SHA-256 hex digest of a file's contents
+
+    Args:
+        file_path (str): Path to the file
+        chunk_size (int): Bytes read per iteration
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """Size-bounded LRU cache of cleaned resume text keyed by content hash"""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): Directory holding the cache database
+            max_bytes (int): Total text size kept before least recently used entries are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.db_path = os.path.join(cache_dir, 'extraction_cache.sqlite3')
+        self._conn = None
+        self._lock = threading.Lock()
+        self._reset_pending()
+
+    def _reset_pending(self):
+        # Counter increments and last-access times not written yet
+        self._pending_counts = {'hits': 0, 'misses': 0}
+        self._pending_access = {}
+        self._last_flush = time.monotonic()
+
+    def __getstate__(self):
+        """Drop the connection and pending counts when pickled into a worker process"""
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_lock'] = None
+        state['_pending_counts'] = {'hits': 0, 'misses': 0}
+        state['_pending_access'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open the database lazily, once per process"""
+        if self._conn is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0), ('evictions', 0)")
+            # Running total of entry sizes, seeded once for databases that predate it
+            conn.execute("INSERT OR IGNORE INTO counters SELECT 'bytes', COALESCE(SUM(size), 0) FROM entries")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(content_hash, extractor_version):
+        """Combine a file content hash with the extractor version"""
+        return f"{extractor_version}:{content_hash}"
+
+    def get(self, key):
+        """
+        Look up cached text, counting a hit or a miss
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            str or None: Cached text, or None on a miss
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT text FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._pending_counts['misses'] += 1
+            else:
+                self._pending_counts['hits'] += 1
+                self._pending_access[key] = time.time()
+            pending = self._pending_counts['hits'] + self._pending_counts['misses']
+            if pending >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self._flush(conn)
+            return row[0] if row is not None else None
+
+    def _flush(self, conn):
+        """Write batched counter increments and access times in one transaction"""
+        with conn:
+            for name, count in self._pending_counts.items():
+                if count:
+                    conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (count, name))
+            conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?",
+                             [(accessed, key) for key, accessed in self._pending_access.items()])
+        self._reset_pending()
+
+    def flush(self):
+        """Write this process's batched counters and access times now"""
+        with self._lock:
+            self._flush(self._connect())
+
+    def put(self, key, text):
+        """
+        Store extracted text and evict least recently used entries over the size bound
+
+        Args:
+            key (str): Cache key from make_key
+            text (str): Cleaned text to cache
+        """
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {size} bytes of text, larger than the cache bound")
+            return
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                # Access times are written first so eviction sees recent hits
+                self._flush(conn)
+                old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                             (key, text, size, time.time()))
+                conn.execute("UPDATE counters SET value = value + ? WHERE name = 'bytes'",
+                             (size - (old[0] if old else 0),))
+                self._evict(conn)
+
+    def _evict(self, conn):
+        """Delete oldest entries until the total size fits in max_bytes"""
+        total = conn.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        conn.execute("UPDATE counters SET value = value + ? WHERE name = 'evictions'", (evicted,))
+        conn.execute("UPDATE counters SET value = ? WHERE name = 'bytes'", (total,))
+        logger.info(f"Evicted {evicted} extraction cache entries")
+
+    def stats(self):
+        """
+        Report cache counters, aggregated across every process using the cache
+
+        Counts from other processes are included once they have flushed them.
+
+        Returns:
+            dict: hits, misses, evictions, entries and bytes
+        """
+        with self._lock:
+            conn = self._connect()
+            self._flush(conn)
+            stats = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        stats.update(entries=entries)
+        return stats
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries")
+                conn.execute("UPDATE counters SET value = 0")
+            self._reset_pending()
+
+    def close(self):
+        """Close the database connection of this process"""
+        with self._lock:
+            if self._conn is not None:
+                self._flush(self._conn)
+                self._conn.close()
+                self._conn = None
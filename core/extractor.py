@@ -4,31 +4,56 @@ Text extraction module for different file types
 
 import os
 import logging
-from io import BytesIO
+import threading
+import multiprocessing
+from io import StringIO
+from collections import namedtuple
+from contextlib import closing
 
 # For PDF processing
-from pdfminer.high_level import extract_text as extract_text_pdf
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
 
 # For DOCX processing
 import mammoth
 
 from app.utils import cleanup_text
+from core.extraction_cache import hash_file
+from core.instrumentation import recorder
 
 logger = logging.getLogger('resume_matcher.core.extractor')
 
-def extract_text_from_file(file_path):
+# Bump whenever extraction or cleanup output changes, to invalidate cached text
+EXTRACTOR_VERSION = 2
+
+# Per-file budgets; None means unlimited. timeout (seconds) runs extraction in a
+# killable worker process so one pathological file cannot stall a batch.
+ExtractionLimits = namedtuple('ExtractionLimits', ['max_pages', 'max_chars', 'max_bytes', 'timeout'],
+                              defaults=(None, None, None, None))
+
+NO_LIMITS = ExtractionLimits()
+
+class ExtractionTimeout(TimeoutError):
+    """Raised when a file takes longer than its extraction timeout"""
+
+def extract_text_from_file(file_path, cache=None, limits=None):
     """
     Extract text from a file based on its extension
     
     Args:
         file_path (str): Path to the file
+        cache (ExtractionCache, optional): Cache of previously extracted text
+        limits (ExtractionLimits, optional): Page, character, size and time budgets
         
     Returns:
         str: Extracted text from the file
         
     Raises:
-        ValueError: If file format is not supported
+        ValueError: If file format is not supported or the file exceeds max_bytes
         FileNotFoundError: If file does not exist
+        ExtractionTimeout: If extraction exceeds the timeout
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
@@ -36,38 +61,116 @@ def extract_text_from_file(file_path):
     _, file_ext = os.path.splitext(file_path)
     file_ext = file_ext.lower()
     
+    if file_ext not in ('.pdf', '.docx'):
+        raise ValueError(f"Unsupported file format: {file_ext}")
+    
+    limits = limits or NO_LIMITS
+    if limits.max_bytes is not None:
+        size = os.path.getsize(file_path)
+        if size > limits.max_bytes:
+            raise ValueError(f"File too large ({size} bytes, limit {limits.max_bytes}): {os.path.basename(file_path)}")
+    
+    if cache is not None:
+        with recorder.stage('extract.cache') as stage:
+            key = cache.make_key(hash_file(file_path), _cache_version(limits))
+            text = cache.get(key)
+            stage.set(hits=int(text is not None))
+        if text is not None:
+            logger.info(f"Using cached text for: {os.path.basename(file_path)}")
+            return text
+    
     logger.info(f"Extracting text from: {os.path.basename(file_path)}")
     
+    with recorder.stage(f"extract{file_ext}") as stage:
+        if limits.timeout is not None:
+            text = get_extraction_worker().extract(file_path, file_ext, limits)
+        else:
+            text = _extract(file_path, file_ext, limits)
+        stage.set(chars=len(text))
+    
+    if cache is not None:
+        cache.put(key, text)
+    return text
+
+def _cache_version(limits):
+    """Cache key version; truncating budgets produce different text, so they are part of it"""
+    if limits.max_pages is None and limits.max_chars is None:
+        return EXTRACTOR_VERSION
+    return f"{EXTRACTOR_VERSION}-p{limits.max_pages}-c{limits.max_chars}"
+
+def _extract(file_path, file_ext, limits):
+    """Dispatch to the extractor for a validated extension"""
     if file_ext == '.pdf':
-        return extract_text_from_pdf(file_path)
-    elif file_ext == '.docx':
-        return extract_text_from_docx(file_path)
-    else:
-        raise ValueError(f"Unsupported file format: {file_ext}")
+        return extract_text_from_pdf(file_path, limits.max_pages, limits.max_chars)
+    return extract_text_from_docx(file_path, limits.max_chars)
+
+def iter_pdf_pages(file_path, max_pages=None):
+    """
+    Yield the raw text of a PDF one page at a time
+    
+    Pages are parsed lazily, so a caller that stops early never pays for the
+    rest of the document. The text matches pdfminer's extract_text page by page.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        max_pages (int, optional): Stop after this many pages
+        
+    Yields:
+        str: Text of each page
+    """
+    resource_manager = PDFResourceManager(caching=True)
+    output = StringIO()
+    device = TextConverter(resource_manager, output, laparams=LAParams())
+    try:
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        with open(file_path, 'rb') as pdf_file:
+            for page in PDFPage.get_pages(pdf_file, maxpages=max_pages or 0):
+                interpreter.process_page(page)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+    finally:
+        device.close()
 
-def extract_text_from_pdf(file_path):
+def extract_text_from_pdf(file_path, max_pages=None, max_chars=None):
     """
     Extract text from a PDF file
     
     Args:
         file_path (str): Path to the PDF file
+        max_pages (int, optional): Read at most this many pages
+        max_chars (int, optional): Stop reading once this many characters of
+            cleaned text are collected
         
     Returns:
         str: Extracted text from the PDF
     """
     try:
-        text = extract_text_pdf(file_path)
-        return cleanup_text(text)
+        pages = []
+        chars = 0
+        with closing(iter_pdf_pages(file_path, max_pages)) as page_texts:
+            for page_text in page_texts:
+                pages.append(page_text)
+                # Counted after cleanup, like the truncation below, so the budget is filled
+                if max_chars is not None:
+                    chars += len(cleanup_text(page_text))
+                if max_chars is not None and chars >= max_chars:
+                    logger.warning(f"Stopped {os.path.basename(file_path)} after {len(pages)} pages "
+                                   f"(character budget {max_chars})")
+                    break
+        text = cleanup_text("".join(pages))
+        return text[:max_chars] if max_chars is not None else text
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {e}")
         raise
 
-def extract_text_from_docx(file_path):
+def extract_text_from_docx(file_path, max_chars=None):
     """
     Extract text from a DOCX file
     
     Args:
         file_path (str): Path to the DOCX file
+        max_chars (int, optional): Truncate the text to this many characters
         
     Returns:
         str: Extracted text from the DOCX
@@ -75,7 +178,100 @@ def extract_text_from_docx(file_path):
     try:
         with open(file_path, 'rb') as docx_file:
             result = mammoth.extract_raw_text(docx_file)
-            return cleanup_text(result.value)
+            text = cleanup_text(result.value)
+            return text[:max_chars] if max_chars is not None else text
     except Exception as e:
         logger.error(f"Error extracting text from DOCX: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def _extraction_worker_main(conn):
+    """Worker process loop: extract requested files until the pipe closes"""
+    conn.send(True)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        file_path, file_ext, limits = request
+        try:
+            conn.send((True, _extract(file_path, file_ext, limits)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+class ExtractionWorker:
+    """Child process that extracts one file at a time and is killed when a file overruns its timeout"""
+
+    # Seconds the child may take to import its modules and report ready
+    startup_timeout = 60
+
+    def __init__(self):
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        # Spawned rather than forked: the parent may hold torch/tokenizer threads
+        context = multiprocessing.get_context('spawn')
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_extraction_worker_main, args=(child_conn,),
+                                        name="extraction-worker", daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        # Wait for imports so start-up time is not charged to the first file's timeout
+        try:
+            ready = self._conn.poll(self.startup_timeout) and self._conn.recv()
+        except EOFError:
+            ready = False
+        if not ready:
+            self.stop()
+            raise RuntimeError(f"Extraction worker did not start within {self.startup_timeout}s")
+
+    def stop(self):
+        """Kill the worker; the next extract() starts a fresh one"""
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def extract(self, file_path, file_ext, limits):
+        """
+        Extract a file in the worker process
+        
+        Raises:
+            ExtractionTimeout: If the worker does not answer within limits.timeout;
+                the worker is killed and replaced
+            RuntimeError: If extraction failed or the worker died
+        """
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self._start()
+            self._conn.send((file_path, file_ext, limits))
+            if not self._conn.poll(limits.timeout):
+                self.stop()
+                raise ExtractionTimeout(f"Extraction of {os.path.basename(file_path)} "
+                                        f"exceeded {limits.timeout}s")
+            try:
+                ok, value = self._conn.recv()
+            except EOFError:
+                self.stop()
+                raise RuntimeError(f"Extraction worker exited while reading {os.path.basename(file_path)}")
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+# Extraction worker of this process, started on the first timed extraction
+_extraction_worker = None
+_extraction_worker_lock = threading.Lock()
+
+def get_extraction_worker():
+    """Return this process's extraction worker"""
+    global _extraction_worker
+    with _extraction_worker_lock:
+        if _extraction_worker is None:
+            _extraction_worker = ExtractionWorker()
+        return _extraction_worker
@@ -0,0 +1,230 @@
+"""
+Lightweight per-stage timing instrumentation and profiling hooks
+
+Stages are timed with ``recorder.stage(name)`` blocks in the extractor,
+matcher, scorer and pipeline. Recording is off by default and costs a
+single attribute check per stage until enabled.
+"""
+
+import io
+import math
+import time
+import pstats
+import logging
+import cProfile
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger('resume_matcher.core.instrumentation')
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of a list of numbers
+
+    Args:
+        values (list): Sample values
+        fraction (float): Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        float: The percentile, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(fraction * len(ordered))))
+    return ordered[rank - 1]
+
+class _NullStage:
+    """Stage stand-in used while recording is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **metrics):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    """Times one execution of a stage and records it on exit"""
+
+    def __init__(self, recorder, name, metrics):
+        self.recorder = recorder
+        self.name = name
+        self.metrics = metrics
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.add_sample({
+            'stage': self.name,
+            'resume': self.recorder.current_resume(),
+            'wall': time.perf_counter() - self.wall_start,
+            'cpu': time.thread_time() - self.cpu_start,
+            **self.metrics,
+        })
+        return False
+
+    def set(self, **metrics):
+        """Attach counts known only inside the block (tokens, batch size, ...)"""
+        self.metrics.update(metrics)
+
+class Recorder:
+    """Collects stage samples and aggregates them into a run summary"""
+
+    def __init__(self):
+        self.enabled = False
+        self._samples = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, enabled=True):
+        """Turn recording on or off"""
+        self.enabled = enabled
+
+    def stage(self, name, **metrics):
+        """
+        Context manager timing one stage execution
+
+        Args:
+            name (str): Stage name, e.g. 'extract.pdf' or 'match.encode'
+            **metrics: Numeric metrics to record with the sample
+
+        Returns:
+            context manager whose ``set(**metrics)`` adds metrics from inside the block
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, metrics)
+
+    @contextmanager
+    def resume(self, resume_id):
+        """Attribute stages recorded by this thread inside the block to a resume"""
+        previous = getattr(self._local, 'resume', None)
+        self._local.resume = resume_id
+        try:
+            yield
+        finally:
+            self._local.resume = previous
+
+    def current_resume(self):
+        """Resume the current thread is working on, if any"""
+        return getattr(self._local, 'resume', None)
+
+    def add_sample(self, sample):
+        """Record one stage sample"""
+        with self._lock:
+            self._samples.append(sample)
+
+    def drain(self):
+        """Remove and return all samples (used to ship worker samples to the parent)"""
+        with self._lock:
+            samples, self._samples = self._samples, []
+        return samples
+
+    def merge(self, samples):
+        """Add samples recorded elsewhere, e.g. in a pipeline worker process"""
+        if samples:
+            with self._lock:
+                self._samples.extend(samples)
+
+    def samples(self):
+        """Return a copy of all recorded samples"""
+        with self._lock:
+            return list(self._samples)
+
+    def reset(self):
+        """Discard all recorded samples"""
+        self.drain()
+
+    def summary(self):
+        """
+        Aggregate samples per stage
+
+        Returns:
+            dict: stage -> {'count', 'wall_total', 'wall_p50', 'wall_p95',
+            'cpu_total', 'cpu_p50', 'cpu_p95', plus totals of extra metrics}
+        """
+        by_stage = {}
+        for sample in self.samples():
+            by_stage.setdefault(sample['stage'], []).append(sample)
+
+        summary = {}
+        for stage, samples in sorted(by_stage.items()):
+            walls = [sample['wall'] for sample in samples]
+            cpus = [sample['cpu'] for sample in samples]
+            stats = {
+                'count': len(samples),
+                'wall_total': sum(walls),
+                'wall_p50': percentile(walls, 0.50),
+                'wall_p95': percentile(walls, 0.95),
+                'cpu_total': sum(cpus),
+                'cpu_p50': percentile(cpus, 0.50),
+                'cpu_p95': percentile(cpus, 0.95),
+            }
+            for sample in samples:
+                for key, value in sample.items():
+                    if key not in ('stage', 'resume', 'wall', 'cpu') and isinstance(value, (int, float)):
+                        stats[key] = stats.get(key, 0) + value
+            summary[stage] = stats
+        return summary
+
+    def format_summary(self):
+        """Render summary() as a plain-text table"""
+        lines = [f"{'stage':<24}{'count':>8}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'cpu p50':>10}{'cpu p95':>10}  metrics"]
+        for stage, stats in self.summary().items():
+            extra = ", ".join(f"{key}={value}" for key, value in stats.items()
+                              if not key.startswith(('wall_', 'cpu_')) and key != 'count')
+            lines.append(
+                f"{stage:<24}{stats['count']:>8}{stats['wall_total']:>10.2f}"
+                f"{stats['wall_p50'] * 1000:>10.1f}{stats['wall_p95'] * 1000:>10.1f}"
+                f"{stats['cpu_p50'] * 1000:>10.1f}{stats['cpu_p95'] * 1000:>10.1f}  {extra}"
+            )
+        return "\n".join(lines)
+
+# Process-wide recorder used by the core modules
+recorder = Recorder()
+
+def profile_resume(resume_path, weighted_skills, output=None, sort='cumulative', limit=30):
+    """
+    Run one resume through extraction, matching and scoring under cProfile
+
+    Args:
+        resume_path (str): Path to the resume file
+        weighted_skills (pandas.DataFrame): DataFrame with 'skills' and 'weightage' columns
+        output (str, optional): Write raw profile data here (for snakeviz, pstats, ...)
+        sort (str): pstats sort key for the printed report
+        limit (int): Number of functions in the printed report
+
+    Returns:
+        tuple: (result dict, formatted pstats report)
+    """
+    # Imported here since the pipeline itself depends on this module
+    from core.pipeline import score_resumes
+
+    # Load models and skill embeddings outside the profile so it shows per-resume work only
+    from core.models import registry
+    from core.matcher import get_skill_embeddings
+    registry.warm_up(background=False)
+    get_skill_embeddings(weighted_skills['skills'].tolist())
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = next(score_resumes([resume_path], weighted_skills, workers=0))
+    finally:
+        profiler.disable()
+
+    if output:
+        profiler.dump_stats(output)
+        logger.info(f"Profile written to {output}")
+
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(limit)
+    return result, report.getvalue()
@@ -0,0 +1,274 @@
+"""
+Durable journal of completed resume results for resumable batch runs
+
+Every finished resume is appended to a JSON Lines file as soon as it is
+scored. Entries are keyed by the file's content hash; the journal itself is
+tied to a run key built from the skills CSV contents and everything else
+that changes scores, so a restarted run skips resumes that are already done
+and only scores the remainder. Unprocessable results are not journaled, so
+a rerun retries resumes that failed (e.g. on a timeout or a locked file).
+
+Only the byte offset and score of each entry are kept in memory; results are
+read back from disk when they are needed (e.g. for the final export).
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+
+from core.extraction_cache import hash_file
+from core.extractor import EXTRACTOR_VERSION
+from core.models import embedding_model_key
+from core.pipeline import UNPROCESSABLE
+
+logger = logging.getLogger('resume_matcher.core.journal')
+
+JOURNAL_FORMAT_VERSION = 1
+
+def make_run_key(skills_csv, extraction_limits=None, embedding_storage='float32'):
+    """
+    Identify the settings a journal's results are valid for
+
+    Args:
+        skills_csv (str): Path to the skills CSV
+        extraction_limits (ExtractionLimits, optional): Budgets that change extracted text
+        embedding_storage (str): Storage format of cached embeddings ('float32',
+            'float16' or 'int8'), which changes similarity scores slightly
+
+    Returns:
+        str: Hex digest of the skills CSV contents, extractor version, encoder,
+        embedding storage and limits
+    """
+    # A timeout decides whether a resume is processable, never what its result is
+    if extraction_limits:
+        extraction_limits = extraction_limits._replace(timeout=None)
+    digest = hashlib.sha256()
+    for part in (hash_file(skills_csv), EXTRACTOR_VERSION, embedding_model_key(), embedding_storage,
+                 tuple(extraction_limits) if extraction_limits else None):
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class ResultJournal:
+    """Append-only JSON Lines journal of per-resume results for one run key"""
+
+    def __init__(self, path, run_key, sync_every=16):
+        """
+        Args:
+            path (str): Journal file, created if missing
+            run_key (str): Key from make_run_key; an existing journal must match it
+            sync_every (int): Appends between fsync calls (every append is flushed)
+
+        Raises:
+            ValueError: If the journal was written for another run key or format
+        """
+        self.path = path
+        self.run_key = run_key
+        self.sync_every = max(1, sync_every)
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        # (path, file hash) -> (offset, score), and file hash -> offset of any entry
+        self._entries = {}
+        self._by_hash = {}
+        # File hash of each path planned in this process
+        self._run_hashes = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+        self._file = open(path, 'ab')
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() == 0:
+            self._write_line({"format": JOURNAL_FORMAT_VERSION, "run_key": run_key})
+            self._sync()
+        self._reader = open(path, 'rb')
+
+    @classmethod
+    def for_run(cls, journal_dir, skills_csv, extraction_limits=None, embedding_storage='float32'):
+        """Open the journal for a skills CSV and settings inside a journal directory"""
+        run_key = make_run_key(skills_csv, extraction_limits, embedding_storage)
+        return cls(os.path.join(journal_dir, f"{run_key[:32]}.jsonl"), run_key)
+
+    def _load(self):
+        """Index existing entries and cut off a line torn by a crash"""
+        if not os.path.isfile(self.path):
+            return
+
+        good_end = 0
+        with open(self.path, 'rb') as f:
+            header_line = f.readline()
+            try:
+                header = json.loads(header_line)
+            except ValueError:
+                header = None
+            if header is not None and header_line.endswith(b"\n"):
+                if header.get("format") != JOURNAL_FORMAT_VERSION:
+                    raise ValueError(f"Unsupported journal format: {header.get('format')}")
+                if header.get("run_key") != self.run_key:
+                    raise ValueError(f"Journal {self.path} belongs to another skills CSV or settings")
+                good_end = f.tell()
+
+                while True:
+                    offset = f.tell()
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    self._index(entry["path"], entry["hash"], offset, entry["result"]["score"])
+                    good_end = f.tell()
+
+        if good_end < os.path.getsize(self.path):
+            logger.warning(f"Truncating incomplete tail of journal {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_end)
+
+    def _index(self, path, file_hash, offset, score):
+        self._entries[(path, file_hash)] = (offset, score)
+        self._by_hash[file_hash] = offset
+
+    def _write_line(self, data):
+        offset = self._file.tell()
+        self._file.write(json.dumps(data).encode('utf-8') + b"\n")
+        self._file.flush()
+        return offset
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _read(self, offset):
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def sync(self):
+        """fsync entries appended since the last sync"""
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def plan(self, resume_paths):
+        """
+        Split a run into resumes still to score and resumes already journaled
+
+        A resume whose contents were journaled under another path is not
+        rescored; its result is copied to an entry for the new path. A file
+        that cannot be read is left pending, so scoring reports it.
+
+        Args:
+            resume_paths (list): Paths of the run's resume files
+
+        Returns:
+            tuple: (pending paths, completed paths)
+        """
+        pending, completed = [], []
+        with self._lock:
+            for path in resume_paths:
+                try:
+                    file_hash = hash_file(path)
+                except OSError:
+                    pending.append(path)
+                    continue
+                self._run_hashes[path] = file_hash
+                if (path, file_hash) in self._entries:
+                    completed.append(path)
+                elif file_hash in self._by_hash:
+                    result = dict(self._read(self._by_hash[file_hash])["result"])
+                    result["path"] = path
+                    result["file_name"] = os.path.basename(path)
+                    self._append(path, file_hash, result)
+                    completed.append(path)
+                else:
+                    pending.append(path)
+        logger.info(f"Journal {os.path.basename(self.path)}: {len(completed)} done, {len(pending)} to score")
+        return pending, completed
+
+    def append(self, result):
+        """
+        Durably record a finished result
+
+        Args:
+            result (dict): Result with at least 'path' and 'score'
+
+        Returns:
+            bool: False if the result was not journaled because the resume was
+            unprocessable or can no longer be read
+        """
+        if result["matched_skills"] == [UNPROCESSABLE]:
+            return False
+        path = result["path"]
+        with self._lock:
+            file_hash = self._run_hashes.get(path) or self._try_hash(path)
+            if file_hash is None:
+                return False
+            self._append(path, file_hash, result)
+        return True
+
+    @staticmethod
+    def _try_hash(path):
+        try:
+            return hash_file(path)
+        except OSError as e:
+            logger.warning(f"Not journaling {os.path.basename(path)}: {e}")
+            return None
+
+    def _append(self, path, file_hash, result):
+        offset = self._write_line({"path": path, "hash": file_hash, "result": result})
+        self._index(path, file_hash, offset, result["score"])
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self._sync()
+
+    def iter_results(self, resume_paths=None, sort_by_score=False):
+        """
+        Read journaled results back from disk
+
+        Args:
+            resume_paths (list, optional): Only these paths, at the contents planned
+                for this run; defaults to every journaled entry
+            sort_by_score (bool): Yield the highest score first
+
+        Yields:
+            dict: Result dicts
+        """
+        with self._lock:
+            if resume_paths is None:
+                selected = list(self._entries.values())
+            else:
+                selected = []
+                for path in resume_paths:
+                    file_hash = self._run_hashes.get(path) or self._try_hash(path)
+                    entry = self._entries.get((path, file_hash))
+                    if entry is not None:
+                        selected.append(entry)
+        if sort_by_score:
+            selected.sort(key=lambda entry: entry[1], reverse=True)
+
+        for offset, _ in selected:
+            with self._lock:
+                result = self._read(offset)["result"]
+            yield result
+
+    def close(self):
+        """Flush and fsync outstanding entries and close the journal"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
+            self._reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
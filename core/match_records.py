@@ -0,0 +1,319 @@
+"""
+Per-resume match records for incremental re-scoring
+
+A scoring run can save, for every resume, the exact-match bitmap and the best
+similarity per skill together with the threshold used. Scores only depend on
+those, so a later run whose skills CSV changes weights (or adds a few skills)
+can rescore the whole corpus without re-embedding it: only newly added skills
+are encoded and matched against the stored resume tokens. The tokens and the
+text exact matching runs on are stored zlib-compressed, so added skills never
+need the original files.
+"""
+
+import os
+import json
+import zlib
+import base64
+import logging
+
+import numpy as np
+
+from core.models import embedding_model_key
+from core.matcher import determine_threshold, find_exact_matches, batch_similarity
+from core.extractor import extract_text_from_file
+from core.scorer import SkillScorer
+from core.pipeline import MAX_THRESHOLD, UNPROCESSABLE
+
+logger = logging.getLogger('resume_matcher.core.match_records')
+
+RECORD_FORMAT_VERSION = 2
+
+# Version 1 records kept tokens as a plain JSON list and no text
+READABLE_FORMAT_VERSIONS = (1, 2)
+
+def _encode_bits(mask):
+    return base64.b64encode(np.packbits(mask.astype(bool)).tobytes()).decode('ascii')
+
+def _decode_bits(data, length):
+    return np.unpackbits(np.frombuffer(base64.b64decode(data), dtype=np.uint8), count=length).astype(bool)
+
+def _encode_floats(values):
+    return base64.b64encode(np.asarray(values, dtype='<f4').tobytes()).decode('ascii')
+
+def _decode_floats(data):
+    return np.frombuffer(base64.b64decode(data), dtype='<f4').copy()
+
+def _pack(value):
+    return base64.b64encode(zlib.compress(json.dumps(value).encode('utf-8'))).decode('ascii')
+
+def _unpack(data):
+    return json.loads(zlib.decompress(base64.b64decode(data)))
+
+class MatchRecord:
+    """Compact match state of one resume against a skill list"""
+
+    def __init__(self, path, exact, best_scores, threshold, tokens_data, text_data=None):
+        """
+        Args:
+            path (str): Resume path
+            exact (numpy.ndarray): Boolean exact-hit flag per skill, or None if unprocessable
+            best_scores (numpy.ndarray): Best token similarity per skill (float32)
+            threshold (float): Similarity threshold the run used
+            tokens_data (str): Compressed resume tokens, kept to match skills added later
+            text_data (str, optional): Compressed resume text, kept to exact-match skills
+                added later; None for records written before it was stored
+        """
+        self.path = path
+        self.exact = exact
+        self.best_scores = best_scores
+        self.threshold = threshold
+        self.tokens_data = tokens_data
+        self.text_data = text_data
+
+    @classmethod
+    def from_match(cls, path, skill_list, exact_matches, tokens, similarity_scores, threshold, text=None):
+        """
+        Build a record from the intermediate results of match_tokens
+
+        Args:
+            path (str): Resume path
+            skill_list (list): Skills the resume was matched against
+            exact_matches (set): Skills with an exact hit
+            tokens (list): Resume tokens
+            similarity_scores (torch.Tensor): Token × skill similarity, or None without tokens
+            threshold (float): Threshold used for this resume
+            text (str, optional): Resume text the exact matches were found in
+        """
+        exact = np.array([skill in exact_matches for skill in skill_list], dtype=bool)
+        if similarity_scores is None:
+            best_scores = np.zeros(len(skill_list), dtype=np.float32)
+        else:
+            best_scores = similarity_scores.max(dim=0).values.cpu().numpy().astype(np.float32)
+        return cls(path, exact, best_scores, threshold, _pack(list(tokens)),
+                   _pack(text) if text is not None else None)
+
+    @classmethod
+    def unprocessable(cls, path):
+        """Record for a resume whose text could not be used"""
+        return cls(path, None, None, None, None)
+
+    def tokens(self):
+        """Resume tokens"""
+        return _unpack(self.tokens_data)
+
+    def text(self):
+        """Resume text, or None if the record does not store it"""
+        return _unpack(self.text_data) if self.text_data is not None else None
+
+    def to_json(self):
+        if self.exact is None:
+            return {"path": self.path}
+        data = {
+            "path": self.path,
+            "threshold": self.threshold,
+            "exact": _encode_bits(self.exact),
+            "best": _encode_floats(self.best_scores),
+            "tokens": self.tokens_data,
+        }
+        if self.text_data is not None:
+            data["text"] = self.text_data
+        return data
+
+    @classmethod
+    def from_json(cls, data, skill_count, format_version=RECORD_FORMAT_VERSION):
+        if "exact" not in data:
+            return cls.unprocessable(data["path"])
+        tokens_data = _pack(data["tokens"]) if format_version == 1 else data["tokens"]
+        return cls(data["path"], _decode_bits(data["exact"], skill_count),
+                   _decode_floats(data["best"]), data["threshold"], tokens_data, data.get("text"))
+
+class MatchRecordWriter:
+    """Streams match records to a JSON Lines file, header first"""
+
+    def __init__(self, path, skill_list):
+        """
+        Args:
+            path (str): Output file
+            skill_list (list): Skills the records are matched against (column order)
+        """
+        self.path = path
+        self.skill_list = list(skill_list)
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write({
+            "format": RECORD_FORMAT_VERSION,
+            "model": embedding_model_key(),
+            "skills": self.skill_list,
+        })
+
+    def _write(self, data):
+        self._file.write(json.dumps(data) + "\n")
+
+    def write(self, record):
+        """Append one MatchRecord"""
+        self._write(record.to_json())
+        self._file.flush()
+
+    def write_match(self, path, exact_matches, tokens, similarity_scores, threshold, text=None):
+        """Append the record of a resume matched against this writer's skill list"""
+        self.write(MatchRecord.from_match(path, self.skill_list, exact_matches, tokens,
+                                          similarity_scores, threshold, text))
+
+    def write_unprocessable(self, path):
+        """Append the record of a resume whose text could not be used"""
+        self.write(MatchRecord.unprocessable(path))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+def load_match_records(path):
+    """
+    Read a match record file
+
+    Args:
+        path (str): File written by MatchRecordWriter
+
+    Returns:
+        tuple: (skill_list, list of MatchRecord)
+
+    Raises:
+        ValueError: If the file was written by another format version or embedding model
+    """
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        format_version = header.get("format")
+        if format_version not in READABLE_FORMAT_VERSIONS:
+            raise ValueError(f"Unsupported match record format: {format_version}")
+        if header.get("model") != embedding_model_key():
+            raise ValueError(f"Match records were built with {header.get('model')}, not {embedding_model_key()}")
+
+        skill_list = header["skills"]
+        records = [MatchRecord.from_json(json.loads(line), len(skill_list), format_version)
+                   for line in f if line.strip()]
+    return skill_list, records
+
+def _record_text(record, extraction_cache=None, extraction_limits=None):
+    """Text for exact-matching added skills: stored in the record, else read from the file"""
+    text = record.text()
+    if text is not None:
+        return text
+    try:
+        return extract_text_from_file(record.path, cache=extraction_cache, limits=extraction_limits)
+    except Exception as e:
+        logger.warning(f"No exact matches for added skills in {os.path.basename(record.path)}: {e}")
+        return None
+
+def _match_added_skills(records, added_skills, extraction_cache=None, chunk_size=64, extraction_limits=None):
+    """Exact hits and best similarities of newly added skills for every processable record"""
+    exact = np.zeros((len(records), len(added_skills)), dtype=bool)
+    best = np.zeros((len(records), len(added_skills)), dtype=np.float32)
+
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+        token_lists = [record.tokens() for record in chunk]
+        for offset, (record, similarity_scores) in enumerate(zip(chunk, batch_similarity(token_lists, added_skills))):
+            resume_text = _record_text(record, extraction_cache, extraction_limits)
+            if resume_text:
+                hits = find_exact_matches(resume_text, added_skills)
+                exact[start + offset] = [skill in hits for skill in added_skills]
+            if similarity_scores is not None:
+                best[start + offset] = similarity_scores.max(dim=0).values.cpu().numpy()
+    return exact, best
+
+def rescore_records(skill_list, records, weighted_skills, max_threshold=MAX_THRESHOLD,
+                    extraction_cache=None, record_writer=None, extraction_limits=None):
+    """
+    Rescore saved match records against a changed skills CSV
+
+    Weight-only changes are a vectorized recomputation. Skills that are new
+    compared to the records are matched against the stored tokens and, for
+    exact hits, the stored text (older records without text re-read the
+    file); removed skills are dropped.
+
+    Args:
+        skill_list (list): Skill columns of the records
+        records (list): MatchRecord list from load_match_records
+        weighted_skills (pandas.DataFrame): New DataFrame with 'skills' and 'weightage' columns
+        max_threshold (float): Strictest similarity threshold, used for normalisation
+        extraction_cache (ExtractionCache, optional): Cache used when re-reading text of
+            records that do not store it
+        record_writer (MatchRecordWriter, optional): Receives updated records for the new skill list
+        extraction_limits (ExtractionLimits, optional): Budgets used when re-reading text;
+            should match the original run so cached text is reused
+
+    Returns:
+        list: Result dicts with 'file_name', 'path', 'score', 'matched_skills' and 'missing_skills'
+    """
+    new_skills = weighted_skills['skills'].tolist()
+    scorer = SkillScorer(weighted_skills)
+
+    old_index = {}
+    for i, skill in enumerate(skill_list):
+        old_index.setdefault(skill, i)
+    added_skills = [skill for skill in dict.fromkeys(new_skills) if skill not in old_index]
+
+    usable = [record for record in records if record.exact is not None]
+    logger.info(f"Rescoring {len(usable)} records, {len(added_skills)} new skills to match")
+
+    exact_old = np.array([record.exact for record in usable], dtype=bool).reshape(len(usable), len(skill_list))
+    best_old = np.array([record.best_scores for record in usable], dtype=np.float32).reshape(len(usable), len(skill_list))
+
+    if added_skills and usable:
+        exact_added, best_added = _match_added_skills(usable, added_skills, extraction_cache,
+                                                        extraction_limits=extraction_limits)
+    else:
+        exact_added = np.zeros((len(usable), len(added_skills)), dtype=bool)
+        best_added = np.zeros((len(usable), len(added_skills)), dtype=np.float32)
+
+    # Gather the columns of the new skill list from old and added matches
+    added_index = {skill: len(skill_list) + i for i, skill in enumerate(added_skills)}
+    columns = [old_index[skill] if skill in old_index else added_index[skill] for skill in new_skills]
+    exact = np.concatenate([exact_old, exact_added], axis=1)[:, columns]
+    best = np.concatenate([best_old, best_added], axis=1)[:, columns]
+
+    # Same rules as match_tokens: clarity from exact hits, then a threshold per resume
+    clarity = exact.sum(axis=1) / len(new_skills) if new_skills else np.zeros(len(usable))
+    thresholds = np.array([determine_threshold(c) for c in clarity], dtype=float)
+    matched = exact | (best > thresholds[:, None])
+
+    new_index = {}
+    for i, skill in enumerate(new_skills):
+        new_index.setdefault(skill, i)
+    scorer_columns = [new_index[skill] for skill in scorer.skills]
+    scorer_matched = matched[:, scorer_columns]
+    scores = scorer.score_masks(scorer_matched, thresholds, max_threshold) if usable else []
+
+    results = []
+    rows = iter(range(len(usable)))
+    for record in records:
+        if record.exact is None:
+            results.append({
+                "file_name": os.path.basename(record.path),
+                "path": record.path,
+                "score": 0.0,
+                "matched_skills": [UNPROCESSABLE],
+                "missing_skills": [UNPROCESSABLE],
+            })
+            if record_writer is not None:
+                record_writer.write(record)
+            continue
+
+        row = next(rows)
+        matched_skills = {skill for skill, hit in zip(scorer.skills, scorer_matched[row]) if hit}
+        results.append({
+            "file_name": os.path.basename(record.path),
+            "path": record.path,
+            "score": float(scores[row]),
+            "matched_skills": sorted(matched_skills),
+            "missing_skills": sorted(scorer.all_skills_set - matched_skills),
+        })
+        if record_writer is not None:
+            record_writer.write(MatchRecord(record.path, exact[row], best[row], float(thresholds[row]),
+                                            record.tokens_data, record.text_data))
+    return results
@@ -3,32 +3,195 @@ Skill matching module using NLP techniques
 """
 
 import logging
-import spacy
-from sentence_transformers import SentenceTransformer, util
+from collections import namedtuple
+from functools import lru_cache
+
+from core.embeddings import (SkillEmbeddingCache, TokenEmbeddingCache, SharedTokenEmbeddings, EMBEDDING_STORAGE,
+                             DEFAULT_SHARED_TOKEN_ROWS)
+from core.instrumentation import recorder
+from core.models import embedding_model_key, get_encoder_mode, set_encoder_mode, get_nlp, get_embedder
+from core.phrase_matcher import SkillPhraseMatcher
 
 # Initialize logger
 logger = logging.getLogger('resume_matcher.core.matcher')
 
-# Load models
-logger.info("Loading NLP models...")
-try:
-    nlp = spacy.load("en_core_web_sm")
-    embedder = SentenceTransformer("all-MiniLM-L6-v2")
-    MODELS_LOADED = True
-    logger.info("NLP models loaded successfully")
-except Exception as e:
-    logger.error(f"Error loading NLP models: {e}")
-    MODELS_LOADED = False
-    raise
+# Skill embeddings shared by every resume matched against the same skill list
+skill_embedding_cache = SkillEmbeddingCache()
+
+# Resume-token embeddings shared across resumes, bounded by LRU eviction
+token_embedding_cache = TokenEmbeddingCache()
+
+# Number of tokens per encoder forward pass
+ENCODE_BATCH_SIZE = 256
+
+# Number of documents per spaCy nlp.pipe batch
+TOKENIZE_BATCH_SIZE = 32
+
+def configure_encoder(mode=None, storage=None):
+    """
+    Select encoder precision and the storage format of cached embeddings.
+    
+    Args:
+        mode (str, optional): 'fp32' or 'int8' (dynamically quantized Linear layers)
+        storage (str, optional): 'float32', 'float16' or 'int8' for cached embeddings
+        
+    Raises:
+        ValueError: If mode or storage is unknown
+    """
+    if storage is not None and storage not in EMBEDDING_STORAGE:
+        raise ValueError(f"Unknown embedding storage: {storage}")
+    
+    if mode is not None and mode != get_encoder_mode():
+        set_encoder_mode(mode)
+        # Cached rows came from the other encoder
+        token_embedding_cache.clear()
+        skill_embedding_cache.clear()
+    
+    if storage is not None:
+        skill_embedding_cache.storage = storage
+        token_embedding_cache.set_storage(storage)
+    
+    # A shared store holds rows of one encoder and format
+    shared = token_embedding_cache.shared
+    if shared is not None:
+        share_token_embeddings(shared.directory, shared.max_rows)
+
+def get_embedding_storage():
+    """Storage format of cached embeddings selected with configure_encoder"""
+    return token_embedding_cache.storage
+
+def share_token_embeddings(directory, max_rows=DEFAULT_SHARED_TOKEN_ROWS):
+    """
+    Read and publish token embeddings through a memory-mapped store in a directory.
+    
+    Every process attached to the same directory reads one page-cache copy of
+    the token rows, and tokens encoded by one process are reused by the others.
+    Once the store holds max_rows tokens, further tokens use the per-process
+    LRU cache.
+    
+    Args:
+        directory (str, optional): Store directory, or None to go back to the
+            per-process cache
+        max_rows (int): Tokens the store may hold
+    """
+    if directory is None:
+        token_embedding_cache.shared = None
+        return
+    token_embedding_cache.shared = SharedTokenEmbeddings(directory, embedding_model_key(),
+                                                         token_embedding_cache.storage, max_rows)
+
+def prepare_skill_embeddings(skill_list, cache_dir=None):
+    """
+    Encodes a skill list once so later calls to match_skills reuse it.
+    
+    Args:
+        skill_list (list): List of skills to match against
+        cache_dir (str, optional): Directory to persist skill embeddings in
+        
+    Returns:
+        numpy.ndarray: Skill embedding matrix
+    """
+    if cache_dir:
+        skill_embedding_cache.cache_dir = cache_dir
+    return get_skill_embeddings(skill_list)
+
+def get_skill_embeddings(skill_list):
+    """
+    Returns cached embeddings for a skill list, encoding it on first use.
+    
+    Args:
+        skill_list (list): List of skills to match against
+        
+    Returns:
+        numpy.ndarray: Skill embedding matrix
+    """
+    return skill_embedding_cache.get(
+        skill_list,
+        embedding_model_key(),
+        lambda skills: get_embedder().encode(skills, convert_to_numpy=True)
+    )
+
+# Result of thresholding a resume-token × skill similarity matrix
+SemanticMatch = namedtuple(
+    'SemanticMatch',
+    ['matched_skills', 'best_scores', 'best_tokens', 'semantic_matches']
+)
+
+def semantic_match(similarity_scores, skill_list, resume_tokens, similarity_threshold):
+    """
+    Thresholds a similarity matrix with a single max-over-tokens reduction per skill.
+    
+    Args:
+        similarity_scores (torch.Tensor): Matrix of shape (len(resume_tokens), len(skill_list))
+        skill_list (list): List of skills (matrix columns)
+        resume_tokens (list): List of resume tokens (matrix rows)
+        similarity_threshold (float): Threshold for semantic similarity matching
+        
+    Returns:
+        SemanticMatch: Matched skills, best similarity per skill, the resume token
+        that produced it (None when there are no tokens) and the number of
+        (token, skill) pairs above the threshold
+    """
+    if len(resume_tokens) == 0 or len(skill_list) == 0:
+        return SemanticMatch(set(), [0.0] * len(skill_list), [None] * len(skill_list), 0)
+    
+    best_scores, best_indices = similarity_scores.max(dim=0)
+    above_threshold = similarity_scores > similarity_threshold
+    
+    semantic_matches = int(above_threshold.sum().item())
+    matched_mask = above_threshold.any(dim=0).tolist()
+    best_indices = best_indices.tolist()
+    
+    matched_skills = set(skill for skill, matched in zip(skill_list, matched_mask) if matched)
+    best_tokens = [resume_tokens[i] for i in best_indices]
+    
+    return SemanticMatch(matched_skills, best_scores.tolist(), best_tokens, semantic_matches)
+
+@lru_cache(maxsize=16)
+def _compile_phrase_matcher(skills):
+    """Compile (and memoize) the exact-match automaton for a skill tuple"""
+    return SkillPhraseMatcher(skills)
 
-def calculate_clarity_score(resume_text, skill_list):
+def get_phrase_matcher(skill_list):
+    """
+    Returns the compiled exact-match automaton for a skill list.
+    
+    Args:
+        skill_list (list): List of skills to match against
+        
+    Returns:
+        SkillPhraseMatcher: Matcher compiled once per distinct skill list
+    """
+    return _compile_phrase_matcher(tuple(skill_list))
+
+def find_exact_matches(resume_text, skill_list):
+    """
+    Finds all skills occurring verbatim (case-insensitive) in the resume text.
+    
+    Args:
+        resume_text (str): Resume text content
+        skill_list (list): List of skills to match against
+        
+    Returns:
+        set: Skills with an exact hit
+    """
+    with recorder.stage('match.exact') as stage:
+        exact_matches = get_phrase_matcher(skill_list).find(resume_text)
+        stage.set(exact_matches=len(exact_matches))
+    return exact_matches
+
+def calculate_clarity_score(resume_text, skill_list, exact_matches=None):
     """
     Determines how 'clear' a resume is based on the number of exact skill matches.
+    
+    Pass exact_matches (from find_exact_matches) to avoid scanning the text again.
     """
-    exact_matches = sum(1 for skill in skill_list if skill.lower() in resume_text.lower())
+    if exact_matches is None:
+        exact_matches = find_exact_matches(resume_text, skill_list)
+    exact_count = sum(1 for skill in skill_list if skill in exact_matches)
     total_skills = len(skill_list)
     
-    return exact_matches / total_skills if total_skills > 0 else 0
+    return exact_count / total_skills if total_skills > 0 else 0
 
 def determine_threshold(clarity_score):
     """
@@ -41,6 +204,19 @@ def determine_threshold(clarity_score):
     else:
         return 0.625  # Vague resumes → lower threshold
 
+def _tokens_from_doc(doc):
+    """Collect noun-chunk phrases and content keywords from a parsed spaCy doc"""
+    # Extract noun chunks (e.g., "data analysis", "machine learning")
+    phrases = set(chunk.text.lower() for chunk in doc.noun_chunks)
+    
+    # Extract important keywords (ignore stopwords, punctuation, etc.)
+    keywords = set(token.text.lower() for token in doc 
+                if not token.is_stop and not token.is_punct and token.is_alpha)
+
+    # Combine both
+    tokens = phrases.union(keywords)
+    return list(tokens)
+
 def tokenize_resume(text):
     """
     Tokenizes resume text into meaningful phrases for better skill matching.
@@ -51,66 +227,139 @@ def tokenize_resume(text):
     Returns:
         list: List of tokenized phrases and keywords
     """
-    doc = nlp(text)
+    nlp = get_nlp()
     
-    # Extract noun chunks (e.g., "data analysis", "machine learning")
-    phrases = set(chunk.text.lower() for chunk in doc.noun_chunks)
+    with recorder.stage('match.tokenize') as stage:
+        tokens = _tokens_from_doc(nlp(text))
+        stage.set(tokens=len(tokens))
+    return tokens
+
+def tokenize_resumes(texts, batch_size=TOKENIZE_BATCH_SIZE, n_process=1):
+    """
+    Tokenizes many resumes at once through spaCy's nlp.pipe.
     
-    # Extract important keywords (ignore stopwords, punctuation, etc.)
-    keywords = set(token.text.lower() for token in doc 
-                if not token.is_stop and not token.is_punct and token.is_alpha)
+    Produces the same phrases and keywords as tokenize_resume for each text.
+    
+    Args:
+        texts (list): Resume text contents
+        batch_size (int): Documents per spaCy batch
+        n_process (int): spaCy worker processes (-1 for one per CPU)
+        
+    Returns:
+        list: One token list per text, in input order
+    """
+    nlp = get_nlp()
+    
+    with recorder.stage('match.tokenize', resumes=len(texts)) as stage:
+        token_lists = [_tokens_from_doc(doc) for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process)]
+        stage.set(tokens=sum(len(tokens) for tokens in token_lists))
+    return token_lists
 
-    # Combine both
-    tokens = phrases.union(keywords)
-    return list(tokens)
+def encode_tokens(tokens):
+    """
+    Encodes unique tokens through the shared token embedding cache.
+    
+    Args:
+        tokens (list): Unique tokens
+        
+    Returns:
+        numpy.ndarray: Embedding matrix with one row per token
+    """
+    embedder = get_embedder()
+    
+    def encode(missing):
+        with recorder.stage('match.encode', tokens=len(missing), batches=-(-len(missing) // ENCODE_BATCH_SIZE)):
+            return embedder.encode(missing, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True)
+    
+    return token_embedding_cache.get_many(tokens, encode)
 
-def match_skills(resume_text, skill_list):
+def batch_similarity(token_lists, skill_list):
     """
-    Matches resume skills using embeddings for better accuracy and exact matches.
+    Computes token × skill similarity for many resumes, embedding each distinct token once.
+    
+    Tokens are deduplicated across all resumes, similarity is computed once for
+    the unique set, and each resume gets the rows for its own tokens.
     
     Args:
-        resume_text (str): Resume text content
+        token_lists (list): One tokenize_resume output per resume
         skill_list (list): List of skills to match against
-        similarity_threshold (float): Threshold for semantic similarity matching
         
     Returns:
-        list: Sorted list of matched skills
+        list: One similarity matrix per resume (None for resumes without tokens)
     """
-    if not MODELS_LOADED:
-        logger.error("NLP models not loaded. Cannot match skills.")
-        return []
+    # Deferred so importing this module does not pull in torch
+    import torch
+    from sentence_transformers import util
     
-    clarity_score = calculate_clarity_score(resume_text, skill_list)
-    similarity_threshold = determine_threshold(clarity_score)
-
+    unique_tokens = list(dict.fromkeys(token for tokens in token_lists for token in tokens))
+    if not unique_tokens:
+        return [None] * len(token_lists)
+    
+    token_index = {token: i for i, token in enumerate(unique_tokens)}
+    token_embeddings = torch.from_numpy(encode_tokens(unique_tokens))
+    skill_embeddings = torch.from_numpy(get_skill_embeddings(skill_list))
+    
+    with recorder.stage('match.similarity', resumes=len(token_lists), unique_tokens=len(unique_tokens)):
+        similarity_scores = util.pytorch_cos_sim(token_embeddings, skill_embeddings)
+    
+    total_tokens = sum(len(tokens) for tokens in token_lists)
+    logger.info(f"Embedded {len(unique_tokens)} unique of {total_tokens} tokens "
+                f"for {len(token_lists)} resumes")
+    
+    return [
+        similarity_scores[torch.tensor([token_index[token] for token in tokens])] if tokens else None
+        for tokens in token_lists
+    ]
 
-    resume_tokens = tokenize_resume(resume_text)
-    logger.info(f"Tokenized resume into {len(resume_tokens)} tokens")
+def match_tokens(exact_matches, resume_tokens, skill_list, similarity_scores=None):
+    """
+    Combines exact matches with semantic matches of already tokenized resume text.
+    
+    Args:
+        exact_matches (set): Skills found verbatim (see find_exact_matches)
+        resume_tokens (list): Output of tokenize_resume
+        skill_list (list): List of skills to match against
+        similarity_scores (torch.Tensor, optional): Precomputed token × skill
+            similarity (see batch_similarity)
+        
+    Returns:
+        tuple: (sorted list of matched skills, similarity threshold used)
+    """
+    clarity_score = calculate_clarity_score(None, skill_list, exact_matches)
+    similarity_threshold = determine_threshold(clarity_score)
 
-    # Exact skill match
-    matched_skills = set()
-    for skill in skill_list:
-        # Check for exact match (case-insensitive)
-        if skill.lower() in resume_text.lower():
-            matched_skills.add(skill)
+    matched_skills = set(exact_matches)
     
     logger.info(f"Found {len(matched_skills)} exact skill matches")
     
-    # Compute embeddings for tokenized skills and resume for similarity matching
-    resume_embeddings = embedder.encode(resume_tokens, convert_to_tensor=True)
-    skill_embeddings = embedder.encode(skill_list, convert_to_tensor=True)
-    
-    # Compute similarity scores
-    similarity_scores = util.pytorch_cos_sim(resume_embeddings, skill_embeddings)
+    # Compute similarity between resume tokens and skills
+    if resume_tokens and similarity_scores is None:
+        similarity_scores = batch_similarity([resume_tokens], skill_list)[0]
     
     # Matching skills based on similarity score
-    semantic_matches = 0
-    for i, resume_token in enumerate(resume_tokens):
-        for j, skill in enumerate(skill_list):
-            if similarity_scores[i][j] > similarity_threshold:
-                matched_skills.add(skill)
-                semantic_matches += 1
+    with recorder.stage('match.threshold'):
+        semantic = semantic_match(similarity_scores, skill_list, resume_tokens, similarity_threshold)
+    matched_skills |= semantic.matched_skills
     
-    logger.info(f"Found {semantic_matches} semantic skill matches")
+    logger.info(f"Found {semantic.semantic_matches} semantic skill matches")
     
-    return sorted(matched_skills),similarity_threshold
\ No newline at end of file
+    return sorted(matched_skills),similarity_threshold
+
+def match_skills(resume_text, skill_list):
+    """
+    Matches resume skills using embeddings for better accuracy and exact matches.
+    
+    Args:
+        resume_text (str): Resume text content
+        skill_list (list): List of skills to match against
+        
+    Returns:
+        tuple: (sorted list of matched skills, similarity threshold used)
+    """
+    # Exact skill match (case-insensitive), shared with the clarity score
+    exact_matches = find_exact_matches(resume_text, skill_list)
+
+    resume_tokens = tokenize_resume(resume_text)
+    logger.info(f"Tokenized resume into {len(resume_tokens)} tokens")
+
+    return match_tokens(exact_matches, resume_tokens, skill_list)
@@ -0,0 +1,224 @@
+"""
+Lazy NLP model registry
+
+Models are loaded on first use (or warmed in the background) so importing
+the core package stays cheap.
+"""
+
+import time
+import logging
+import threading
+
+logger = logging.getLogger('resume_matcher.core.models')
+
+SPACY_MODEL_NAME = "en_core_web_sm"
+
+# Components tokenize_resume never reads: noun_chunks only needs the tagger,
+# attribute ruler and parser, and is_stop/is_punct/is_alpha are lexical flags
+SPACY_EXCLUDE = ["ner", "lemmatizer"]
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Encoder modes: full precision, or dynamic int8 quantization of the Linear layers
+FP32 = 'fp32'
+INT8 = 'int8'
+ENCODER_MODES = (FP32, INT8)
+
+_encoder_mode = FP32
+
+# Model load states
+NOT_LOADED = 'not_loaded'
+LOADING = 'loading'
+LOADED = 'loaded'
+FAILED = 'failed'
+
+class ModelRegistry:
+    """Loads named models on demand and tracks their load state and time"""
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._states = {}
+        self._load_times = {}
+        self._errors = {}
+        self._locks = {}
+
+    def register(self, name, loader):
+        """
+        Register a model loader
+
+        Args:
+            name (str): Name the model is requested by
+            loader (callable): Zero-argument function returning the loaded model
+        """
+        self._loaders[name] = loader
+        self._states[name] = NOT_LOADED
+        self._locks[name] = threading.Lock()
+
+    def get(self, name):
+        """
+        Return a model, loading it first if needed
+
+        Args:
+            name (str): Registered model name
+
+        Returns:
+            object: The loaded model
+
+        Raises:
+            KeyError: If no loader is registered under name
+            Exception: Whatever the loader raised, if loading failed
+        """
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited
+            if name in self._models:
+                return self._models[name]
+
+            self._states[name] = LOADING
+            logger.info(f"Loading model '{name}'...")
+            start = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._states[name] = FAILED
+                self._errors[name] = e
+                logger.error(f"Error loading model '{name}': {e}")
+                raise
+
+            self._load_times[name] = time.perf_counter() - start
+            self._models[name] = model
+            self._states[name] = LOADED
+            self._errors.pop(name, None)
+            logger.info(f"Model '{name}' loaded in {self._load_times[name]:.2f}s")
+            return model
+
+    def unload(self, name):
+        """Drop a loaded model so the next get() loads it again"""
+        with self._locks[name]:
+            self._models.pop(name, None)
+            self._load_times.pop(name, None)
+            self._errors.pop(name, None)
+            self._states[name] = NOT_LOADED
+
+    def is_loaded(self, name):
+        """Check whether a model has finished loading"""
+        return self._states.get(name) == LOADED
+
+    def warm_up(self, names=None, background=True, callback=None):
+        """
+        Load models ahead of first use
+
+        Args:
+            names (list, optional): Models to load, defaults to all registered models
+            background (bool): Load in a daemon thread instead of blocking
+            callback (callable, optional): Called with status() once loading ends
+
+        Returns:
+            threading.Thread or None: The loader thread when running in the background
+        """
+        names = list(names or self._loaders)
+
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception:
+                    # Failure is recorded in status(); get() re-raises on real use
+                    pass
+            if callback:
+                callback(self.status())
+
+        if not background:
+            load_all()
+            return None
+
+        thread = threading.Thread(target=load_all, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self):
+        """
+        Report the load state of every registered model
+
+        Returns:
+            dict: name -> {'state', 'load_time', 'error'}
+        """
+        return {
+            name: {
+                'state': self._states[name],
+                'load_time': self._load_times.get(name),
+                'error': str(self._errors[name]) if name in self._errors else None,
+            }
+            for name in self._loaders
+        }
+
+def _load_spacy():
+    """Load the spaCy pipeline without the components tokenization does not use"""
+    import spacy
+    return spacy.load(SPACY_MODEL_NAME, exclude=SPACY_EXCLUDE)
+
+def _load_embedder():
+    """Load the sentence embedding model, quantized when the encoder mode is int8"""
+    from sentence_transformers import SentenceTransformer
+    if _encoder_mode == FP32:
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+    import torch
+    # Dynamic quantization only runs on CPU
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME, device='cpu')
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+registry = ModelRegistry()
+registry.register('nlp', _load_spacy)
+registry.register('embedder', _load_embedder)
+
+def get_nlp():
+    """Return the spaCy pipeline, loading it on first use"""
+    return registry.get('nlp')
+
+def get_embedder():
+    """Return the sentence embedding model, loading it on first use"""
+    return registry.get('embedder')
+
+def get_encoder_mode():
+    """Return the current encoder mode ('fp32' or 'int8')"""
+    return _encoder_mode
+
+def set_encoder_mode(mode):
+    """
+    Switch between the full-precision and the int8-quantized encoder
+
+    An already loaded encoder of the other mode is unloaded. Callers holding
+    cached embeddings must drop them, since they came from the other encoder.
+
+    Args:
+        mode (str): 'fp32' or 'int8'
+
+    Raises:
+        ValueError: If mode is unknown
+    """
+    global _encoder_mode
+    if mode not in ENCODER_MODES:
+        raise ValueError(f"Unknown encoder mode: {mode}")
+    if mode != _encoder_mode:
+        _encoder_mode = mode
+        registry.unload('embedder')
+        logger.info(f"Encoder mode set to {mode}")
+
+def embedding_model_key():
+    """
+    Identify the encoder that produced an embedding
+
+    Used in cache keys, match records and vector indexes so fp32 and
+    quantized embeddings are never mixed.
+    """
+    if _encoder_mode == FP32:
+        return EMBEDDING_MODEL_NAME
+    return f"{EMBEDDING_MODEL_NAME}+{_encoder_mode}"
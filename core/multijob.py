@@ -0,0 +1,147 @@
+"""
+Multi-job scoring: rank one resume corpus against many skills CSVs in one pass
+
+Each resume is extracted, tokenized and embedded once. Similarity is computed
+against the combined skill matrix of every job, and each job then applies
+its own clarity threshold and weights to its slice of that matrix.
+"""
+
+import os
+import logging
+
+from core.matcher import batch_similarity, match_tokens, get_skill_embeddings, TOKENIZE_BATCH_SIZE
+from core.scorer import SkillScorer
+from core.pipeline import iter_prepared_batches, MAX_THRESHOLD
+from core.instrumentation import recorder
+
+logger = logging.getLogger('resume_matcher.core.multijob')
+
+class Job:
+    """One open position: a named skills CSV compiled for scoring"""
+
+    def __init__(self, name, weighted_skills):
+        """
+        Args:
+            name (str): Job name used as the score table column
+            weighted_skills (pandas.DataFrame): DataFrame with 'skills' and 'weightage' columns
+        """
+        self.name = name
+        self.skill_list = weighted_skills['skills'].tolist()
+        self.scorer = SkillScorer(weighted_skills)
+        # Column of each skill in the combined skill matrix, set by combine_jobs
+        self.columns = None
+
+def load_jobs(skills_csvs):
+    """
+    Load one Job per skills CSV, named after the file
+
+    Args:
+        skills_csvs (list): Paths to skills CSVs
+
+    Returns:
+        list: Jobs, with duplicate file names disambiguated by a numeric suffix
+    """
+    import pandas as pd
+
+    jobs = []
+    seen = {}
+    for skills_csv in skills_csvs:
+        name = os.path.splitext(os.path.basename(skills_csv))[0]
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name}_{seen[name]}"
+        jobs.append(Job(name, pd.read_csv(skills_csv)))
+    return jobs
+
+def combine_jobs(jobs):
+    """
+    Build the combined skill list of several jobs and record each job's columns
+
+    Args:
+        jobs (list): Jobs to combine
+
+    Returns:
+        list: Unique skills across all jobs, in first-seen order
+    """
+    combined = list(dict.fromkeys(skill for job in jobs for skill in job.skill_list))
+    index = {skill: i for i, skill in enumerate(combined)}
+    for job in jobs:
+        job.columns = [index[skill] for skill in job.skill_list]
+    return combined
+
+def _score_batch_for_jobs(batch, jobs, combined_skills, max_threshold):
+    """Score a prepared batch against every job from one shared similarity computation"""
+    usable = [prepared for prepared in batch if prepared.tokens is not None]
+    similarities = iter(batch_similarity([prepared.tokens for prepared in usable], combined_skills))
+
+    rows = []
+    for prepared in batch:
+        recorder.merge(prepared.samples)
+        row = {"file_name": os.path.basename(prepared.path), "path": prepared.path, "scores": {}}
+        if prepared.tokens is None:
+            row["scores"] = {job.name: 0.0 for job in jobs}
+            row["error"] = prepared.error or "Unable to process resume."
+            rows.append(row)
+            continue
+
+        similarity_scores = next(similarities)
+        with recorder.resume(prepared.path):
+            for job in jobs:
+                exact_matches = {skill for skill in job.skill_list if skill in prepared.exact_matches}
+                job_scores = similarity_scores[:, job.columns] if similarity_scores is not None else None
+                matched_skills, similarity_threshold = match_tokens(
+                    exact_matches, prepared.tokens, job.skill_list, similarity_scores=job_scores
+                )
+                _, _, score = job.scorer.score(matched_skills, similarity_threshold, max_threshold)
+                row["scores"][job.name] = score
+        rows.append(row)
+    return rows
+
+def score_jobs(resume_paths, jobs, workers=None, batch_size=16, max_wait=0.5,
+               max_threshold=MAX_THRESHOLD, extraction_cache=None, tokenize_processes=1,
+               extraction_limits=None, tokenize_batch_size=TOKENIZE_BATCH_SIZE):
+    """
+    Score every resume against every job, yielding one row per resume as it finishes.
+
+    Args:
+        resume_paths (list): Paths of resume files
+        jobs (list): Jobs from load_jobs
+        workers (int, optional): Extraction/tokenization processes (see score_resumes)
+        batch_size (int): Number of resumes encoded per embedder call
+        max_wait (float): Seconds to wait for a batch to fill before encoding it anyway
+        max_threshold (float): Strictest similarity threshold, used for normalisation
+        extraction_cache (ExtractionCache, optional): Cache of extracted resume text
+        tokenize_processes (int): spaCy nlp.pipe processes when workers is 0 or 1
+        extraction_limits (ExtractionLimits, optional): Per-file extraction budgets
+        tokenize_batch_size (int): Documents per nlp.pipe batch when workers is 0 or 1
+
+    Yields:
+        dict: Row with 'file_name', 'path' and 'scores' (job name -> score)
+    """
+    combined_skills = combine_jobs(jobs)
+    logger.info(f"Scoring against {len(jobs)} jobs with {len(combined_skills)} distinct skills")
+
+    # Encode the combined skill matrix once for the whole run
+    get_skill_embeddings(combined_skills)
+
+    for batch in iter_prepared_batches(resume_paths, combined_skills, workers, batch_size, max_wait,
+                                       extraction_cache, tokenize_processes, extraction_limits,
+                                       tokenize_batch_size=tokenize_batch_size):
+        yield from _score_batch_for_jobs(batch, jobs, combined_skills, max_threshold)
+
+def score_table(resume_paths, jobs, **kwargs):
+    """
+    Score a corpus against several jobs and collect a resumes × jobs table
+
+    Args:
+        resume_paths (list): Paths of resume files
+        jobs (list): Jobs from load_jobs
+        **kwargs: Passed to score_jobs
+
+    Returns:
+        pandas.DataFrame: One row per resume, one score column per job
+    """
+    import pandas as pd
+
+    rows = [{"Resume": row["file_name"], **row["scores"]} for row in score_jobs(resume_paths, jobs, **kwargs)]
+    return pd.DataFrame(rows, columns=["Resume"] + [job.name for job in jobs])
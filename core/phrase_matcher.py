@@ -0,0 +1,132 @@
+"""
+Multi-pattern exact skill matching using the Aho-Corasick algorithm
+"""
+
+import logging
+from collections import deque
+
+logger = logging.getLogger('resume_matcher.core.phrase_matcher')
+
+class SkillPhraseMatcher:
+    """
+    Finds every skill that occurs in a text with a single pass over the text.
+
+    The automaton is compiled once per skill list. Matching is case-insensitive
+    and, by default, uses the same substring semantics as
+    ``skill.lower() in text.lower()``. With ``word_boundaries=True`` a hit only
+    counts when it is not glued to surrounding letters or digits, so "Java"
+    no longer matches inside "JavaScript".
+    """
+
+    def __init__(self, skill_list, word_boundaries=False):
+        """
+        Args:
+            skill_list (list): List of skills to match
+            word_boundaries (bool): Only accept hits delimited by non-alphanumerics
+        """
+        self.skill_list = list(skill_list)
+        self.word_boundaries = word_boundaries
+
+        # Trie transitions, failure links and per-state pattern outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        # Pattern id -> (pattern length, skills sharing that lowercased pattern)
+        self._patterns = []
+        self._always_matched = set()
+
+        pattern_ids = {}
+        for skill in self.skill_list:
+            pattern = str(skill).lower()
+            if not pattern:
+                # An empty skill is a substring of every text
+                self._always_matched.add(skill)
+                continue
+            if pattern in pattern_ids:
+                self._patterns[pattern_ids[pattern]][1].append(skill)
+                continue
+            pattern_ids[pattern] = len(self._patterns)
+            self._patterns.append((len(pattern), [skill]))
+            self._add_pattern(pattern, pattern_ids[pattern])
+
+        self._build_failure_links()
+        logger.debug(f"Compiled phrase matcher for {len(self._patterns)} patterns "
+                     f"({len(self._goto)} states)")
+
+    def _add_pattern(self, pattern, pattern_id):
+        """Insert a lowercased pattern into the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(pattern_id)
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _is_bounded(self, text, start, end):
+        """Check that a hit spanning text[start:end] sits on word boundaries"""
+        if start > 0 and text[start - 1].isalnum() and text[start].isalnum():
+            return False
+        if end < len(text) and text[end].isalnum() and text[end - 1].isalnum():
+            return False
+        return True
+
+    def find(self, text):
+        """
+        Find all skills that occur in a text
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            set: Skills (as given in the skill list) with at least one hit
+        """
+        text = text.lower()
+        found_patterns = set()
+        remaining = len(self._patterns)
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for pattern_id in output[state]:
+                if pattern_id in found_patterns:
+                    continue
+                length = self._patterns[pattern_id][0]
+                if self.word_boundaries and not self._is_bounded(text, position + 1 - length, position + 1):
+                    continue
+                found_patterns.add(pattern_id)
+                remaining -= 1
+
+            if not remaining:
+                break
+
+        matched = set(self._always_matched)
+        for pattern_id in found_patterns:
+            matched.update(self._patterns[pattern_id][1])
+        return matched
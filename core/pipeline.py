@@ -0,0 +1,308 @@
+"""
+Parallel resume processing pipeline
+
+Text extraction, exact matching and spaCy tokenization run in a process
+pool; tokens from finished resumes are gathered into batches for the
+sentence encoder in the parent process, and each scored result is yielded
+as soon as its batch completes.
+"""
+
+import os
+import time
+import logging
+import multiprocessing
+from contextlib import nullcontext
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from core.extractor import extract_text_from_file
+from core.matcher import (find_exact_matches, tokenize_resume, tokenize_resumes, batch_similarity,
+                          match_tokens, get_skill_embeddings, TOKENIZE_BATCH_SIZE)
+from core.scorer import SkillScorer
+from core.instrumentation import recorder
+
+logger = logging.getLogger('resume_matcher.core.pipeline')
+
+# Highest threshold determine_threshold can return, used to normalise scores
+MAX_THRESHOLD = 0.75
+
+UNPROCESSABLE = 'Unable to process resume.'
+
+# Output of the CPU-bound stage for one resume; samples carries worker timings and
+# text is kept for match records
+PreparedResume = namedtuple('PreparedResume', ['path', 'exact_matches', 'tokens', 'error', 'samples', 'text'],
+                            defaults=(None, None))
+
+# Skill list and extraction settings of the current pool worker, set once by _init_worker
+_worker_skill_list = None
+_worker_extraction_cache = None
+_worker_extraction_limits = None
+
+def _init_worker(skill_list, extraction_cache=None, instrument=False, extraction_limits=None):
+    """Pool initializer: keep per-run state so tasks only ship a file path"""
+    global _worker_skill_list, _worker_extraction_cache, _worker_extraction_limits
+    _worker_skill_list = skill_list
+    _worker_extraction_cache = extraction_cache
+    _worker_extraction_limits = extraction_limits
+    recorder.enable(instrument)
+
+def prepare_resume(resume_path, skill_list=None, extraction_cache=None, extraction_limits=None):
+    """
+    Extracts, exact-matches and tokenizes one resume.
+
+    Args:
+        resume_path (str): Path to the resume file
+        skill_list (list, optional): Skills to match, defaults to the worker's list
+        extraction_cache (ExtractionCache, optional): Cache of extracted text,
+            defaults to the worker's cache
+        extraction_limits (ExtractionLimits, optional): Per-file extraction budgets,
+            defaults to the worker's limits
+
+    Returns:
+        PreparedResume: Exact matches and tokens, or tokens=None if the resume
+        has no usable text
+    """
+    in_worker = skill_list is None
+    if in_worker:
+        skill_list = _worker_skill_list
+        extraction_cache = _worker_extraction_cache
+        extraction_limits = _worker_extraction_limits
+
+    with recorder.resume(resume_path):
+        prepared = _prepare(resume_path, skill_list, extraction_cache, extraction_limits)
+
+    # Ship timings recorded in the worker back to the parent's recorder
+    if in_worker and recorder.enabled:
+        prepared = prepared._replace(samples=recorder.drain())
+    return prepared
+
+def _prepare(resume_path, skill_list, extraction_cache, extraction_limits=None):
+    """Extraction, exact matching and tokenization for prepare_resume"""
+    try:
+        resume_text = extract_text_from_file(resume_path, cache=extraction_cache, limits=extraction_limits)
+        if not resume_text:
+            return PreparedResume(resume_path, None, None, None)
+
+        exact_matches = find_exact_matches(resume_text, skill_list)
+        tokens = tokenize_resume(resume_text)
+        return PreparedResume(resume_path, exact_matches, tokens, None, text=resume_text)
+
+    except Exception as e:
+        logger.error(f"Error preparing {os.path.basename(resume_path)}: {e}")
+        return PreparedResume(resume_path, None, None, str(e))
+
+def prepare_resumes(resume_paths, skill_list, extraction_cache=None, tokenize_processes=1,
+                    extraction_limits=None, tokenize_batch_size=TOKENIZE_BATCH_SIZE):
+    """
+    Extracts and exact-matches several resumes, then tokenizes them together with nlp.pipe.
+
+    Args:
+        resume_paths (list): Paths to resume files
+        skill_list (list): Skills to match
+        extraction_cache (ExtractionCache, optional): Cache of extracted text
+        tokenize_processes (int): spaCy processes used by nlp.pipe
+        extraction_limits (ExtractionLimits, optional): Per-file extraction budgets
+        tokenize_batch_size (int): Documents per nlp.pipe batch
+
+    Returns:
+        list: One PreparedResume per path, in input order
+    """
+    prepared = []
+    texts = {}
+    for resume_path in resume_paths:
+        with recorder.resume(resume_path):
+            try:
+                resume_text = extract_text_from_file(resume_path, cache=extraction_cache,
+                                                     limits=extraction_limits)
+                exact_matches = find_exact_matches(resume_text, skill_list) if resume_text else None
+                prepared.append(PreparedResume(resume_path, exact_matches, None, None, text=resume_text))
+                if resume_text:
+                    texts[len(prepared) - 1] = resume_text
+            except Exception as e:
+                logger.error(f"Error preparing {os.path.basename(resume_path)}: {e}")
+                prepared.append(PreparedResume(resume_path, None, None, str(e)))
+
+    token_lists = tokenize_resumes(list(texts.values()), batch_size=tokenize_batch_size,
+                                   n_process=tokenize_processes)
+    for index, tokens in zip(texts, token_lists):
+        prepared[index] = prepared[index]._replace(tokens=tokens)
+    return prepared
+
+def _unprocessable_result(prepared):
+    """Result row for a resume whose text could not be used"""
+    return {
+        "file_name": os.path.basename(prepared.path),
+        "path": prepared.path,
+        "score": 0.0,
+        "matched_skills": [UNPROCESSABLE],
+        "missing_skills": [UNPROCESSABLE],
+    }
+
+def _score_batch(batch, skill_list, scorer, max_threshold, record_writer=None, vector_index=None):
+    """Match a batch of prepared resumes with shared token embeddings and score each of them"""
+    usable = [prepared for prepared in batch if prepared.tokens is not None]
+    similarities = iter(batch_similarity([prepared.tokens for prepared in usable], skill_list))
+
+    results = []
+    for prepared in batch:
+        recorder.merge(prepared.samples)
+        if prepared.tokens is None:
+            results.append(_unprocessable_result(prepared))
+            if record_writer is not None:
+                record_writer.write_unprocessable(prepared.path)
+            continue
+
+        similarity_scores = next(similarities)
+        with recorder.resume(prepared.path):
+            matched_skills, similarity_threshold = match_tokens(
+                prepared.exact_matches, prepared.tokens, skill_list,
+                similarity_scores=similarity_scores
+            )
+            matched, missing, score = scorer.score(matched_skills, similarity_threshold, max_threshold)
+        if record_writer is not None:
+            record_writer.write_match(prepared.path, prepared.exact_matches, prepared.tokens,
+                                      similarity_scores, similarity_threshold, prepared.text)
+        if vector_index is not None:
+            # Phrase embeddings are still in the token cache from batch_similarity
+            vector_index.add(prepared.path, prepared.tokens)
+        results.append({
+            "file_name": os.path.basename(prepared.path),
+            "path": prepared.path,
+            "score": score,
+            "matched_skills": list(matched),
+            "missing_skills": list(missing),
+        })
+    return results
+
+def create_pool(skill_list, workers, extraction_cache=None, extraction_limits=None):
+    """
+    Start a pool of preparation workers that can serve several runs
+
+    Args:
+        skill_list (list): Skills to exact-match; runs using the pool must use the same list
+        workers (int): Worker processes
+        extraction_cache (ExtractionCache, optional): Cache of extracted resume text
+        extraction_limits (ExtractionLimits, optional): Per-file extraction budgets
+
+    Returns:
+        ProcessPoolExecutor: Pool to pass as executor; the caller shuts it down
+    """
+    # Spawned workers avoid forking a parent that may hold torch/tokenizer threads
+    context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                               initargs=(skill_list, extraction_cache, recorder.enabled, extraction_limits))
+
+def iter_prepared_batches(resume_paths, skill_list, workers=None, batch_size=16, max_wait=0.5,
+                          extraction_cache=None, tokenize_processes=1, extraction_limits=None,
+                          executor=None, tokenize_batch_size=TOKENIZE_BATCH_SIZE):
+    """
+    Run the CPU-bound stage and yield prepared resumes in batches as they finish.
+
+    Args:
+        resume_paths (list): Paths of resume files
+        skill_list (list): Skills to exact-match
+        workers (int, optional): Extraction/tokenization processes; defaults to the
+            CPU count, and 0 or 1 runs everything in the calling process
+        batch_size (int): Number of resumes per yielded batch
+        max_wait (float): Seconds to wait for a batch to fill before yielding it anyway
+        extraction_cache (ExtractionCache, optional): Cache of extracted resume text
+        tokenize_processes (int): spaCy nlp.pipe processes when running in the calling
+            process (workers 0 or 1); pool workers each tokenize their own resumes
+        extraction_limits (ExtractionLimits, optional): Per-file page, character, size
+            and time budgets for extraction
+        executor (ProcessPoolExecutor, optional): Pool from create_pool to reuse
+            instead of starting one for this call
+        tokenize_batch_size (int): Documents per nlp.pipe batch when running in the
+            calling process
+
+    Yields:
+        list: PreparedResume batches, in completion order
+    """
+    batch_size = max(1, batch_size)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 and executor is None:
+        for start in range(0, len(resume_paths), batch_size):
+            yield prepare_resumes(resume_paths[start:start + batch_size], skill_list,
+                                  extraction_cache, tokenize_processes, extraction_limits,
+                                  tokenize_batch_size)
+        return
+
+    pending_paths = iter(resume_paths)
+    max_in_flight = max(workers, 1) * 4
+
+    pool = nullcontext(executor) if executor is not None else create_pool(skill_list, workers, extraction_cache,
+                                                                           extraction_limits)
+    with pool as executor:
+        in_flight = set()
+        batch = []
+        batch_started = None
+
+        def submit_more():
+            while len(in_flight) < max_in_flight:
+                path = next(pending_paths, None)
+                if path is None:
+                    return
+                in_flight.add(executor.submit(prepare_resume, path))
+
+        submit_more()
+        while in_flight or batch:
+            if in_flight:
+                done, _ = wait(in_flight, timeout=max_wait, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.discard(future)
+                    batch.append(future.result())
+                    if batch_started is None:
+                        batch_started = time.monotonic()
+                submit_more()
+
+            batch_due = batch_started is not None and time.monotonic() - batch_started >= max_wait
+            if batch and (len(batch) >= batch_size or not in_flight or batch_due):
+                yield batch
+                batch = []
+                batch_started = None
+
+def score_resumes(resume_paths, weighted_skills, workers=None, batch_size=16,
+                  max_wait=0.5, max_threshold=MAX_THRESHOLD, extraction_cache=None,
+                  tokenize_processes=1, record_writer=None, vector_index=None,
+                  extraction_limits=None, executor=None, tokenize_batch_size=TOKENIZE_BATCH_SIZE):
+    """
+    Score resumes in parallel, yielding each result as soon as it is ready.
+
+    Args:
+        resume_paths (list): Paths of resume files
+        weighted_skills (pandas.DataFrame): DataFrame with 'skills' and 'weightage' columns
+        workers (int, optional): Extraction/tokenization processes; defaults to the
+            CPU count, and 0 or 1 runs everything in the calling process
+        batch_size (int): Number of resumes encoded per embedder call
+        max_wait (float): Seconds to wait for a batch to fill before encoding it anyway
+        max_threshold (float): Strictest similarity threshold, used for normalisation
+        extraction_cache (ExtractionCache, optional): Cache of extracted resume text
+        tokenize_processes (int): spaCy nlp.pipe processes when running in the calling
+            process (workers 0 or 1); pool workers each tokenize their own resumes
+        record_writer (MatchRecordWriter, optional): Receives a match record per resume
+            for later incremental re-scoring
+        vector_index (VectorIndex, optional): Receives each resume's phrase embeddings
+            for reverse skill search
+        extraction_limits (ExtractionLimits, optional): Per-file page, character, size
+            and time budgets for extraction
+        executor (ProcessPoolExecutor, optional): Pool from create_pool to reuse
+            instead of starting one for this call
+        tokenize_batch_size (int): Documents per nlp.pipe batch when running in the
+            calling process
+
+    Yields:
+        dict: Result with 'file_name', 'path', 'score', 'matched_skills' and 'missing_skills'
+    """
+    skill_list = weighted_skills['skills'].tolist()
+    scorer = SkillScorer(weighted_skills)
+
+    # Encode the skill list once for the whole run
+    get_skill_embeddings(skill_list)
+
+    for batch in iter_prepared_batches(resume_paths, skill_list, workers, batch_size, max_wait,
+                                       extraction_cache, tokenize_processes, extraction_limits, executor,
+                                       tokenize_batch_size):
+        yield from _score_batch(batch, skill_list, scorer, max_threshold, record_writer, vector_index)
@@ -0,0 +1,162 @@
+"""
+Bounded-memory ranking of streaming results
+
+TopKRanking keeps only the best K results in a min-heap while results stream
+in, and ResultSpill writes every result to disk in fixed-size chunks, so
+ranking a corpus of any size needs O(K + chunk) memory.
+"""
+
+import os
+import csv
+import heapq
+import logging
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger('resume_matcher.core.ranking')
+
+CSV_COLUMNS = ["Resume", "Score (%)", "Matched Skills", "Missing Skills"]
+
+SPILL_EXTENSIONS = ('.csv', '.parquet')
+
+class TopKRanking:
+    """Top-K results by score, kept in a min-heap of size K"""
+
+    def __init__(self, k):
+        """
+        Args:
+            k (int): Number of results to keep
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.seen = 0
+        # (score, -arrival, result): the root is the lowest score, latest arrival on ties
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, result):
+        """
+        Offer a result to the ranking
+
+        Args:
+            result (dict): Result with a 'score'
+
+        Returns:
+            bool: True if the result is currently in the top K
+        """
+        item = (result["score"], -self.seen, result)
+        self.seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+            return True
+        if item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+            return True
+        return False
+
+    def min_score(self):
+        """Score a result must beat to enter a full ranking, or None while not full"""
+        return self._heap[0][0] if len(self._heap) == self.k else None
+
+    def ranked(self):
+        """The kept results, best first (earlier arrivals first on equal scores)"""
+        return [item[2] for item in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+class ResultSpill:
+    """
+    Writes every result to a CSV or Parquet file in chunks of rows
+
+    Rows are buffered up to chunk_rows and then written out (one Parquet row
+    group per chunk), so memory stays flat however many results pass through.
+    """
+
+    def __init__(self, path, chunk_rows=1000):
+        """
+        Args:
+            path (str): Output file ending in .csv, or .parquet for Parquet (requires pyarrow)
+            chunk_rows (int): Results buffered before each write
+
+        Raises:
+            ValueError: If the extension is neither .csv nor .parquet
+            ImportError: If Parquet output is requested without pyarrow
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in SPILL_EXTENSIONS:
+            raise ValueError(f"Spill file must end in .csv or .parquet, not {path!r}")
+        self.path = path
+        self.chunk_rows = max(1, chunk_rows)
+        self.parquet = extension == '.parquet'
+        self.rows_written = 0
+        self._buffer = []
+
+        if self.parquet:
+            if pyarrow is None:
+                raise ImportError("Parquet output requires the pyarrow package (pip install pyarrow)")
+            self._schema = pyarrow.schema([
+                ("resume", pyarrow.string()),
+                ("path", pyarrow.string()),
+                ("score", pyarrow.float64()),
+                ("matched_skills", pyarrow.list_(pyarrow.string())),
+                ("missing_skills", pyarrow.list_(pyarrow.string())),
+            ])
+            self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+            self._file = None
+        else:
+            self._file = open(path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(CSV_COLUMNS)
+
+    def write(self, result):
+        """Buffer one result, writing a chunk when the buffer is full"""
+        self._buffer.append(result)
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Write buffered results"""
+        if not self._buffer:
+            return
+
+        if self.parquet:
+            table = pyarrow.Table.from_pydict({
+                "resume": [result["file_name"] for result in self._buffer],
+                "path": [result.get("path") for result in self._buffer],
+                "score": [float(result["score"]) for result in self._buffer],
+                "matched_skills": [list(result["matched_skills"]) for result in self._buffer],
+                "missing_skills": [list(result["missing_skills"]) for result in self._buffer],
+            }, schema=self._schema)
+            self._writer.write_table(table)
+        else:
+            self._writer.writerows([
+                result["file_name"],
+                f"{result['score']:.2f}",
+                ", ".join(result["matched_skills"]),
+                ", ".join(result["missing_skills"]),
+            ] for result in self._buffer)
+            self._file.flush()
+
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """Write remaining results and close the file"""
+        self.flush()
+        if self.parquet:
+            self._writer.close()
+        else:
+            self._file.close()
+        logger.info(f"Wrote {self.rows_written} results to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -4,49 +4,125 @@ Score calculation module based on matched skills
 
 import logging
 
+import numpy as np
+import pandas as pd
+
+from core.instrumentation import recorder
+
 logger = logging.getLogger('resume_matcher.core.scorer')
 
+class SkillScorer:
+    """
+    Weight table compiled once from a skills DataFrame.
+
+    Skills are mapped to column indexes of a NumPy weight vector, so scoring a
+    resume (or a whole batch of match bitmasks) is a vectorized sum instead of
+    a DataFrame lookup per matched skill.
+    """
+
+    def __init__(self, weighted_skills):
+        """
+        Args:
+            weighted_skills (pandas.DataFrame): DataFrame with 'skills' and 'weightage' columns
+        """
+        self.skills = []
+        self.skill_index = {}
+        weights = []
+
+        # Blank or non-numeric weights count as 0 instead of failing the whole run
+        weightage = pd.to_numeric(weighted_skills['weightage'], errors='coerce')
+        invalid = int(weightage.isna().sum())
+        weightage = weightage.fillna(0)
+        if invalid:
+            logger.warning(f"{invalid} skills have a blank or non-numeric weightage; treating them as 0")
+
+        # Duplicate skills keep the weight of their first row
+        for skill, weight in zip(weighted_skills['skills'].to_list(), weightage.to_list()):
+            if skill in self.skill_index:
+                continue
+            self.skill_index[skill] = len(self.skills)
+            self.skills.append(skill)
+            weights.append(int(weight))
+
+        self.weights = np.asarray(weights, dtype=np.int64)
+        self.total_skill_points = int(weightage.sum())
+        self.all_skills_set = frozenset(self.skills)
+
+    def mask(self, matched_skills):
+        """
+        Convert matched skills to a boolean bitmask over the weight table
+
+        Args:
+            matched_skills (iterable): Matched skills
+
+        Returns:
+            numpy.ndarray: Boolean vector, True where the skill was matched
+        """
+        mask = np.zeros(len(self.skills), dtype=bool)
+        indexes = [self.skill_index[skill] for skill in matched_skills if skill in self.skill_index]
+        mask[indexes] = True
+        return mask
+
+    def score_masks(self, masks, similarity_thresholds, max_threshold):
+        """
+        Score a batch of match bitmasks at once
+
+        Args:
+            masks (numpy.ndarray): Boolean matrix of shape (n_resumes, n_skills)
+            similarity_thresholds (float or numpy.ndarray): Threshold used per resume
+            max_threshold (float): Strictest threshold, used for normalisation
+
+        Returns:
+            numpy.ndarray: Percentage score per resume
+        """
+        masks = np.atleast_2d(np.asarray(masks, dtype=bool))
+        acquired_skill_points = masks @ self.weights
+
+        if self.total_skill_points <= 0:
+            logger.warning("Total skill points is zero, cannot calculate percentage")
+            return np.zeros(len(masks))
+
+        thresholds = np.asarray(similarity_thresholds, dtype=float)
+        return acquired_skill_points * thresholds * 100 / (max_threshold * self.total_skill_points)
+
+    def score(self, matched_skills, similarity_threshold, max_threshold):
+        """
+        Calculate score for a single resume
+
+        Args:
+            matched_skills (list): List of matched skills
+            similarity_threshold (float): Threshold used when matching the resume
+            max_threshold (float): Strictest threshold, used for normalisation
+
+        Returns:
+            tuple: (matched_skills, missing_skills, score)
+        """
+        matched_skills_set = set(matched_skills)
+        missing_skills = set(self.all_skills_set - matched_skills_set)
+
+        try:
+            with recorder.stage('score'):
+                mask = self.mask(matched_skills_set)
+                resume_score = float(self.score_masks(mask, similarity_threshold, max_threshold)[0])
+            logger.info(f"Resume scored {resume_score:.2f}% "
+                        f"({int(mask @ self.weights)}/{self.total_skill_points} points)")
+            return matched_skills_set, missing_skills, resume_score
+
+        except Exception as e:
+            logger.error(f"Error calculating score: {e}")
+            return matched_skills_set, missing_skills, 0
+
 def calculate_score(weighted_skills, matched_skills,similarity_threshold,max_threshold):
     """
     Calculate score based on weighted skills
-    
+
     Args:
-        weighted_skills (pandas.DataFrame): DataFrame with 'skills' and 'weightage' columns
+        weighted_skills (pandas.DataFrame or SkillScorer): DataFrame with 'skills' and
+            'weightage' columns, or a scorer already compiled from one
         matched_skills (list): List of matched skills
-        
+
     Returns:
         tuple: (matched_skills, missing_skills, score)
     """
-    # Convert matched_skills to set for faster operations
-    matched_skills_set = set(matched_skills)
-    all_skills_set = set(weighted_skills['skills'].to_list())
-    
-    # Find missing skills
-    missing_skills = all_skills_set - matched_skills_set
-    
-    # Calculate score
-    resume_score = 0
-    acquired_skill_points = 0
-    total_skill_points = int(weighted_skills['weightage'].sum())
-
-    try:
-        # Sum up weights of matched skills
-        for matched_skill in matched_skills_set:
-            skill_weight = weighted_skills[weighted_skills['skills'] == matched_skill]['weightage'].iloc[0]
-            acquired_skill_points += int(skill_weight)
-        
-        # Calculate percentage score
-        print(acquired_skill_points,total_skill_points,similarity_threshold,max_threshold)
-        if total_skill_points > 0:
-            resume_score = acquired_skill_points * similarity_threshold *100 / (max_threshold*total_skill_points)
-        else:
-            resume_score = 0
-            logger.warning("Total skill points is zero, cannot calculate percentage")
-        
-        logger.info(f"Resume scored {resume_score:.2f}% ({acquired_skill_points}/{total_skill_points} points)")
-        
-        return matched_skills_set, missing_skills, resume_score
-    
-    except Exception as e:
-        logger.error(f"Error calculating score: {e}")
-        return matched_skills_set, missing_skills, 0
\ No newline at end of file
+    scorer = weighted_skills if isinstance(weighted_skills, SkillScorer) else SkillScorer(weighted_skills)
+    return scorer.score(matched_skills, similarity_threshold, max_threshold)
@@ -0,0 +1,338 @@
+"""
+Persistent vector index of resume phrase embeddings for reverse skill search
+
+Answers "who has Kubernetes?" without re-running match_skills over the
+corpus. Phrase embeddings from tokenize_resume are appended to flat files
+and read back through numpy memory maps, so adding resumes never rewrites
+the index.
+
+Layout of an index directory:
+    meta.json       embedding model and dimension
+    vectors.f32     L2-normalised float32 rows, one per phrase
+    rows.i32        resume id of each row
+    resumes.jsonl   resume id -> path and content hash, one line per resume
+    hnsw.faiss      optional approximate index (requires faiss), prefixed with
+                    the number of rows it covers
+
+A resume's rows are appended before the resume is registered, and the first
+append of a process cuts all three files back to their last consistent
+prefix, so an add interrupted by a crash is dropped and redone. The
+approximate index only ever covers rows of registered resumes; it is
+replaced atomically and rebuilt if it covers more rows than are registered.
+An index has one writer at a time; any number of processes may search it.
+"""
+
+import os
+import json
+import struct
+import logging
+import threading
+
+import numpy as np
+
+from core.models import embedding_model_key, get_embedder
+from core.matcher import encode_tokens
+from core.extraction_cache import hash_file
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+logger = logging.getLogger('resume_matcher.core.vector_index')
+
+# Header of hnsw.faiss: magic, then the number of rows the index covers
+ANN_MAGIC = b"RMHNSW01"
+ANN_HEADER = struct.Struct('<8sQ')
+
+class VectorIndex:
+    """Append-only, memory-mapped index of phrase embeddings per resume"""
+
+    def __init__(self, index_dir):
+        """
+        Args:
+            index_dir (str): Directory holding the index files (created if missing)
+        """
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.meta_path = os.path.join(index_dir, 'meta.json')
+        self.vectors_path = os.path.join(index_dir, 'vectors.f32')
+        self.rows_path = os.path.join(index_dir, 'rows.i32')
+        self.resumes_path = os.path.join(index_dir, 'resumes.jsonl')
+        self.ann_path = os.path.join(index_dir, 'hnsw.faiss')
+
+        self.meta = self._load_meta()
+        # Path of every resume id, and the current id and content hash of each path
+        self.resume_paths = []
+        self._resume_ids = {}
+        self._resume_hashes = {}
+        self._resumes_end = 0
+        self._load_resumes()
+        self._repaired = False
+        self._ann = None
+
+    def _load_meta(self):
+        if not os.path.isfile(self.meta_path):
+            return {'model': embedding_model_key(), 'dim': None}
+        with open(self.meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('model') != embedding_model_key():
+            raise ValueError(f"Index was built with {meta.get('model')}, not {embedding_model_key()}")
+        return meta
+
+    def _load_resumes(self):
+        """Read resumes registered since the last call, up to the first incomplete line"""
+        if not os.path.isfile(self.resumes_path):
+            return
+        with open(self.resumes_path, 'rb') as f:
+            f.seek(self._resumes_end)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._register(entry['path'], entry.get('hash'))
+                self._resumes_end += len(line)
+
+    def _register(self, path, file_hash):
+        """Give a path the next resume id; rows of its previous id become stale"""
+        self._resume_ids[path] = len(self.resume_paths)
+        self._resume_hashes[path] = file_hash
+        self.resume_paths.append(path)
+
+    def _repair(self):
+        """Cut the files back to rows whose resume was registered before a crash"""
+        if os.path.isfile(self.resumes_path) and os.path.getsize(self.resumes_path) > self._resumes_end:
+            logger.warning(f"Truncating incomplete resume entry in {self.resumes_path}")
+            os.truncate(self.resumes_path, self._resumes_end)
+
+        dim = self.meta['dim']
+        if not dim:
+            return
+        vector_rows = os.path.getsize(self.vectors_path) // (4 * dim) if os.path.isfile(self.vectors_path) else 0
+        id_rows = os.path.getsize(self.rows_path) // 4 if os.path.isfile(self.rows_path) else 0
+        rows = min(vector_rows, id_rows)
+        if rows:
+            # Resume ids only ever grow, so rows of unregistered resumes form the tail
+            rows = int(np.searchsorted(self._row_ids(rows), len(self.resume_paths)))
+        truncated = False
+        for path, size in ((self.vectors_path, rows * 4 * dim), (self.rows_path, rows * 4)):
+            if os.path.isfile(path) and os.path.getsize(path) > size:
+                logger.warning(f"Truncating rows of an interrupted add in {path}")
+                os.truncate(path, size)
+                truncated = True
+        if truncated and os.path.isfile(self.ann_path):
+            # Cut rows may be replaced by different ones, so the approximate index is rebuilt
+            os.remove(self.ann_path)
+            self._ann = None
+
+    def __len__(self):
+        """Number of indexed resumes"""
+        return len(self._resume_ids)
+
+    def __contains__(self, path):
+        return path in self._resume_ids
+
+    def row_count(self):
+        """Number of phrase rows that are fully written to both row files"""
+        dim = self.meta['dim']
+        if not dim or not os.path.isfile(self.vectors_path):
+            return 0
+        vector_rows = os.path.getsize(self.vectors_path) // (4 * dim)
+        id_rows = os.path.getsize(self.rows_path) // 4 if os.path.isfile(self.rows_path) else 0
+        # The writer may be between its two appends; rows of resumes that are
+        # not registered yet are skipped by search
+        return min(vector_rows, id_rows)
+
+    def add(self, path, phrases, embeddings=None):
+        """
+        Append a resume's phrase embeddings
+
+        A path that is already indexed is indexed again when its contents
+        have changed; its old rows are no longer returned by search.
+
+        Args:
+            path (str): Resume path, used as its identity
+            phrases (list): tokenize_resume output
+            embeddings (numpy.ndarray, optional): Phrase embeddings; encoded through
+                the shared token cache when omitted
+
+        Returns:
+            bool: False if the resume was already indexed with these contents or has no phrases
+        """
+        if not phrases:
+            return False
+        try:
+            file_hash = hash_file(path)
+        except OSError:
+            file_hash = None
+        if path in self._resume_ids and file_hash is not None and self._resume_hashes[path] == file_hash:
+            return False
+
+        if embeddings is None:
+            embeddings = encode_tokens(list(phrases))
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.maximum(norms, 1e-12)
+
+        with self._lock:
+            if not self._repaired:
+                self._repair()
+                self._repaired = True
+            if self.meta['dim'] is None:
+                self.meta['dim'] = int(embeddings.shape[1])
+                with open(self.meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.meta, f)
+            elif embeddings.shape[1] != self.meta['dim']:
+                raise ValueError(f"Expected {self.meta['dim']}-d embeddings, got {embeddings.shape[1]}")
+
+            # Rows first, registration last: a crash leaves only unregistered rows,
+            # which the next writer truncates
+            resume_id = len(self.resume_paths)
+            with open(self.vectors_path, 'ab') as f:
+                f.write(np.ascontiguousarray(embeddings).tobytes())
+            with open(self.rows_path, 'ab') as f:
+                f.write(np.full(len(embeddings), resume_id, dtype='<i4').tobytes())
+            line = (json.dumps({'id': resume_id, 'path': path, 'hash': file_hash}) + "\n").encode('utf-8')
+            with open(self.resumes_path, 'ab') as f:
+                f.write(line)
+
+            self._register(path, file_hash)
+            self._resumes_end += len(line)
+        return True
+
+    def _vectors(self, rows):
+        return np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.meta['dim']))
+
+    def _row_ids(self, rows):
+        return np.memmap(self.rows_path, dtype='<i4', mode='r', shape=(rows,))
+
+    def _encode_query(self, skill):
+        query = np.asarray(get_embedder().encode([skill], convert_to_numpy=True)[0], dtype=np.float32)
+        return query / max(float(np.linalg.norm(query)), 1e-12)
+
+    def search(self, skill, k=10, method='exact', block_size=65536):
+        """
+        Find the resumes whose best-matching phrase is closest to a skill
+
+        Args:
+            skill (str): Skill to search for
+            k (int): Number of resumes to return
+            method (str): 'exact' for a blocked scan of the memory-mapped matrix,
+                'approximate' for the faiss HNSW index
+            block_size (int): Rows per block in exact search
+
+        Returns:
+            list: (resume path, cosine similarity) pairs, best first
+        """
+        with self._lock:
+            # Pick up resumes registered by the writer since this index was opened
+            self._load_resumes()
+        rows = self.row_count()
+        if rows == 0:
+            return []
+
+        query = self._encode_query(skill)
+        if method == 'exact':
+            best = self._exact_best(query, rows, block_size)
+        elif method == 'approximate':
+            best = self._approximate_best(query, rows, k)
+        else:
+            raise ValueError(f"Unknown search method: {method}")
+
+        # Rows of a resume that was re-indexed after its contents changed
+        stale = [i for i, path in enumerate(self.resume_paths) if self._resume_ids[path] != i]
+        best[stale] = -np.inf
+
+        found = np.flatnonzero(best > -np.inf)
+        k = min(k, len(found))
+        if k == 0:
+            return []
+        top = found[np.argpartition(-best[found], k - 1)[:k]]
+        top = top[np.argsort(-best[top])]
+        return [(self.resume_paths[i], float(best[i])) for i in top]
+
+    def _exact_best(self, query, rows, block_size):
+        """Best similarity per resume from a blocked scan over every phrase row"""
+        vectors = self._vectors(rows)
+        row_ids = self._row_ids(rows)
+        best = np.full(len(self.resume_paths), -np.inf, dtype=np.float32)
+        for start in range(0, rows, block_size):
+            scores = vectors[start:start + block_size] @ query
+            ids = np.asarray(row_ids[start:start + block_size])
+            # Rows appended by another process after this index was opened are skipped
+            known = ids < len(best)
+            np.maximum.at(best, ids[known], scores[known])
+        return best
+
+    def _approximate_best(self, query, rows, k, oversample=20):
+        """Best similarity per resume among the approximate nearest phrase rows"""
+        index = self._ann_index(rows)
+        limit = min(rows, k * oversample)
+        scores, hits = index.search(query[None, :], limit)
+        row_ids = self._row_ids(rows)
+
+        best = np.full(len(self.resume_paths), -np.inf, dtype=np.float32)
+        valid = hits[0] >= 0
+        ids = np.asarray(row_ids[hits[0][valid]])
+        known = ids < len(best)
+        np.maximum.at(best, ids[known], scores[0][valid][known])
+        return best
+
+    def _ann_index(self, rows, block_size=65536):
+        """Load or build the HNSW index and add any registered rows appended since it was saved"""
+        if faiss is None:
+            raise ImportError("Approximate search requires the faiss package (pip install faiss-cpu)")
+
+        with self._lock:
+            # Rows of a resume that is not registered yet may still be cut by the writer
+            committed = int(np.searchsorted(self._row_ids(rows), len(self.resume_paths)))
+            if self._ann is None:
+                self._ann = self._load_ann(committed)
+            if self._ann is None:
+                self._ann = faiss.IndexHNSWFlat(self.meta['dim'], 32, faiss.METRIC_INNER_PRODUCT)
+
+            indexed = self._ann.ntotal
+            if indexed < committed:
+                vectors = self._vectors(committed)
+                for start in range(indexed, committed, block_size):
+                    self._ann.add(np.ascontiguousarray(vectors[start:min(committed, start + block_size)]))
+                self._save_ann()
+                logger.info(f"Added {committed - indexed} rows to the approximate index")
+            return self._ann
+
+    def _load_ann(self, committed):
+        """Saved HNSW index, or None if there is none or it covers rows that are not registered"""
+        try:
+            with open(self.ann_path, 'rb') as f:
+                header = f.read(ANN_HEADER.size)
+                if len(header) < ANN_HEADER.size or ANN_HEADER.unpack(header)[0] != ANN_MAGIC:
+                    logger.warning(f"Rebuilding unreadable approximate index {self.ann_path}")
+                    return None
+                data = np.fromfile(f, dtype=np.uint8)
+        except FileNotFoundError:
+            return None
+        rows = ANN_HEADER.unpack(header)[1]
+        index = faiss.deserialize_index(data)
+        if index.ntotal != rows or rows > committed:
+            logger.warning(f"Rebuilding approximate index {self.ann_path}: it covers {index.ntotal} rows, "
+                           f"{committed} are registered")
+            return None
+        return index
+
+    def _save_ann(self):
+        """Write the HNSW index to a temporary file and move it into place"""
+        temp_path = f"{self.ann_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(ANN_HEADER.pack(ANN_MAGIC, self._ann.ntotal))
+                f.write(faiss.serialize_index(self._ann).tobytes())
+            os.replace(temp_path, self.ann_path)
+        except OSError as e:
+            logger.warning(f"Could not save approximate index {self.ann_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,321 @@
+"""
+Incremental ingestion of a watched resume folder
+
+FolderWatcher polls for new, changed and deleted resume files, waits until a
+file has stopped changing (debounce), confirms a change by content hash and
+scores only those files. Results are kept in a SQLite ResultStore that is
+updated in place, so a new resume is ranked seconds after it lands instead
+of after a full-folder rerun. Unprocessable resumes are stored without a
+content hash and retried with a growing delay, since the cause (a timeout,
+a locked file) may be transient.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+from core.extraction_cache import hash_file
+from core.pipeline import score_resumes, create_pool, UNPROCESSABLE
+
+logger = logging.getLogger('resume_matcher.core.watcher')
+
+class ResultStore:
+    """Persistent, score-indexed table of the latest result per resume path"""
+
+    def __init__(self, db_path, run_key):
+        """
+        Args:
+            db_path (str): SQLite database, created if missing
+            run_key (str): Key from core.journal.make_run_key; stored results
+                scored under another key are discarded
+        """
+        self.db_path = db_path
+        self.run_key = run_key
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                path TEXT PRIMARY KEY,
+                file_hash TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                score REAL NOT NULL,
+                result TEXT NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_score ON results (score DESC)")
+
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'run_key'").fetchone()
+        if row is not None and row[0] != run_key:
+            logger.warning(f"Skills or settings changed since {db_path} was written; rescoring every resume")
+            self._conn.execute("DELETE FROM results")
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('run_key', ?)", (run_key,))
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def file_states(self):
+        """
+        Returns:
+            dict: path -> (mtime_ns, size, file_hash) of every stored result; the
+            hash is empty for unprocessable results
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT path, mtime_ns, size, file_hash FROM results").fetchall()
+        return {path: (mtime_ns, size, file_hash) for path, mtime_ns, size, file_hash in rows}
+
+    def put(self, results, file_states):
+        """
+        Insert or replace results in one transaction
+
+        Args:
+            results (list): Result dicts with at least 'path' and 'score'
+            file_states (dict): path -> (mtime_ns, size, file_hash) seen when the file was scored
+        """
+        now = time.time()
+        rows = []
+        for result in results:
+            mtime_ns, size, file_hash = file_states[result["path"]]
+            rows.append((result["path"], file_hash, mtime_ns, size, result["score"], json.dumps(result), now))
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def touch(self, path, mtime_ns, size):
+        """Record a new mtime for a file whose contents did not change"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE results SET mtime_ns = ?, size = ? WHERE path = ?", (mtime_ns, size, path))
+
+    def remove(self, paths):
+        """Drop the results of deleted files"""
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM results WHERE path = ?", [(path,) for path in paths])
+
+    def ranked(self, limit=None):
+        """
+        Stored results, highest score first
+
+        Args:
+            limit (int, optional): Return at most this many
+
+        Returns:
+            list: Result dicts
+        """
+        query = "SELECT result FROM results ORDER BY score DESC, path"
+        params = ()
+        if limit:
+            query += " LIMIT ?"
+            params = (limit,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def rank_of(self, path):
+        """1-based rank of a stored path, or None if it is not stored"""
+        with self._lock:
+            row = self._conn.execute("SELECT score FROM results WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                return None
+            return self._conn.execute("SELECT COUNT(*) FROM results WHERE score > ?", (row[0],)).fetchone()[0] + 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+class FolderWatcher:
+    """Polls for changed resume files and scores them in debounced batches"""
+
+    def __init__(self, find_files, weighted_skills, store, poll_interval=2.0, debounce=1.0,
+                 max_batch=256, retry_delay=60.0, max_retry_delay=3600.0, **pipeline_options):
+        """
+        Args:
+            find_files (callable): Returns the current list of resume paths to watch
+            weighted_skills (pandas.DataFrame): DataFrame with 'skills' and 'weightage' columns
+            store (ResultStore): Ranked results, updated in place
+            poll_interval (float): Seconds between folder scans
+            debounce (float): Seconds a file's size and mtime must stay unchanged
+                before it is scored, so half-copied files are not read
+            max_batch (int): Most files scored (and reported) per batch
+            retry_delay (float): Seconds before an unprocessable resume is retried;
+                doubled after each further failure
+            max_retry_delay (float): Longest delay between retries
+            **pipeline_options: Passed to score_resumes (workers, batch_size,
+                extraction_cache, extraction_limits, ...)
+        """
+        self.find_files = find_files
+        self.weighted_skills = weighted_skills
+        self.store = store
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.max_batch = max(1, max_batch)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.pipeline_options = pipeline_options
+        self._known = store.file_states()
+        # path -> ((mtime_ns, size), monotonic time that stat was first seen)
+        self._settling = {}
+        # path -> (failed attempts, monotonic time of the next retry) of unprocessable resumes
+        self._retries = {}
+        # Preparation workers kept for the life of the watcher, started on first use
+        self._executor = None
+
+    def poll(self):
+        """
+        Scan once for files that changed and have settled
+
+        Returns:
+            dict: path -> (mtime_ns, size, file_hash) of files to score
+        """
+        now = time.monotonic()
+        current = set()
+        ready = {}
+
+        for path in self.find_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            current.add(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            known = self._known.get(path)
+            if known is not None and known[:2] == signature:
+                self._settling.pop(path, None)
+                # Unprocessable last time: retry once its delay has passed
+                if known[2] or now < self._retries.get(path, (0, 0.0))[1]:
+                    continue
+            else:
+                settling = self._settling.get(path)
+                if settling is None or settling[0] != signature:
+                    self._settling[path] = (signature, now)
+                    if self.debounce > 0:
+                        continue
+                elif now - settling[1] < self.debounce:
+                    continue
+                del self._settling[path]
+
+            try:
+                file_hash = hash_file(path)
+            except OSError:
+                continue
+            if known is not None and known[2] == file_hash:
+                # Touched or re-copied without changing contents
+                self._known[path] = signature + (file_hash,)
+                self.store.touch(path, *signature)
+                continue
+            ready[path] = signature + (file_hash,)
+
+        deleted = [path for path in self._known if path not in current]
+        if deleted:
+            self.store.remove(deleted)
+            for path in deleted:
+                del self._known[path]
+                self._retries.pop(path, None)
+            logger.info(f"Removed {len(deleted)} deleted resumes")
+        for path in [path for path in self._settling if path not in current]:
+            del self._settling[path]
+
+        return ready
+
+    def _pool(self):
+        """The watcher's preparation pool, or None to prepare in this process"""
+        workers = self.pipeline_options.get('workers') or os.cpu_count() or 1
+        if workers <= 1:
+            return None
+        if self._executor is None:
+            self._executor = create_pool(self.weighted_skills['skills'].tolist(), workers,
+                                         self.pipeline_options.get('extraction_cache'),
+                                         self.pipeline_options.get('extraction_limits'))
+        return self._executor
+
+    def process(self, file_states, on_results=None):
+        """
+        Score changed files and store their results, one batch at a time
+
+        Args:
+            file_states (dict): Output of poll
+            on_results (callable, optional): Called with each batch of results once stored
+
+        Returns:
+            int: Number of results stored
+        """
+        paths = sorted(file_states)
+        stored = 0
+        for start in range(0, len(paths), self.max_batch):
+            batch = paths[start:start + self.max_batch]
+            try:
+                batch_results = list(score_resumes(batch, self.weighted_skills, executor=self._pool(),
+                                                   **self.pipeline_options))
+            except BrokenProcessPool:
+                # Start a fresh pool on the next poll; the files are still unknown, so they are retried
+                logger.error("Preparation workers died; restarting them")
+                self.close()
+                raise
+
+            now = time.monotonic()
+            states = {}
+            for result in batch_results:
+                path = result["path"]
+                states[path] = file_states[path]
+                if result["matched_skills"] == [UNPROCESSABLE]:
+                    # No hash, so the file is retried even if its bytes never change
+                    states[path] = states[path][:2] + ("",)
+                    attempts = self._retries.get(path, (0, 0.0))[0] + 1
+                    delay = min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+                    self._retries[path] = (attempts, now + delay)
+                else:
+                    self._retries.pop(path, None)
+            self.store.put(batch_results, states)
+            self._known.update(states)
+            stored += len(batch_results)
+            if on_results is not None:
+                on_results(batch_results)
+        return stored
+
+    def close(self):
+        """Stop the preparation workers"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def run(self, on_results=None, stop_event=None):
+        """
+        Poll and score until stopped
+
+        Args:
+            on_results (callable, optional): Called with each list of new results
+            stop_event (threading.Event, optional): Set to stop watching
+        """
+        stop_event = stop_event or threading.Event()
+        logger.info(f"Watching for resumes every {self.poll_interval}s ({len(self._known)} already scored)")
+        try:
+            while not stop_event.is_set():
+                ready = self.poll()
+                if ready:
+                    started = time.monotonic()
+                    try:
+                        stored = self.process(ready, on_results)
+                    except BrokenProcessPool:
+                        stop_event.wait(self.poll_interval)
+                        continue
+                    logger.info(f"Scored {stored} new or changed resumes in {time.monotonic() - started:.1f}s")
+                stop_event.wait(self.poll_interval)
+        finally:
+            self.close()
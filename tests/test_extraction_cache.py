@@ -0,0 +1,88 @@
+import pickle
+import sqlite3
+import itertools
+
+import core.extraction_cache
+from core.extraction_cache import ExtractionCache, hash_file
+
+def stored_total(cache):
+    with sqlite3.connect(cache.db_path) as conn:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+def test_hash_file_is_content_based(tmp_path):
+    first, second = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    first.write_bytes(b"same bytes")
+    second.write_bytes(b"same bytes")
+    assert hash_file(str(first)) == hash_file(str(second))
+
+def test_get_and_put_round_trip(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    key = cache.make_key("abc", 2)
+    assert cache.get(key) is None
+    cache.put(key, "résumé text")
+    assert cache.get(key) == "résumé text"
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+    assert stats['bytes'] == len("résumé text".encode('utf-8'))
+    cache.close()
+
+def test_counters_are_batched_until_flushed(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    cache.put("k", "text")
+    for _ in range(3):
+        cache.get("k")
+    cache.get("missing")
+
+    # Lookups only read; the counts reach the database on flush
+    other = ExtractionCache(str(tmp_path))
+    assert other.stats()['hits'] == 0
+    cache.flush()
+    assert (other.stats()['hits'], other.stats()['misses']) == (3, 1)
+    cache.close()
+    other.close()
+
+def test_eviction_drops_least_recently_used_entries(tmp_path, monkeypatch):
+    # Strictly increasing access times, however coarse the real clock is
+    clock = itertools.count(1000)
+    monkeypatch.setattr(core.extraction_cache.time, 'time', lambda: float(next(clock)))
+    cache = ExtractionCache(str(tmp_path), max_bytes=25)
+    cache.put("old", "a" * 10)
+    cache.put("recent", "b" * 10)
+    # A hit refreshes "old", so "recent" is now the least recently used
+    assert cache.get("old") is not None
+    cache.put("new", "c" * 10)
+
+    assert cache.get("recent") is None
+    assert cache.get("old") == "a" * 10
+    assert cache.get("new") == "c" * 10
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes'] == 20 == stored_total(cache)
+    cache.close()
+
+def test_byte_counter_follows_replacements(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    cache.put("k", "x" * 100)
+    cache.put("k", "x" * 40)
+    cache.put("j", "y" * 5)
+    assert cache.stats()['bytes'] == 45 == stored_total(cache)
+    cache.clear()
+    assert cache.stats()['bytes'] == 0
+    cache.close()
+
+def test_oversized_text_is_not_cached(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=8)
+    cache.put("k", "x" * 9)
+    assert cache.get("k") is None
+    assert cache.stats()['entries'] == 0
+    cache.close()
+
+def test_pickled_cache_drops_pending_counts(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    cache.get("missing")
+    copy = pickle.loads(pickle.dumps(cache))
+    copy.close()
+    cache.flush()
+    # Only the original process reports its miss
+    assert cache.stats()['misses'] == 1
+    cache.close()
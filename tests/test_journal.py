@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+# core.journal imports the pipeline, which needs the extraction and scoring libraries
+for module in ('numpy', 'pandas', 'pdfminer', 'mammoth'):
+    pytest.importorskip(module)
+
+from core.journal import ResultJournal, make_run_key
+from core.extractor import ExtractionLimits
+from core.pipeline import UNPROCESSABLE
+
+RUN_KEY = "test-run"
+
+def result(path, score):
+    return {"file_name": path.name, "path": str(path), "score": score,
+            "matched_skills": ["Python"], "missing_skills": []}
+
+@pytest.fixture
+def resumes(tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"r{index}.pdf"
+        path.write_bytes(f"resume {index}".encode())
+        paths.append(path)
+    return paths
+
+def test_rerun_skips_journaled_resumes(tmp_path, resumes):
+    journal_path = str(tmp_path / "run.journal")
+    with ResultJournal(journal_path, RUN_KEY) as journal:
+        pending, completed = journal.plan([str(path) for path in resumes])
+        assert (len(pending), completed) == (3, [])
+        for score, path in zip([20.0, 80.0], resumes):
+            assert journal.append(result(path, score))
+
+    with ResultJournal(journal_path, RUN_KEY) as journal:
+        pending, completed = journal.plan([str(path) for path in resumes])
+        assert pending == [str(resumes[2])]
+        assert completed == [str(resumes[0]), str(resumes[1])]
+        scores = [item["score"] for item in journal.iter_results(completed, sort_by_score=True)]
+        assert scores == [80.0, 20.0]
+
+def test_torn_tail_is_truncated_on_open(tmp_path, resumes):
+    journal_path = tmp_path / "run.journal"
+    with ResultJournal(str(journal_path), RUN_KEY) as journal:
+        journal.plan([str(resumes[0])])
+        journal.append(result(resumes[0], 50.0))
+    intact = journal_path.read_bytes()
+    # A crash in the middle of the next append
+    with open(journal_path, 'ab') as f:
+        f.write(b'{"path": "' + str(resumes[1]).encode() + b'", "hash": "ab')
+
+    with ResultJournal(str(journal_path), RUN_KEY) as journal:
+        assert journal_path.read_bytes() == intact
+        assert len(journal) == 1
+        journal.plan([str(resumes[1])])
+        journal.append(result(resumes[1], 60.0))
+
+    lines = journal_path.read_bytes().splitlines()
+    assert [json.loads(line)["result"]["score"] for line in lines[1:]] == [50.0, 60.0]
+
+def test_changed_contents_are_rescored_and_copies_are_not(tmp_path, resumes):
+    journal_path = str(tmp_path / "run.journal")
+    with ResultJournal(journal_path, RUN_KEY) as journal:
+        journal.plan([str(resumes[0]), str(resumes[1])])
+        journal.append(result(resumes[0], 50.0))
+        journal.append(result(resumes[1], 70.0))
+
+    resumes[0].write_bytes(b"edited resume")
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(resumes[1].read_bytes())
+
+    with ResultJournal(journal_path, RUN_KEY) as journal:
+        pending, completed = journal.plan([str(resumes[0]), str(copy)])
+        assert pending == [str(resumes[0])]
+        assert completed == [str(copy)]
+        [copied] = journal.iter_results([str(copy)])
+        assert (copied["path"], copied["file_name"], copied["score"]) == (str(copy), "copy.pdf", 70.0)
+
+def test_unprocessable_and_unreadable_results_are_not_journaled(tmp_path, resumes):
+    with ResultJournal(str(tmp_path / "run.journal"), RUN_KEY) as journal:
+        journal.plan([str(resumes[0])])
+        unprocessable = dict(result(resumes[0], 0.0), matched_skills=[UNPROCESSABLE])
+        assert not journal.append(unprocessable)
+        assert not journal.append(result(tmp_path / "missing.pdf", 10.0))
+        assert len(journal) == 0
+
+def test_journal_of_another_run_is_refused(tmp_path):
+    journal_path = str(tmp_path / "run.journal")
+    ResultJournal(journal_path, RUN_KEY).close()
+    with pytest.raises(ValueError):
+        ResultJournal(journal_path, "other-run")
+
+def test_run_key_covers_results_but_not_the_timeout(tmp_path):
+    skills = tmp_path / "skills.csv"
+    skills.write_text("skills,weightage\nPython,5\n")
+    key = make_run_key(str(skills), ExtractionLimits(max_pages=10, timeout=30))
+
+    assert make_run_key(str(skills), ExtractionLimits(max_pages=10, timeout=60)) == key
+    assert make_run_key(str(skills), ExtractionLimits(max_pages=20, timeout=30)) != key
+    assert make_run_key(str(skills), ExtractionLimits(max_pages=10, timeout=30), 'int8') != key
+
+    skills.write_text("skills,weightage\nPython,6\n")
+    assert make_run_key(str(skills), ExtractionLimits(max_pages=10, timeout=30)) != key
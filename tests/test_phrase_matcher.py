@@ -0,0 +1,31 @@
+from core.phrase_matcher import SkillPhraseMatcher
+
+def substring_matches(skills, text):
+    return {skill for skill in skills if skill.lower() in text.lower()}
+
+def test_default_matches_substrings_case_insensitively():
+    skills = ["Java", "JavaScript", "SQL", "machine learning", "Go"]
+    text = "Built JavaScript UIs and MySQL reports; studied Machine Learning."
+    assert SkillPhraseMatcher(skills).find(text) == substring_matches(skills, text)
+    assert SkillPhraseMatcher(skills).find(text) == {"Java", "JavaScript", "SQL", "machine learning"}
+
+def test_overlapping_and_nested_patterns():
+    skills = ["he", "she", "hers", "his"]
+    text = "ushers"
+    assert SkillPhraseMatcher(skills).find(text) == substring_matches(skills, text)
+
+def test_word_boundaries_reject_glued_hits():
+    matcher = SkillPhraseMatcher(["Java", "SQL", "C++", "Go"], word_boundaries=True)
+    assert matcher.find("JavaScript and MySQL") == set()
+    assert matcher.find("Java, SQL and C++ (Go)") == {"Java", "SQL", "C++", "Go"}
+
+def test_word_boundaries_use_a_later_bounded_hit():
+    matcher = SkillPhraseMatcher(["Java"], word_boundaries=True)
+    assert matcher.find("JavaScript first, then Java") == {"Java"}
+
+def test_skills_differing_only_in_case_are_all_reported():
+    matcher = SkillPhraseMatcher(["Python", "python", "Rust"])
+    assert matcher.find("PYTHON developer") == {"Python", "python"}
+
+def test_empty_skill_matches_every_text():
+    assert SkillPhraseMatcher(["", "Rust"]).find("no match here") == {""}
@@ -0,0 +1,57 @@
+import csv
+
+import pytest
+
+from core.ranking import TopKRanking, ResultSpill, CSV_COLUMNS
+
+def result(name, score):
+    return {"file_name": name, "path": f"/resumes/{name}", "score": score,
+            "matched_skills": ["Python"], "missing_skills": ["Go", "SQL"]}
+
+def test_top_k_keeps_the_best_scores_in_order():
+    ranking = TopKRanking(3)
+    for index, score in enumerate([10, 50, 30, 90, 20, 70]):
+        ranking.add(result(f"r{index}", score))
+    assert [item["score"] for item in ranking.ranked()] == [90, 70, 50]
+    assert ranking.min_score() == 50
+    assert ranking.seen == 6
+
+def test_top_k_prefers_earlier_arrivals_on_ties():
+    ranking = TopKRanking(2)
+    for name in ["first", "second", "third"]:
+        ranking.add(result(name, 40))
+    assert [item["file_name"] for item in ranking.ranked()] == ["first", "second"]
+
+def test_top_k_rejects_empty_rankings():
+    with pytest.raises(ValueError):
+        TopKRanking(0)
+
+def test_spill_writes_csv_in_chunks(tmp_path):
+    path = tmp_path / "all.csv"
+    with ResultSpill(str(path), chunk_rows=2) as spill:
+        for index in range(5):
+            spill.write(result(f"r{index}.pdf", index * 10.0))
+            # Full chunks are written as soon as they fill up
+            assert spill.rows_written == (index + 1) // 2 * 2
+    assert spill.rows_written == 5
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSV_COLUMNS
+    assert rows[1:3] == [["r0.pdf", "0.00", "Python", "Go, SQL"], ["r1.pdf", "10.00", "Python", "Go, SQL"]]
+    assert len(rows) == 6
+
+def test_spill_rejects_other_extensions(tmp_path):
+    with pytest.raises(ValueError):
+        ResultSpill(str(tmp_path / "all.jsonl"))
+    assert not (tmp_path / "all.jsonl").exists()
+
+def test_spill_writes_parquet(tmp_path):
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / "all.parquet"
+    with ResultSpill(str(path), chunk_rows=2) as spill:
+        for index in range(3):
+            spill.write(result(f"r{index}.pdf", float(index)))
+    table = pyarrow_parquet.read_table(str(path))
+    assert table.column("score").to_pylist() == [0.0, 1.0, 2.0]
+    assert table.column("matched_skills").to_pylist()[0] == ["Python"]
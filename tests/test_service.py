@@ -0,0 +1,55 @@
+import base64
+
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+pytest.importorskip('pdfminer')
+pytest.importorskip('mammoth')
+
+import app.service as service
+from app.service import MicroBatcher, ScoringRequest, ServiceMetrics, read_resume_text
+from core.extractor import ExtractionLimits
+
+class FakeSkills:
+    def get(self, skills_csv):
+        return ['python'], FakeScorer()
+
+class FakeScorer:
+    def score(self, matched_skills, similarity_threshold, max_threshold):
+        return set(matched_skills), set(), 100.0 if matched_skills else 0.0
+
+def fake_tokenize(texts):
+    if any(text == 'breaks the tokenizer' for text in texts):
+        raise RuntimeError("tokenizer failed")
+    return [text.split() for text in texts]
+
+@pytest.fixture
+def batcher(monkeypatch):
+    monkeypatch.setattr(service, 'tokenize_resumes', fake_tokenize)
+    monkeypatch.setattr(service, 'batch_similarity', lambda token_lists, skills: [None] * len(token_lists))
+    monkeypatch.setattr(service, 'find_exact_matches', lambda text, skills: set())
+    monkeypatch.setattr(service, 'match_tokens',
+                        lambda exact, tokens, skills, similarity_scores=None: (set(tokens) & set(skills), {}))
+    return MicroBatcher(FakeSkills(), ServiceMetrics())
+
+def test_bad_request_only_fails_its_own_future(batcher):
+    good = ScoringRequest("python developer", "good.txt", "skills.csv")
+    bad = ScoringRequest("breaks the tokenizer", "bad.txt", "skills.csv")
+    empty = ScoringRequest("", "empty.txt", "skills.csv")
+
+    batcher._score_group("skills.csv", [good, bad, empty])
+
+    assert good.future.result(timeout=0)["matched_skills"] == ["python"]
+    with pytest.raises(RuntimeError):
+        bad.future.result(timeout=0)
+    assert empty.future.result(timeout=0)["matched_skills"] == [service.UNPROCESSABLE]
+
+def test_non_string_text_is_rejected():
+    with pytest.raises(ValueError):
+        read_resume_text({'skills_csv': 'skills.csv', 'text': 123})
+
+def test_uploads_are_extracted_under_limits():
+    payload = {'file_name': 'cv.pdf', 'content': base64.b64encode(b'%PDF-1.4' + b' ' * 100).decode('ascii')}
+    with pytest.raises(ValueError, match="too large"):
+        read_resume_text(payload, limits=ExtractionLimits(max_bytes=10))